@@ -0,0 +1,358 @@
+"""Benchmark the days against a committed baseline and fail on regressions.
+
+Every day runs on fixed inputs, each run in a fresh process like the runner
+does (see runner.py):
+
+- "generated": the seeded synthetic input of generators.py at --scale,
+- "example": inputs/example{day}.txt (see --example-pattern), for the days
+  where such a file exists. These aren't committed, like the puzzle inputs.
+
+Each case runs --repeat times. The answers have to match the baseline, and the
+median time of the parse and part phases and the median peak RSS are compared
+to it. A case fails if it is more than --threshold (time) or --memory-threshold
+(peak RSS) slower or bigger than its baseline, ignoring differences below
+--min-seconds and --min-mb, which are mostly noise.
+
+Timings only compare on the same machine, so record a baseline with --update
+before comparing changes against it.
+
+With --records, the days aren't run. Instead, the records that solutions
+create in large numbers (see RECORDS) are compared to a copy of the same
+dataclass without slots: memory per instance, and instances created and read
+per second.
+
+With --interpreters, the cases aren't compared to the baseline, but between
+Python interpreters, e.g. CPython and PyPy (which takes the days' pure-Python
+paths, see utils.PURE_PYTHON). Every interpreter runs runner.py in a
+subprocess, interpreters that aren't installed are shown as "-".
+
+    python src/bench.py 1-25 --update
+    python src/bench.py 12,17 --repeat 5 --threshold 0.2
+    python src/bench.py --records
+    python src/bench.py 1-25 --interpreters python3,pypy3
+"""
+import argparse
+import dataclasses
+import datetime
+import importlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import generators
+from runner import parse_days, run_days
+
+RUNNER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "runner.py")
+DEFAULT_BASELINE = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bench", "baseline.json"))
+
+# Hot record types, with the constructor arguments of a typical i-th instance.
+RECORDS = [
+    ("day5", "RangeMap", lambda i: (i, 2 * i, 100)),
+    ("day16", "BeamNode", lambda i: ((i, i + 1), (0, 1), None)),
+    ("day18", "Dig", lambda i: ("R", i, "#70c710")),
+    ("day20", "FlipFlop", lambda i: (i % 2 == 0,)),
+    ("day20", "Conjunction", lambda i: ({i: False},)),
+]
+
+
+def without_slots(cls: type) -> type:
+    """The same dataclass, but with a __dict__ per instance."""
+    fields = [
+        (f.name, f.type, dataclasses.field(default=f.default, default_factory=f.default_factory, init=f.init))
+        for f in dataclasses.fields(cls)
+    ]
+    return dataclasses.make_dataclass(cls.__name__, fields)
+
+
+def measure_record(cls: type, make_args, count: int) -> dict:
+    args = [make_args(i) for i in range(count)]
+    names = [f.name for f in dataclasses.fields(cls)]
+
+    tracemalloc.start()
+    instances = [cls(*a) for a in args]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+
+    start = time.perf_counter()
+    for a in args:
+        record = cls(*a)
+        for name in names:
+            getattr(record, name)
+
+    return {"bytes_per_instance": size / count, "per_s": count / (time.perf_counter() - start)}
+
+
+def compare_records(count: int = 100000) -> list[dict]:
+    comparisons = []
+    for module_name, class_name, make_args in RECORDS:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        comparisons.append(
+            {
+                "record": f"{module_name}.{class_name}",
+                "slots": measure_record(cls, make_args, count),
+                "dict": measure_record(without_slots(cls), make_args, count),
+            }
+        )
+
+    return comparisons
+
+
+def case_inputs(days: list[int], tmp_dir: str, scale: int, example_pattern: str) -> dict[str, tuple]:
+    """The input pattern of every case, with the days that have an input."""
+    generated_pattern = os.path.join(tmp_dir, "generated{day}.txt")
+    for day in days:
+        with open(generated_pattern.format(day=day), "w") as f:
+            f.write(generators.generate(day, scale, seed=0))
+
+    example_days = [day for day in days if os.path.exists(example_pattern.format(day=day))]
+    return {
+        "generated": (generated_pattern, days),
+        "example": (example_pattern, example_days),
+    }
+
+
+def measure_case(input_pattern: str, days: list[int], repeat: int, jobs: int) -> dict[int, dict]:
+    """Run the days repeat times and take the medians over the runs."""
+    runs = {day: [] for day in days}
+    for _ in range(repeat):
+        for result in run_days(days, input_pattern, jobs):
+            runs[result["day"]].append(result)
+
+    return summarize_runs(runs)
+
+
+def measure_interpreter(
+    interpreter: str, input_pattern: str, days: list[int], repeat: int, jobs: int, tmp_dir: str
+) -> dict[int, dict] | None:
+    """Like measure_case, but with runner.py under another interpreter. None if it isn't installed."""
+    executable = shutil.which(interpreter)
+    if executable is None:
+        return None
+    if not days:
+        return {}
+
+    report_path = os.path.join(tmp_dir, "interpreter-report.json")
+    runs = {day: [] for day in days}
+    for _ in range(repeat):
+        # Without a previous report, the runner doesn't reorder the days by it.
+        if os.path.exists(report_path):
+            os.remove(report_path)
+
+        command = [executable, RUNNER, ",".join(map(str, days)), "--input-pattern", input_pattern]
+        command += ["--report", report_path, "--jobs", str(jobs)]
+        proc = subprocess.run(command, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"{interpreter} failed: {proc.stderr.strip().splitlines()[-1:]}", file=sys.stderr)
+            return None
+
+        with open(report_path) as f:
+            for result in json.load(f)["days"]:
+                runs[result["day"]].append(result)
+
+    return summarize_runs(runs)
+
+
+def summarize_runs(runs: dict[int, list[dict]]) -> dict[int, dict]:
+    """The median time and peak RSS of every day's runs, and their answers."""
+    measurements = {}
+    for day, results in runs.items():
+        failed = [r for r in results if r["status"] != "ok"]
+        if failed:
+            measurements[day] = {"status": failed[0]["status"], "error": failed[0].get("error")}
+            continue
+
+        answers = [r["answers"] for r in results]
+        measurements[day] = {
+            "status": "ok" if all(a == answers[0] for a in answers) else "unstable",
+            "answers": answers[0],
+            "wall_s": statistics.median(
+                sum(stats["wall_s"] for phase, stats in r["phases"].items() if phase != "import")
+                for r in results
+            ),
+            "peak_rss_mb": statistics.median(
+                max(stats["peak_rss_kb"] for stats in r["phases"].values()) / 1024 for r in results
+            ),
+        }
+
+    return measurements
+
+
+def compare(
+    measurement: dict,
+    baseline: dict | None,
+    threshold: float,
+    memory_threshold: float,
+    min_seconds: float,
+    min_mb: float,
+) -> list[str]:
+    """The reasons why a measurement fails against its baseline, if any."""
+    if measurement["status"] != "ok":
+        return [f"{measurement['status']}: {measurement.get('error', 'answers differ between runs')}"]
+
+    if baseline is None:
+        return []
+
+    problems = []
+    if measurement["answers"] != baseline["answers"]:
+        problems.append(f"answers {measurement['answers']} != baseline {baseline['answers']}")
+
+    wall_s, base_wall_s = measurement["wall_s"], baseline["wall_s"]
+    if wall_s > base_wall_s * (1 + threshold) and wall_s - base_wall_s > min_seconds:
+        problems.append(f"time {wall_s:.3f}s vs {base_wall_s:.3f}s (+{wall_s / base_wall_s - 1:.0%})")
+
+    rss_mb, base_rss_mb = measurement["peak_rss_mb"], baseline["peak_rss_mb"]
+    if rss_mb > base_rss_mb * (1 + memory_threshold) and rss_mb - base_rss_mb > min_mb:
+        problems.append(f"peak RSS {rss_mb:.1f}MB vs {base_rss_mb:.1f}MB (+{rss_mb / base_rss_mb - 1:.0%})")
+
+    return problems
+
+
+def print_interpreter_comparison(measurements: dict[str, dict[str, dict[int, dict] | None]]) -> int:
+    """Print the wall times per interpreter side by side, return how many cases failed."""
+    interpreters = list(next(iter(measurements.values())))
+    columns = [f"{interpreter} [s]" for interpreter in interpreters]
+    print(f"{'case':<10} {'day':>3} " + " ".join(f"{c:>{max(9, len(c))}}" for c in columns) + "  result")
+
+    failures = 0
+    for case, by_interpreter in measurements.items():
+        days = sorted({day for m in by_interpreter.values() if m is not None for day in m})
+        for day in days:
+            cells, answers, problems = [], [], []
+            for interpreter, column in zip(interpreters, columns):
+                measurement = (by_interpreter[interpreter] or {}).get(day)
+                width = max(9, len(column))
+                if measurement is None or "wall_s" not in measurement:
+                    cells.append(f"{'-':>{width}}")
+                else:
+                    cells.append(f"{measurement['wall_s']:>{width}.3f}")
+                    answers.append(measurement["answers"])
+                if measurement is not None and measurement["status"] != "ok":
+                    problems.append(f"{interpreter} {measurement['status']}: {measurement.get('error')}")
+
+            if any(a != answers[0] for a in answers):
+                problems.append("answers differ between interpreters")
+            failures += bool(problems)
+            print(f"{case:<10} {day:>3} " + " ".join(cells) + "  " + ("; ".join(problems) or "ok"))
+
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("days", nargs="?", default="1-25", help="e.g. 1-25 or 5,12,17")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--update", action="store_true", help="write the measurements as the new baseline")
+    parser.add_argument("--scale", type=int, default=1, help="scale of the generated inputs")
+    parser.add_argument(
+        "--example-pattern",
+        default="inputs/example{day}.txt",
+        help="example input path, {day} is replaced by the day number",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case, the median is compared")
+    parser.add_argument("--jobs", type=int, default=1, help="number of days to run concurrently")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--memory-threshold", type=float, default=0.25, help="allowed relative peak RSS growth")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="ignore slowdowns smaller than this")
+    parser.add_argument("--min-mb", type=float, default=5.0, help="ignore peak RSS growth smaller than this")
+    parser.add_argument(
+        "--records",
+        action="store_true",
+        help="only compare the hot record types with and without slots",
+    )
+    parser.add_argument(
+        "--interpreters",
+        help="compare these Python executables (e.g. python3,pypy3) instead of the baseline",
+    )
+    args = parser.parse_args()
+
+    if args.records:
+        print(f"{'record':<22} {'bytes (slots)':>13} {'bytes (dict)':>12} {'1/s (slots)':>11} {'1/s (dict)':>11}")
+        for c in compare_records():
+            print(
+                f"{c['record']:<22} {c['slots']['bytes_per_instance']:>13.0f} {c['dict']['bytes_per_instance']:>12.0f}"
+                f" {c['slots']['per_s']:>11.0f} {c['dict']['per_s']:>11.0f}"
+            )
+        return
+
+    baseline = {"cases": {}}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    if baseline.get("scale", args.scale) != args.scale:
+        sys.exit(f"The baseline was recorded at scale {baseline['scale']}, not {args.scale}")
+
+    days = parse_days(args.days)
+    if args.interpreters:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cases = case_inputs(days, tmp_dir, args.scale, args.example_pattern)
+            measurements = {
+                case: {
+                    interpreter: measure_interpreter(interpreter, pattern, case_days, args.repeat, args.jobs, tmp_dir)
+                    for interpreter in args.interpreters.split(",")
+                }
+                for case, (pattern, case_days) in cases.items()
+            }
+
+        failures = print_interpreter_comparison(measurements)
+        if failures:
+            sys.exit(f"{failures} case(s) failed or differ between interpreters")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cases = case_inputs(days, tmp_dir, args.scale, args.example_pattern)
+        measurements = {
+            case: measure_case(pattern, case_days, args.repeat, args.jobs)
+            for case, (pattern, case_days) in cases.items()
+        }
+
+    print(f"{'case':<10} {'day':>3} {'wall [s]':>9} {'base [s]':>9} {'RSS [MB]':>9} {'base [MB]':>9}  result")
+    failures = 0
+    for case, case_measurements in measurements.items():
+        for day, measurement in case_measurements.items():
+            base = baseline["cases"].get(case, {}).get(str(day))
+            problems = compare(
+                measurement, base, args.threshold, args.memory_threshold, args.min_seconds, args.min_mb
+            )
+            failures += bool(problems)
+
+            result = "; ".join(problems) or ("ok" if base is not None else "no baseline")
+            wall_s = f"{measurement['wall_s']:>9.3f}" if "wall_s" in measurement else f"{'-':>9}"
+            rss_mb = f"{measurement['peak_rss_mb']:>9.1f}" if "peak_rss_mb" in measurement else f"{'-':>9}"
+            base_wall_s = f"{base['wall_s']:>9.3f}" if base else f"{'-':>9}"
+            base_rss_mb = f"{base['peak_rss_mb']:>9.1f}" if base else f"{'-':>9}"
+            print(f"{case:<10} {day:>3} {wall_s} {base_wall_s} {rss_mb} {base_rss_mb}  {result}")
+
+    if args.update:
+        for case, case_measurements in measurements.items():
+            for day, measurement in case_measurements.items():
+                if measurement["status"] == "ok":
+                    baseline["cases"].setdefault(case, {})[str(day)] = measurement
+
+        baseline.update(
+            {
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                "scale": args.scale,
+                "repeat": args.repeat,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+            }
+        )
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+    elif failures:
+        sys.exit(f"{failures} case(s) regressed or failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Wall time and RSS budgets for whole days and for their parse and part phases.
+
+The runner solves every day in a process of its own (see runner.py) and
+watches it from the outside: the day reports when each phase starts and ends,
+and every CHECK_INTERVAL_S the runner compares the elapsed times and the
+process's current RSS against the budgets. A day over budget is killed, so
+neither a long call into C nor a deep recursion can keep it running. The
+phases that finished before are still recorded, the profile and telemetry of
+the phase that was stopped are lost.
+
+Budgets are given for every day (Budgets.day), for every phase (Budgets.phase)
+and overridden for single days or phases with specs like "23:part2=60s" or
+"21=2048mb" (see parse_override).
+
+RSS budgets need /proc to read another process's RSS, i.e. they only work on
+Linux. Time budgets work everywhere.
+"""
+import os
+import re
+import time
+from dataclasses import dataclass, field, fields, replace
+
+CHECK_INTERVAL_S = 0.05
+
+
+class BudgetExceeded(Exception):
+    def __init__(self, status: str, message: str):
+        super().__init__(message)
+        self.status = status  # "timeout" or "oom", as in the runner's report.
+
+
+@dataclass
+class Budget:
+    wall_s: float | None = None
+    rss_mb: float | None = None
+
+    def __bool__(self) -> bool:
+        return self.wall_s is not None or self.rss_mb is not None
+
+    def updated(self, other: "Budget") -> "Budget":
+        """This budget with the limits that other sets."""
+        limits = {f.name: getattr(other, f.name) for f in fields(other)}
+        return replace(self, **{name: limit for name, limit in limits.items() if limit is not None})
+
+
+@dataclass
+class Budgets:
+    day: Budget = field(default_factory=Budget)
+    phase: Budget = field(default_factory=Budget)
+    # Keyed by (day, phase), where phase None means the whole day.
+    overrides: dict[tuple[int, str | None], Budget] = field(default_factory=dict)
+
+    def for_day(self, day: int) -> Budget:
+        return self.day.updated(self.overrides.get((day, None), Budget()))
+
+    def for_phase(self, day: int, phase: str) -> Budget:
+        return self.phase.updated(self.overrides.get((day, phase), Budget()))
+
+    def add_override(self, spec: str):
+        key, budget = parse_override(spec)
+        self.overrides[key] = self.overrides.get(key, Budget()).updated(budget)
+
+
+def parse_override(spec: str) -> tuple[tuple[int, str | None], Budget]:
+    """Parse DAY[:PHASE]=LIMIT, where LIMIT is seconds (60s) or megabytes of RSS (2048mb)."""
+    match = re.fullmatch(r"(\d+)(?::(\w+))?=([\d.]+)(s|mb)", spec.strip().lower())
+    assert match, f"Budget {spec} isn't like 23=600s or 21:part2=2048mb"
+
+    day, phase, value, unit = match.groups()
+    budget = Budget(wall_s=float(value)) if unit == "s" else Budget(rss_mb=float(value))
+    return (int(day), phase), budget
+
+
+def current_rss_kb(pid: int) -> int | None:
+    """The current RSS of a process, or None if it can't be read."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+class Watchdog:
+    """Checks the budgets of a day and its current phase, from outside the day's process.
+
+    Call phase() whenever the day reports that a phase started (or ended, with
+    None), and exceeded() periodically.
+    """
+
+    def __init__(self, day: int, budgets: Budgets, pid: int):
+        self.day = day
+        self.budgets = budgets
+        self.pid = pid
+        day_budget = budgets.for_day(day)
+        # (scope, budget, start time) of the day and the current phase.
+        self.day_scopes = [(f"day {day}", day_budget, time.perf_counter())] if day_budget else []
+        self.scopes = self.day_scopes
+
+    def phase(self, name: str | None):
+        budget = self.budgets.for_phase(self.day, name) if name is not None else Budget()
+        self.scopes = self.day_scopes
+        if budget:
+            self.scopes = self.day_scopes + [(f"day {self.day} {name}", budget, time.perf_counter())]
+
+    def exceeded(self) -> BudgetExceeded | None:
+        now = time.perf_counter()
+        rss_mb = None
+        for scope, budget, start in self.scopes:
+            if budget.wall_s is not None and now - start > budget.wall_s:
+                return BudgetExceeded("timeout", f"{scope} went over its {budget.wall_s:g}s budget")
+
+            if budget.rss_mb is not None:
+                if rss_mb is None:
+                    rss_kb = current_rss_kb(self.pid)
+                    if rss_kb is None:
+                        continue
+                    rss_mb = rss_kb / 1024
+
+                if rss_mb > budget.rss_mb:
+                    return BudgetExceeded("oom", f"{scope} went over its {budget.rss_mb:g}MB RSS budget ({rss_mb:.0f}MB)")
+
+        return None
+
+
+def rss_enforceable() -> bool:
+    return current_rss_kb(os.getpid()) is not None
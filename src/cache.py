@@ -0,0 +1,223 @@
+"""Content-addressed disk cache for parsed inputs and final answers.
+
+Entries are keyed by (day, hash of the input, solver version). The solver
+version is a hash of the day's source and of utils, so editing a solution
+invalidates its entries without having to bump anything by hand. It also
+covers utils.PURE_PYTHON, since the pure-Python paths parse into different
+products (e.g. lists of strings instead of numpy grids) than the numpy ones.
+
+Answers are stored as JSON. Parse products are stored as .npz if they are numpy
+arrays (or tuples of them) and pickled otherwise. Parse products that can't be
+pickled (e.g. day19's eval'd rules) are simply not cached.
+
+The cache is bounded: when a write takes it over its size limit, the least
+recently used entries are removed until it is below the limit again. Hits
+refresh an entry's modification time, which is what the LRU order is based on.
+The size is tracked in memory between writes, so the cache directory is only
+scanned on the first write and when evicting.
+"""
+import hashlib
+import importlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+from collections import Counter
+
+import utils
+
+# Returned by the getters when there is no entry, since None is a valid answer.
+MISS = object()
+
+
+def input_hash(input_text: str) -> str:
+    return hashlib.sha256(input_text.encode()).hexdigest()
+
+
+def module_source_files(module) -> list[str]:
+    """The source files of a module, or of all modules if it is a package."""
+    if os.path.basename(module.__file__) != "__init__.py":
+        return [module.__file__]
+
+    package_dir = os.path.dirname(module.__file__)
+    return sorted(
+        os.path.join(package_dir, name)
+        for name in os.listdir(package_dir)
+        if name.endswith(".py")
+    )
+
+
+def solver_version(day: int) -> str:
+    digest = hashlib.sha256()
+    for module_name in (f"day{day}", "utils"):
+        for path in module_source_files(importlib.import_module(module_name)):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    digest.update(b"pure-python" if utils.PURE_PYTHON else b"numpy")
+
+    return digest.hexdigest()[:16]
+
+
+def is_array_product(value) -> bool:
+    # If the day never imported numpy, its parse product can't contain arrays.
+    np = sys.modules.get("numpy")
+    if np is None:
+        return False
+
+    if isinstance(value, tuple):
+        return len(value) > 0 and all(isinstance(v, np.ndarray) for v in value)
+
+    return isinstance(value, np.ndarray)
+
+
+class Cache:
+    def __init__(self, cache_dir: str, max_bytes: int = 1 << 30):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.stats = Counter()
+        self._versions = {}
+        self._total_bytes = None
+
+    def _entry_path(self, day: int, input_text: str, suffix: str) -> str:
+        key = (day, utils.PURE_PYTHON)
+        if key not in self._versions:
+            self._versions[key] = solver_version(day)
+
+        name = f"{input_hash(input_text)}-{self._versions[key]}{suffix}"
+        return os.path.join(self.cache_dir, f"day{day}", name)
+
+    def _hit(self, kind: str, path: str):
+        self.stats[f"{kind}_hits"] += 1
+        # Refresh the LRU order, the entry may have been evicted meanwhile.
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def _write(self, path: str, write_fn):
+        """Write atomically, so concurrent runs never read half-written entries."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write_fn(f)
+            # An overwritten entry no longer counts towards the total.
+            try:
+                old_size = os.path.getsize(path)
+            except FileNotFoundError:
+                old_size = 0
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self.entries())
+        else:
+            self._total_bytes += os.path.getsize(path) - old_size
+
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def get_answers(self, day: int, input_text: str):
+        path = self._entry_path(day, input_text, ".answers.json")
+        try:
+            with open(path) as f:
+                answers = tuple(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.stats["answers_misses"] += 1
+            return MISS
+
+        self._hit("answers", path)
+        return answers
+
+    def put_answers(self, day: int, input_text: str, answers: tuple):
+        path = self._entry_path(day, input_text, ".answers.json")
+        self._write(path, lambda f: f.write(json.dumps(list(answers)).encode()))
+
+    def get_parsed(self, day: int, input_text: str):
+        for suffix in (".parsed.npz", ".parsed.pickle"):
+            path = self._entry_path(day, input_text, suffix)
+            if not os.path.exists(path):
+                continue
+
+            try:
+                parsed = self._load_parsed(path)
+            # np.load raises ValueError e.g. for object arrays, which count as a miss too.
+            except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+                continue
+
+            self._hit("parsed", path)
+            return parsed
+
+        self.stats["parsed_misses"] += 1
+        return MISS
+
+    def _load_parsed(self, path: str):
+        if path.endswith(".pickle"):
+            with open(path, "rb") as f:
+                return pickle.load(f)
+
+        import numpy as np
+
+        with np.load(path) as arrays:
+            if "single" in arrays:
+                return arrays["single"]
+
+            return tuple(arrays[f"arr_{i}"] for i in range(len(arrays.files)))
+
+    def put_parsed(self, day: int, input_text: str, parsed) -> bool:
+        """Store a parse product, returns False if it can't be stored."""
+        if is_array_product(parsed):
+            import numpy as np
+
+            path = self._entry_path(day, input_text, ".parsed.npz")
+            if isinstance(parsed, tuple):
+                self._write(path, lambda f: np.savez(f, *parsed))
+            else:
+                self._write(path, lambda f: np.savez(f, single=parsed))
+            return True
+
+        try:
+            data = pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return False
+
+        path = self._entry_path(day, input_text, ".parsed.pickle")
+        self._write(path, lambda f: f.write(data))
+        return True
+
+    def entries(self) -> list[tuple[float, int, str]]:
+        """(mtime, size, path) of all entries, oldest first."""
+        entries = []
+        for root, _dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        return sorted(entries)
+
+    def evict(self):
+        """Remove the least recently used entries until the size limit is met."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+
+            try:
+                os.remove(path)
+                self.stats["evictions"] += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+
+        self._total_bytes = total
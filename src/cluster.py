@@ -0,0 +1,272 @@
+"""Spread (day, input) jobs over worker processes on any number of machines.
+
+The coordinator reads the inputs, puts one job per day and input on a shared
+queue and serves it over TCP with multiprocessing.managers. Workers connect,
+pull jobs until the coordinator says it's finished, solve them with the days'
+solve() entry points (through service.handle_request, so every day module is
+imported once per worker) and put the answers and solve times on a result
+queue. The coordinator prints the results as they come in and merges them into
+one report, with the jobs and busy time of every worker.
+
+Jobs carry the input text, so workers don't need the inputs on their disk,
+only the repository. With --local-workers, the coordinator starts that many
+workers on this machine itself, which is also how to try it out end to end.
+
+    python src/cluster.py coordinator 1-25 --local-workers 4
+    python src/cluster.py coordinator 1-25 --input-pattern "inputs/input{day}.txt" \\
+        --input-pattern "inputs/scaled{day}.txt" --bind 0.0.0.0:50023 --authkey secret
+    python src/cluster.py worker coordinator-host:50023 --authkey secret
+
+The managers unpickle whatever their peers send, so whoever knows the authkey
+can run code on the coordinator and the workers. There is no default key:
+workers need --authkey, and a coordinator without one makes up a random key
+(and prints it, unless it only serves its local workers on loopback).
+
+A worker that dies while solving a job takes the job with it, so the
+coordinator gives up after --timeout seconds without a result.
+"""
+import argparse
+import ipaddress
+import json
+import multiprocessing
+import os
+import queue
+import secrets
+import socket
+import sys
+import threading
+import time
+from collections import defaultdict
+from multiprocessing.managers import BaseManager
+
+from runner import make_report, parse_days
+from service import handle_request
+
+# Only used inside the manager's server process, clients get proxies.
+_jobs = queue.Queue()
+_results = queue.Queue()
+_finished = threading.Event()
+
+
+class QueueManager(BaseManager):
+    pass
+
+
+def _get_jobs() -> queue.Queue:
+    return _jobs
+
+
+def _get_results() -> queue.Queue:
+    return _results
+
+
+def _get_finished() -> threading.Event:
+    return _finished
+
+
+# Module level functions instead of lambdas, so they pickle for spawned servers.
+QueueManager.register("jobs", callable=_get_jobs)
+QueueManager.register("results", callable=_get_results)
+QueueManager.register("finished", callable=_get_finished)
+
+
+def parse_address(address: str) -> tuple[str, int]:
+    host, port = address.rsplit(":", 1)
+    return host, int(port)
+
+
+def is_loopback(host: str) -> bool:
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+def work(address: tuple[str, int], authkey: bytes, name: str | None = None) -> int:
+    """Solve jobs from the coordinator at address until it's finished, return how many."""
+    name = name or f"{socket.gethostname()}-{os.getpid()}"
+    manager = QueueManager(address=address, authkey=authkey)
+    manager.connect()
+    jobs, results, finished = manager.jobs(), manager.results(), manager.finished()
+
+    solved = 0
+    try:
+        while not finished.is_set():
+            try:
+                job = jobs.get(timeout=0.2)
+            except queue.Empty:
+                continue
+
+            response = handle_request(job)
+            response["worker"] = name
+            results.put(response)
+            solved += 1
+    except (EOFError, ConnectionError):
+        # The coordinator shut down while we were waiting for a job.
+        pass
+
+    return solved
+
+
+def make_jobs(days: list[int], input_patterns: list[str]) -> tuple[list[dict], list[dict]]:
+    """One job per day and input, and the results for inputs that don't exist."""
+    jobs, missing = [], []
+    for pattern in input_patterns:
+        for day in days:
+            path = pattern.format(day=day)
+            job = {"id": len(jobs) + len(missing), "day": day, "path": path}
+            try:
+                with open(path) as f:
+                    jobs.append({**job, "input": f.read()})
+            except FileNotFoundError as e:
+                missing.append({**job, "error": f"{type(e).__name__}: {e}"})
+
+    return jobs, missing
+
+
+def coordinate(
+    jobs: list[dict],
+    address: tuple[str, int],
+    authkey: bytes,
+    local_workers: int = 0,
+    timeout_s: float | None = None,
+    on_result=None,
+) -> list[dict]:
+    """Serve the jobs to workers and collect one result per job, in the order of jobs.
+
+    on_result(result) is called for every result as soon as it arrives.
+    """
+    manager = QueueManager(address=address, authkey=authkey)
+    manager.start()
+    workers = []
+    try:
+        job_queue, results, finished = manager.jobs(), manager.results(), manager.finished()
+        for job in jobs:
+            job_queue.put(job)
+
+        workers = [
+            multiprocessing.Process(target=work, args=(manager.address, authkey, f"local-{i}"))
+            for i in range(local_workers)
+        ]
+        for worker in workers:
+            worker.start()
+
+        merged = {}
+        while len(merged) < len(jobs):
+            try:
+                result = results.get(timeout=timeout_s)
+            except queue.Empty:
+                raise TimeoutError(f"No result for {timeout_s}s, {len(jobs) - len(merged)} job(s) left")
+
+            merged[result["id"]] = result
+            if on_result is not None:
+                on_result(result)
+
+        finished.set()
+        for worker in workers:
+            worker.join()
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        manager.shutdown()
+
+    return [merged[job["id"]] for job in jobs]
+
+
+def worker_stats(results: list[dict]) -> dict[str, dict]:
+    stats = defaultdict(lambda: {"jobs": 0, "busy_s": 0.0})
+    for result in results:
+        if "worker" in result:
+            stats[result["worker"]]["jobs"] += 1
+            stats[result["worker"]]["busy_s"] += result.get("seconds", 0.0)
+
+    return dict(stats)
+
+
+def print_result(result: dict, paths: dict[int, str]):
+    outcome = result.get("error") or f"{result.get('part1')} {result.get('part2')}"
+    seconds = f"{result['seconds']:>9.3f}" if "seconds" in result else f"{'-':>9}"
+    print(f"{result['day']:>3} {result.get('worker', '-'):<16} {seconds}  {paths[result['id']]}: {outcome}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    shared = argparse.ArgumentParser(add_help=False)
+    shared.add_argument(
+        "--authkey",
+        help="shared secret of coordinator and workers (required for workers, random by default for the coordinator)",
+    )
+
+    coordinator = commands.add_parser("coordinator", parents=[shared], help="queue the jobs and collect the results")
+    coordinator.add_argument("days", nargs="?", default="1-25", help="e.g. 1-25 or 5,12,17")
+    coordinator.add_argument(
+        "--input-pattern",
+        action="append",
+        help="input file path, {day} is replaced by the day number (repeatable, default inputs/input{day}.txt)",
+    )
+    coordinator.add_argument("--bind", default="127.0.0.1:0", help="host:port to serve the queues on")
+    coordinator.add_argument("--local-workers", type=int, default=0, help="workers to start on this machine")
+    coordinator.add_argument("--timeout", type=float, help="give up after this many seconds without a result")
+    coordinator.add_argument("--report", default="cluster-report.json", help="JSON report output path")
+
+    worker = commands.add_parser("worker", parents=[shared], help="solve jobs of a coordinator")
+    worker.add_argument("address", help="host:port of the coordinator")
+    worker.add_argument("--name", help="name in the report (default: host-pid)")
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        if args.authkey is None:
+            parser.error("Workers need the --authkey of the coordinator")
+        solved = work(parse_address(args.address), args.authkey.encode(), args.name)
+        print(f"Solved {solved} job(s)")
+        return
+
+    address = parse_address(args.bind)
+    if args.authkey is None:
+        args.authkey = secrets.token_hex(16)
+        if args.local_workers == 0 or not is_loopback(address[0]):
+            print(f"Workers connect with --authkey {args.authkey}", file=sys.stderr)
+    authkey = args.authkey.encode()
+    if args.local_workers == 0:
+        if address[1] == 0:
+            parser.error("Without --local-workers, --bind needs a port that workers can connect to")
+        print(f"Waiting for workers on {args.bind}", file=sys.stderr)
+
+    jobs, missing = make_jobs(parse_days(args.days), args.input_pattern or ["inputs/input{day}.txt"])
+    paths = {job["id"]: job["path"] for job in jobs + missing}
+    print(f"{'day':>3} {'worker':<16} {'solve [s]':>9}  input: answers")
+    for result in missing:
+        print_result(result, paths)
+
+    start = time.perf_counter()
+    results = coordinate(
+        [{"id": job["id"], "day": job["day"], "input": job["input"]} for job in jobs],
+        address,
+        authkey,
+        args.local_workers,
+        args.timeout,
+        on_result=lambda result: print_result(result, paths),
+    )
+    total_wall_s = time.perf_counter() - start
+
+    results = sorted(results + missing, key=lambda result: result["id"])
+    for result in results:
+        result["path"] = paths[result["id"]]
+        result.pop("input", None)
+
+    workers = worker_stats(results)
+    for name, stats in sorted(workers.items()):
+        print(f"{name}: {stats['jobs']} job(s), {stats['busy_s']:.3f}s solving")
+    print(f"Total wall time: {total_wall_s:.3f}s")
+
+    with open(args.report, "w") as f:
+        json.dump(make_report(results, workers=workers, total_wall_s=total_wall_s), f, indent=2)
+
+    if any("error" in result for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
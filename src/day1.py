@@ -1,6 +1,10 @@
 import re
+import sys
+
+import utils
+
+STREAM_INPUT = True
 
-puzzle = [l.strip() for l in open("inputs/input1.txt").readlines()]
 digit_map = {"one": "1", "two": "2", "three": "3", "four": "4", "five": "5", "six": "6", "seven": "7", "eight": "8", "nine": "9"}
 
 def get_calibration_value(line):
@@ -9,4 +13,18 @@ def get_calibration_value(line):
     nums = [digit_map.get(n, n) for n in nums]
     return int(nums[0] + nums[-1])
 
-print(sum(get_calibration_value(l) for l in puzzle))
+def parse(puzzle_input: list[str]) -> list[int]:
+    # Only keep the calibration values, not the lines themselves.
+    return [get_calibration_value(l) for l in puzzle_input]
+
+# Only the part 2 version of the calibration survived.
+def part2(calibration_values: list[int]) -> int:
+    return sum(calibration_values)
+
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return None, part2(parsed)
+
+if __name__ == "__main__":
+    puzzle = parse(utils.stream_lines(sys.argv[1]))
+    print(part2(puzzle))
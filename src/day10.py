@@ -1,15 +1,8 @@
 import sys
 from collections import defaultdict
 
-from shapely.geometry import Point, Polygon
-
 import utils
 
-sys.setrecursionlimit(50000)  # yolo
-
-
-puzzle_input = utils.read_puzzle_input(sys.argv[1])
-
 
 def input_to_graph(puzzle_input: list[str]):
     # Find start separately to let its neighbors link back from it.
@@ -58,46 +51,76 @@ def input_to_graph(puzzle_input: list[str]):
     return start, adj_list
 
 
-# Hacky, could be a property of the nodes, but oh well..
-visited = set()
-
-
 def find_path(
     current: tuple[int, int],
     prev: tuple[int, int],
     target: tuple[int, int],
     graph: dict[set],
+    visited: set,
 ) -> list[tuple[int, int]]:
-    """DFS through the graph."""
-    global visited
+    """DFS through the graph, with an explicit stack so long loops fit.
 
+    The stack holds the nodes of the current path, with the node we came from
+    and the neighbors we haven't tried yet.
+    """
     visited.add(current)
-    for neighbor in graph[current]:
-        if (neighbor == target) and (neighbor != prev):
-            return [current]
+    stack = [(current, prev, iter(graph[current]))]
+    while stack:
+        node, node_prev, neighbors = stack[-1]
+        for neighbor in neighbors:
+            if (neighbor == target) and (neighbor != node_prev):
+                return [n for n, _, _ in stack]
+
+            if neighbor in visited:
+                continue
+
+            visited.add(neighbor)
+            stack.append((neighbor, node, iter(graph[neighbor])))
+            break
+        else:
+            # All neighbors tried, backtrack.
+            stack.pop()
 
-        if neighbor in visited:
-            continue
+    return None
 
-        path = find_path(
-            current=neighbor,
-            prev=current,
-            target=target,
-            graph=graph,
-        )
-        if path is None:
-            continue
 
-        return [current] + path
+def parse(puzzle_input: list[str]) -> tuple[list[str], tuple, dict]:
+    start, graph = input_to_graph(puzzle_input)
+    return puzzle_input, start, graph
 
-    return None
 
+def find_loop(start: tuple[int, int], graph: dict[set]) -> list[tuple[int, int]]:
+    return find_path(current=start, prev=None, target=start, graph=graph, visited=set())
 
-if __name__ == "__main__":
-    start, graph = input_to_graph(puzzle_input)
-    path = find_path(current=start, prev=None, target=start, graph=graph)
 
-    print(len(path) // 2)
+def part1(parsed: tuple[list[str], tuple, dict]) -> int:
+    _puzzle_input, start, graph = parsed
+    path = find_loop(start, graph)
+
+    return len(path) // 2
+
+
+def enclosed_points(path: list[tuple[int, int]]) -> int:
+    """Count the grid points strictly inside the loop without shapely.
+
+    The shoelace formula gives the area of the loop, and since the loop passes
+    through every grid point on its boundary, Pick's theorem (A = I + B/2 - 1)
+    gives the number of interior points I from that.
+    """
+    twice_area = abs(
+        sum(i1 * j2 - i2 * j1 for (i1, j1), (i2, j2) in zip(path, path[1:] + path[:1]))
+    )
+    return (twice_area - len(path)) // 2 + 1
+
+
+def part2(parsed: tuple[list[str], tuple, dict]) -> int:
+    puzzle_input, start, graph = parsed
+    path = find_loop(start, graph)
+    if utils.PURE_PYTHON:
+        return enclosed_points(path)
+
+    # Only import shapely here, it's a slow import and only needed for part 2.
+    from shapely.geometry import Point, Polygon
 
     # Use a polygon intersection library. Pretty slow..
     contained = 0
@@ -106,4 +129,15 @@ if __name__ == "__main__":
         for j, c in enumerate(line):
             contained += path_poly.contains(Point(i, j))
 
-    print(contained)
+    return contained
+
+
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
+
+
+if __name__ == "__main__":
+    parsed = parse(utils.read_puzzle_input(sys.argv[1]))
+    print(part1(parsed))
+    print(part2(parsed))
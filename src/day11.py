@@ -3,37 +3,63 @@ import sys
 
 import utils
 
-puzzle_input = utils.read_puzzle_input(sys.argv[1])
-h, w = utils.input_dim(puzzle_input)
 
-factor = 1000000    # factor = 2 for Part 1
+def parse(puzzle_input: list[str]) -> tuple[list, list[int], list[int]]:
+    if utils.PURE_PYTHON:
+        empty_rows = ["#" not in row for row in puzzle_input]
+        empty_cols = ["#" not in col for col in zip(*puzzle_input)]
+        galaxies = [(i, j) for i, row in enumerate(puzzle_input) for j, c in enumerate(row) if c == "#"]
+    else:
+        grid = utils.Grid.from_lines(puzzle_input)
+        is_galaxy = grid.cells == ord("#")
+        empty_rows = (~is_galaxy.any(axis=1)).tolist()
+        empty_cols = (~is_galaxy.any(axis=0)).tolist()
+        galaxies = [grid.coords(index) for index in grid.find("#").tolist()]
 
-row_expansions = [(factor - 1) * (set(l) == {"."}) for l in puzzle_input]
-row_expansions = list(itertools.accumulate(row_expansions))
+    # Count the empty rows and columns up to each index, the expansion
+    # factor is only applied once we know which part we are solving.
+    row_expansions = list(itertools.accumulate(empty_rows))
+    col_expansions = list(itertools.accumulate(empty_cols))
 
-col_expansions = [
-    (factor - 1) * ({puzzle_input[i][j] for i in range(h)} == {"."})
-    for j in range(w)
-]
-col_expansions = list(itertools.accumulate(col_expansions))
+    return galaxies, row_expansions, col_expansions
 
-galaxies = [
-    (i + row_expansions[i], j + col_expansions[j])
-    for i, row in enumerate(puzzle_input)
-    for j, c in enumerate(row)
-    if c == "#"
-]
 
-# Compute pairwise manhattan distance.
-acc = 0
-for (i, gal1) in enumerate(galaxies):
-    for (j, gal2) in enumerate(galaxies[i:]):
-        (g1_y, g1_x) = gal1
-        (g2_y, g2_x) = gal2
+def galaxy_distances(parsed: tuple[list, list[int], list[int]], factor: int) -> int:
+    galaxies, row_expansions, col_expansions = parsed
+    galaxies = [
+        (i + (factor - 1) * row_expansions[i], j + (factor - 1) * col_expansions[j])
+        for i, j in galaxies
+    ]
 
-        dist = abs(g2_x - g1_x) + abs(g2_y - g1_y)
-        acc += dist
+    # Compute pairwise manhattan distance.
+    acc = 0
+    for (i, gal1) in enumerate(galaxies):
+        for (j, gal2) in enumerate(galaxies[i:]):
+            (g1_y, g1_x) = gal1
+            (g2_y, g2_x) = gal2
 
-        # print(f"{i+1} -> {i+j+1} = {dist}")
+            dist = abs(g2_x - g1_x) + abs(g2_y - g1_y)
+            acc += dist
 
-print(acc)
+            # print(f"{i+1} -> {i+j+1} = {dist}")
+
+    return acc
+
+
+def part1(parsed: tuple[list, list[int], list[int]]) -> int:
+    return galaxy_distances(parsed, factor=2)
+
+
+def part2(parsed: tuple[list, list[int], list[int]]) -> int:
+    return galaxy_distances(parsed, factor=1000000)
+
+
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
+
+
+if __name__ == "__main__":
+    parsed = parse(utils.read_puzzle_input(sys.argv[1]))
+    print(part1(parsed))
+    print(part2(parsed))
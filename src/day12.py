@@ -1,61 +1,96 @@
-import functools
+import itertools
 import sys
 
 import utils
+from utils.memo import memoize
 
-puzzle_input = utils.read_puzzle_input(sys.argv[1])
-springs_and_counts = [p.split() for p in puzzle_input]
+STREAM_INPUT = True
 
 
-@functools.cache
+# Identical rows are counted once per part (see the scopes in part1 and part2),
+# the table of a row is gone as soon as it's counted.
+@memoize(maxsize=1024, name="row_combinations")
 def count_combinations(springs: str, groups: tuple[int]) -> int:
-    """Recursively consume the string and cache repeated subproblems."""
+    """Consume the string from the back, one group at a time.
+
+    This used to recurse on (springs[i:], groups[g:]) with a cache, which got
+    as deep as the (unfolded) rows are long. Now ways[i] is the number of
+    combinations of springs[i:] with the groups placed so far (the last
+    ones), and every group replaces it with the counts including that group.
+    """
+    n = len(springs)
 
     # If we've exhausted all groups, that is fine unless there are
     # springs left to cover, which would make it an invalid solution.
-    if len(groups) == 0:
-        return int("#" not in springs)
-
-    # If there aren't enough springs left for the next group,
-    # this is also an invalid solution and we don't count it.
-    group_len = groups[0]
-    if len(springs) < group_len:
-        return 0
-
-    group = springs[:group_len]
-    insert_possible = set(group) <= set("#?")
-    space_after_group = (springs + ".")[group_len] in "?."
-
-    # If we are at a "#", we _have_ to start the group here.
-    if springs[0] == "#":
-        # If we can't start a group despite having to, we won't find
-        # any valid combinations in this recursion branch and can stop.
-        if not (insert_possible and space_after_group):
-            return 0
-
-        return count_combinations(springs[group_len + 1 :], groups[1:])
-    # If we are at a "?", we _may_ start a group here.
-    elif springs[0] == "?" and insert_possible and space_after_group:
-        # If we inserted the ###.. here and need to leave a space after.
-        group_used = count_combinations(springs[group_len + 1 :], groups[1:])
-        # If we chose not to do it, we just skip along.
-        no_group = count_combinations(springs[1:], groups)
-
-        return group_used + no_group
-    # Otherwise, we can't start a group here at all.
-    else:
-        return count_combinations(springs[1:], groups)
-
-
-acc_part1 = 0
-acc_part2 = 0
-
-for (springs, counts), p in zip(springs_and_counts, puzzle_input):
-    counts1 = tuple(map(int, counts.split(",")))
-    acc_part1 += count_combinations(springs, counts1)
-
-    springs2 = "?".join([springs] * 5)
-    counts2 = tuple(map(int, (",".join([counts] * 5)).split(",")))
-    acc_part2 += count_combinations(springs2, counts2)
-
-print(acc_part1, acc_part2)
+    # Skipping the space after a group at the very end lands at n + 1, same as n.
+    last_damaged = springs.rfind("#")
+    ways = [int(i > last_damaged) for i in range(n + 1)]
+    ways.append(ways[n])
+
+    # Everything the groups check per position only depends on the row, so
+    # it's looked up once here: how many non-"." springs start at i (a group
+    # starting at i can't extend past the next "."), whether position i can be
+    # the space after a group, and whether we _have_ to start a group at i.
+    run = [0] * (n + 1)
+    for i in reversed(range(n)):
+        run[i] = run[i + 1] + 1 if springs[i] != "." else 0
+    can_end = [c != "#" for c in springs] + [True]
+    damaged = [c == "#" for c in springs]
+
+    # The groups before a group need at least this many springs before it.
+    first_start = list(itertools.accumulate((g + 1 for g in groups), initial=0))
+
+    for g in reversed(range(len(groups))):
+        group_len = groups[g]
+        # If there aren't enough springs left for the group,
+        # this is also an invalid solution and we don't count it.
+        ways_after, ways = ways, [0] * (n + 2)
+        skipped = 0
+        for i in range(n - group_len, first_start[g] - 1, -1):
+            # If we inserted the ###.. here and need to leave a space after.
+            if run[i] >= group_len and can_end[i + group_len]:
+                used = ways_after[i + group_len + 1]
+            else:
+                used = 0
+
+            # At a "#", we _have_ to start the group here, at a "?" we may
+            # also skip along, and at a "." only skipping is possible (used is 0).
+            skipped = used if damaged[i] else used + skipped
+            ways[i] = skipped
+
+    return ways[0]
+
+
+def parse(puzzle_input: list[str]) -> list[tuple[str, str]]:
+    return [tuple(p.split()) for p in puzzle_input]
+
+
+def part1(springs_and_counts: list[tuple[str, str]]) -> int:
+    acc_part1 = 0
+    with count_combinations.scope():
+        for springs, counts in springs_and_counts:
+            counts1 = tuple(map(int, counts.split(",")))
+            acc_part1 += count_combinations(springs, counts1)
+
+    return acc_part1
+
+
+def part2(springs_and_counts: list[tuple[str, str]]) -> int:
+    acc_part2 = 0
+    with count_combinations.scope():
+        for springs, counts in springs_and_counts:
+            springs2 = "?".join([springs] * 5)
+            counts2 = tuple(map(int, (",".join([counts] * 5)).split(",")))
+            acc_part2 += count_combinations(springs2, counts2)
+
+    return acc_part2
+
+
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
+
+
+if __name__ == "__main__":
+    springs_and_counts = parse(utils.stream_lines(sys.argv[1]))
+    print(part1(springs_and_counts), part2(springs_and_counts))
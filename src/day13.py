@@ -1,35 +1,97 @@
 import sys
-from pprint import pprint
-from typing import Iterator
+from typing import TYPE_CHECKING, Iterator
 
 import utils
 
-puzzle_input = list(map(list, utils.read_puzzle_input(sys.argv[1])))
+if TYPE_CHECKING:
+    import numpy as np
 
+STREAM_INPUT = True
+
+HASH, DOT = b"#."
+
+
+def reflects(cells: "np.ndarray", reflect_idx: int) -> bool:
+    """Check if all rows of a pattern have a reflection at the given column.
 
-def reflects(row: str, reflect_idx: int) -> bool:
-    """Check if a string has a reflection at the given position.
-    
     e.g. abaababc, reflect_idx=2 -> True, because aba|aba..
     """
-    left = row[:reflect_idx]
-    right = row[reflect_idx:]
+    refl_len = min(reflect_idx, cells.shape[1] - reflect_idx)
+    left = cells[:, reflect_idx - refl_len : reflect_idx]
+    right = cells[:, reflect_idx : reflect_idx + refl_len]
+    return (left == right[:, ::-1]).all()
+
+
+def grid_reflections(pattern: "utils.Grid", prev: int | None) -> list[int]:
+    return [i for i in range(1, pattern.width) if i != prev and reflects(pattern.cells, i)]
+
+
+def grid_variants(pattern: "utils.Grid") -> Iterator[tuple["utils.Grid", "utils.Grid"]]:
+    """Replace all # and .'s with their opposites and yield the variantions.
+
+    Yields every variation together with its transpose. The cells are flipped
+    in place on a copy, so its transposed view sees each variation without
+    being recreated.
+    """
+    pattern = pattern.copy()
+    transposed = pattern.transpose()
+    flat = pattern.flat
+    for index, c in enumerate(flat.tolist()):
+        flat[index] = DOT if c == HASH else HASH
+        # Restore the cell even if the consumer stops iterating early.
+        try:
+            yield pattern, transposed
+        finally:
+            flat[index] = c
+
+
+def rows_reflect(rows: list[str], reflect_idx: int) -> bool:
+    """Same as reflects, for a pattern as a list of rows."""
+    refl_len = min(reflect_idx, len(rows[0]) - reflect_idx)
+    return all(
+        row[reflect_idx - refl_len : reflect_idx] == row[reflect_idx : reflect_idx + refl_len][::-1]
+        for row in rows
+    )
+
+
+def row_reflections(rows: list[str], prev: int | None) -> list[int]:
+    return [i for i in range(1, len(rows[0])) if i != prev and rows_reflect(rows, i)]
+
+
+def transpose_rows(rows: list[str]) -> list[str]:
+    return ["".join(col) for col in zip(*rows)]
 
-    refl_len = min(len(left), len(right))
-    return left[-refl_len:] == right[:refl_len][::-1]
 
+def row_variants(rows: list[str]) -> Iterator[tuple[list[str], list[str]]]:
+    """Same as grid_variants, with new rows for every variation."""
+    for i, row in enumerate(rows):
+        for j, c in enumerate(row):
+            variant = rows[:]
+            variant[i] = row[:j] + ("." if c == "#" else "#") + row[j + 1 :]
+            yield variant, transpose_rows(variant)
 
-def reflect_idxs(row: str) -> set[int]:
-    """Get all positions that can create a reflection."""
-    return {i for i in range(1, len(row)) if reflects(row, i)}
 
+def load_grid(lines: list[str]) -> "utils.Grid":
+    return utils.Grid.from_lines(lines)
 
-def pattern_reflection(pattern: list[str], prev: int = None) -> int | None:
-    """Search for reflections in each row and return the common one, if any."""
-    candidates = set(range(len(pattern[0]))) - {prev or -1}
-    for row in pattern:
-        candidates &= reflect_idxs(row)
 
+def transpose_grid(pattern: "utils.Grid") -> "utils.Grid":
+    return pattern.transpose()
+
+
+# A pattern is a Grid, or a list of row strings on the pure-Python path (see
+# utils.PURE_PYTHON). Grid is only looked up when parsing, which imports numpy.
+if utils.PURE_PYTHON:
+    load_pattern, transpose, reflections = list, transpose_rows, row_reflections
+    unsmuged_reflection_gen = row_variants
+else:
+    load_pattern, transpose, reflections = load_grid, transpose_grid, grid_reflections
+    unsmuged_reflection_gen = grid_variants
+
+
+def pattern_reflection(pattern: "utils.Grid | list[str]", prev: int = None) -> int | None:
+    """Search for a column that reflects every row, if any."""
+    candidates = reflections(pattern, prev)
     if len(candidates) == 0:
         return None
 
@@ -37,50 +99,64 @@ def pattern_reflection(pattern: list[str], prev: int = None) -> int | None:
     return candidates.pop()
 
 
-def unsmuged_reflection_gen(pattern: list[str]) -> Iterator[list[str]]:
-    """Replace all # and .'s with their opposites and yield the variantions."""
-    for (i, row) in enumerate(pattern[::]):
-        for (j, c) in enumerate(row):
-            pattern[i][j] = "." if c == "#" else "#"
-            yield pattern
-            pattern[i][j] = c
+def parse(puzzle_input: list[str]) -> list["utils.Grid | list[str]"]:
+    return [load_pattern(pattern) for pattern in utils.sections(puzzle_input)]
+
+
+def find_reflections(patterns: list["utils.Grid | list[str]"]) -> dict[int, tuple]:
+    existing_refls = {}
+    for (i, pattern) in enumerate(patterns):
+        if vert_refl := pattern_reflection(pattern):
+            existing_refls[i] = (vert_refl, None)
+        elif hori_refl := pattern_reflection(transpose(pattern)):
+            existing_refls[i] = (None, hori_refl)
+        else:
+            raise AssertionError("One reflection should exist")
+
+    return existing_refls
+
 
+def summarize(refls: list[tuple]) -> int:
+    vert_acc = sum(vert_refl or 0 for vert_refl, _ in refls)
+    hori_acc = sum(hori_refl or 0 for _, hori_refl in refls)
+    return vert_acc + hori_acc * 100
 
-patterns = utils.split_list_at(puzzle_input, pat=[])
 
 # Part 1 is straightforward.
-vert_acc = 0
-hori_acc = 0
-existing_refls = {}
-for (i, pattern) in enumerate(patterns):
-    if vert_refl := pattern_reflection(pattern):
-        existing_refls[i] = (vert_refl, None)
-        vert_acc += vert_refl
-    elif hori_refl := pattern_reflection(utils.transpose(pattern)):
-        existing_refls[i] = (None, hori_refl)
-        hori_acc += hori_refl
-    else:
-        raise AssertionError("One reflection should exist")
-
-print(vert_acc + hori_acc * 100)
+def part1(patterns: list["utils.Grid | list[str]"]) -> int:
+    return summarize(find_reflections(patterns).values())
+
 
 # Part 2 has a separate loop over all the de-smudged pattern variations
 # and ignores reflection positions that were found on the smudged version.
-vert_acc = 0
-hori_acc = 0
-for (i, pattern) in enumerate(patterns):
-    (prev_vert_refl, prev_hori_refl) = existing_refls[i]
-    for pattern_variant in unsmuged_reflection_gen(pattern):
-        if vert_refl := pattern_reflection(pattern_variant, prev=prev_vert_refl):
-            vert_acc += vert_refl
-            break
-        elif hori_refl := pattern_reflection(utils.transpose(pattern_variant), prev=prev_hori_refl):
-            hori_acc += hori_refl
-            break
+def part2(patterns: list["utils.Grid | list[str]"]) -> int:
+    existing_refls = find_reflections(patterns)
+
+    new_refls = []
+    for (i, pattern) in enumerate(patterns):
+        (prev_vert_refl, prev_hori_refl) = existing_refls[i]
+        for pattern_variant, transposed in unsmuged_reflection_gen(pattern):
+            if vert_refl := pattern_reflection(pattern_variant, prev=prev_vert_refl):
+                new_refls.append((vert_refl, None))
+                break
+            elif hori_refl := pattern_reflection(transposed, prev=prev_hori_refl):
+                new_refls.append((None, hori_refl))
+                break
+            else:
+                # Here no reflection necessarily needs to exist.
+                pass
         else:
-            # Here no reflection necessarily needs to exist.
-            pass
-    else:
-        raise AssertionError("No new reflection found for any smudge")
+            raise AssertionError("No new reflection found for any smudge")
+
+    return summarize(new_refls)
+
+
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
+
 
-print(vert_acc + hori_acc * 100)
+if __name__ == "__main__":
+    patterns = parse(utils.stream_lines(sys.argv[1]))
+    print(part1(patterns))
+    print(part2(patterns))
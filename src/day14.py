@@ -1,41 +1,90 @@
-import copy
 import sys
-from collections import defaultdict
 
 import utils
+from utils import cycles
 
+ROUND, CUBE, EMPTY = b"O#."
 
-def print_platform(l: list[list[str]]):
-    print("\n".join(["".join(row) for row in l]))
+# On the pure-Python path (see utils.PURE_PYTHON), a platform is a tuple of
+# row strings instead of a Grid, which is also hashable as it is.
+Rows = tuple[str, ...]
 
 
-def rotate(platform: list[list[str]]):
-    """Rotate a 2D matrix 90 degrees counterclockwise."""
-    return utils.transpose(platform[::-1])
+def rotate_grid(platform: "utils.Grid") -> "utils.Grid":
+    """Rotate the platform 90 degrees clockwise, as a view without copying."""
+    return platform.rotate(-1)
 
 
-def move_north(platform: list[list[str]]):
+def move_grid_north(platform: "utils.Grid") -> "utils.Grid":
     """Move all rocks north. For other directions, we rotate the platform."""
-    platform = copy.deepcopy(platform)
-    free_row_above = dict()
-    for i, row in enumerate(platform):
-        for j in range(len(row)):
-            if platform[i][j] == "O" and (free_row_above.get(j) is not None):
-                platform[free_row_above[j]][j] = platform[i][j]
-                platform[i][j] = "."
-
-                # The space above the insert position is now the highest free one.
-                free_row_above[j] += 1
-
-            if platform[i][j] == "." and (free_row_above.get(j) is None):
-                free_row_above[j] = i
-            elif platform[i][j] in set("O#"):
-                free_row_above[j] = None
+    import numpy as np
 
+    cells = platform.cells
+    h, w = cells.shape
+    is_cube = cells == CUBE
+
+    # Every cube rock starts a new segment of its column, the round rocks of
+    # a segment all roll up to the segment's start.
+    rows = np.arange(h)[:, None]
+    segment_start = np.maximum.accumulate(np.where(is_cube, rows + 1, 0), axis=0)
+    segment = np.cumsum(is_cube, axis=0) * w + np.arange(w)
+    rocks_in_segment = np.bincount(segment[cells == ROUND], minlength=(h + 1) * w)
+
+    rolled = np.where(rows - segment_start < rocks_in_segment[segment], ROUND, EMPTY)
+    return utils.Grid(np.where(is_cube, CUBE, rolled).astype(np.uint8))
+
+
+def grid_load(platform: "utils.Grid") -> int:
+    row_rocks = (platform.cells == ROUND).sum(axis=1)
+    return int(row_rocks @ range(platform.height, 0, -1))
+
+
+def grid_round_rocks(platform: "utils.Grid") -> bytes:
+    """Only the round rocks move, so their positions identify a platform state."""
+    import numpy as np
+
+    return np.packbits(platform.cells == ROUND).tobytes()
+
+
+def load_grid(puzzle_input: list[str]) -> "utils.Grid":
+    return utils.Grid.from_lines(puzzle_input)
+
+
+def rotate_rows(platform: Rows) -> Rows:
+    return tuple("".join(col) for col in zip(*platform[::-1]))
+
+
+def move_rows_north(platform: Rows) -> Rows:
+    # Between cube rocks, the round rocks of a column gather at the top.
+    columns = [
+        "#".join("O" * segment.count("O") + "." * segment.count(".") for segment in "".join(col).split("#"))
+        for col in zip(*platform)
+    ]
+    return tuple("".join(row) for row in zip(*columns))
+
+
+def rows_load(platform: Rows) -> int:
+    return sum(row.count("O") * (len(platform) - i) for i, row in enumerate(platform))
+
+
+def rows_state(platform: Rows) -> Rows:
+    """The rows are compact enough to identify a state themselves."""
     return platform
 
 
-def move_cycle(platform: list[list[str]]) -> list[list[str]]:
+if utils.PURE_PYTHON:
+    load_platform, rotate, move_north = tuple, rotate_rows, move_rows_north
+    compute_load, round_rocks = rows_load, rows_state
+else:
+    load_platform, rotate, move_north = load_grid, rotate_grid, move_grid_north
+    compute_load, round_rocks = grid_load, grid_round_rocks
+
+
+def print_platform(platform: "utils.Grid | Rows"):
+    print("\n".join(platform) if utils.PURE_PYTHON else platform)
+
+
+def move_cycle(platform: "utils.Grid | Rows") -> "utils.Grid | Rows":
     for i in range(4):
         platform = move_north(platform)
         platform = rotate(platform)
@@ -43,46 +92,28 @@ def move_cycle(platform: list[list[str]]) -> list[list[str]]:
     return platform
 
 
-def compute_load(platform: list[list[str]]) -> int:
-    return sum(
-        [
-            len(platform) - i
-            for i, row in enumerate(platform)
-            for j, c in enumerate(row)
-            if c == "O"
-        ]
-    )
-
-
-def hash_platform(platform: list[list[str]]) -> int:
-    return hash(tuple(map(tuple, platform)))
-
+def parse(puzzle_input: list[str]) -> "utils.Grid | Rows":
+    return load_platform(puzzle_input)
 
-platform = [list(l) for l in utils.read_puzzle_input(sys.argv[1])]
 
-# Part 1
-print(compute_load(move_north(platform)))
+def part1(platform: "utils.Grid | Rows") -> int:
+    return compute_load(move_north(platform))
 
-# Part 2
-previous_states = {}  # track board states.
 
-cycle_len = None
-cycle_prefix = None
-for i in range(100000000):
-    platform_hash = hash_platform(platform)
+def part2(platform: "utils.Grid | Rows") -> int:
+    # The spin cycles enter a loop of platform states after a while. Only the
+    # rock positions and the load of every state are kept while searching it,
+    # which is all we need to know the load after any number of cycles.
+    cycle = cycles.find_cycle(move_cycle, platform, key=round_rocks, value=compute_load)
+    return cycle.value_at(1000000000)
 
-    # If we encounter a platform configuration again, we've seen them all.
-    # From here on out, a sequence of states will repeat in a certain cycle.
-    if platform_hash in previous_states:
-        cycle_len = i - previous_states[platform_hash][0]
-        cycle_prefix = previous_states[platform_hash][0]
-        break
 
-    previous_states[platform_hash] = (i, platform)
-    platform = move_cycle(platform)
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
 
-states_by_time = dict(previous_states.values())
 
-# We've entered a cycle after a certain number of steps.
-state_at_end = (1000000000 - cycle_prefix) % cycle_len + cycle_prefix
-print(compute_load(states_by_time[state_at_end]))
+if __name__ == "__main__":
+    platform = parse(utils.read_puzzle_input(sys.argv[1]))
+    print(part1(platform))
+    print(part2(platform))
@@ -9,27 +9,43 @@ def holiday_hash(s: str) -> int:
     return functools.reduce(lambda acc, c: (acc + ord(c)) * 17 % 256, s, 0)
 
 
-puzzle_input = utils.read_puzzle_input(sys.argv[1])[0].split(",")
-print(sum(map(holiday_hash, puzzle_input)))
-
-# Rely on the fact that dict in Python maintains the insert order.
-boxes = defaultdict(dict)
-for elem in puzzle_input:
-    if "=" in elem:
-        label, focal = elem.split("=")
-        box_idx = holiday_hash(label)
-        boxes[box_idx][label] = int(focal)
-    else:
-        label = elem[:-1]
-        box_idx = holiday_hash(label)
-        boxes[box_idx].pop(label, None)
-
-
-focusing_power = sum(
-    sum(
-        ((1 + box_idx) * (1 + slot_idx) * l)
-        for slot_idx, l in enumerate(lenses.values())
+def parse(puzzle_input: list[str]) -> list[str]:
+    return puzzle_input[0].split(",")
+
+
+def part1(puzzle_input: list[str]) -> int:
+    return sum(map(holiday_hash, puzzle_input))
+
+
+def part2(puzzle_input: list[str]) -> int:
+    # Rely on the fact that dict in Python maintains the insert order.
+    boxes = defaultdict(dict)
+    for elem in puzzle_input:
+        if "=" in elem:
+            label, focal = elem.split("=")
+            box_idx = holiday_hash(label)
+            boxes[box_idx][label] = int(focal)
+        else:
+            label = elem[:-1]
+            box_idx = holiday_hash(label)
+            boxes[box_idx].pop(label, None)
+
+    focusing_power = sum(
+        sum(
+            ((1 + box_idx) * (1 + slot_idx) * l)
+            for slot_idx, l in enumerate(lenses.values())
+        )
+        for box_idx, lenses in boxes.items()
     )
-    for box_idx, lenses in boxes.items()
-)
-print(focusing_power)
+    return focusing_power
+
+
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
+
+
+if __name__ == "__main__":
+    puzzle_input = parse(utils.read_puzzle_input(sys.argv[1]))
+    print(part1(puzzle_input))
+    print(part2(puzzle_input))
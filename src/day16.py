@@ -2,19 +2,40 @@ import itertools
 import sys
 from collections import Counter
 from dataclasses import dataclass, field
-from typing import ClassVar
-
-import numpy as np  # Want to add coords.
-from tqdm import tqdm
+from typing import TYPE_CHECKING, ClassVar
 
+import telemetry
 import utils
 
+if TYPE_CHECKING:
+    import numpy as np
+
+
+@dataclass(slots=True, frozen=True)
+class Rows:
+    """The grid as row strings for the pure-Python path, indexed like the numpy array."""
+
+    rows: tuple[str, ...]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.rows), len(self.rows[0])
+
+    def __getitem__(self, coord: tuple[int, int]) -> str:
+        return self.rows[coord[0]][coord[1]]
+
+
+def advance(coord: tuple[int, int], direction: tuple[int, int]) -> tuple[int, int]:
+    return (coord[0] + direction[0], coord[1] + direction[1])
 
-@dataclass
+
+# Lots of these get created, so plain int tuples for the coordinates and slots
+# instead of a __dict__ per node.
+@dataclass(slots=True)
 class BeamNode:
-    coord: np.array
-    direction: np.array
-    grid: np.array
+    coord: tuple[int, int]
+    direction: tuple[int, int]
+    grid: "np.ndarray | Rows"
 
     children: list["BeamNode"] = field(init=False, default_factory=lambda: [])
 
@@ -25,44 +46,44 @@ class BeamNode:
         """Move the beam depending where it is, return the new location(s)."""
 
         beams = []
-        match (self.grid[self.coord[0]][self.coord[1]], tuple(self.direction)):
+        match (self.grid[self.coord], self.direction):
             # Moving through empty space or through the pointy end of splitter.
             case (".", _) | ("-", (0, _)) | ("|", (_, 0)):
-                beams = [BeamNode(self.coord + self.direction, self.direction, self.grid)]
+                beams = [BeamNode(advance(self.coord, self.direction), self.direction, self.grid)]
             # Come at ->\ or /<-, so we go down.
             case ("\\", (0, 1)) | ("/", (0, -1)):
                 new_direction = (1, 0)
-                beams = [BeamNode(self.coord + new_direction, new_direction, self.grid)]
+                beams = [BeamNode(advance(self.coord, new_direction), new_direction, self.grid)]
             # Come at \<- or ->/, so we go up.
             case ("\\", (0, -1)) | ("/", (0, 1)):
                 new_direction = (-1, 0)
-                beams = [BeamNode(self.coord + new_direction, new_direction, self.grid)]
+                beams = [BeamNode(advance(self.coord, new_direction), new_direction, self.grid)]
             # Come at ↑\ or ↓/, so we go left.
             case ("\\", (-1, 0)) | ("/", (1, 0)):
                 new_direction = (0, -1)
-                beams = [BeamNode(self.coord + new_direction, new_direction, self.grid)]
+                beams = [BeamNode(advance(self.coord, new_direction), new_direction, self.grid)]
             # Come at \↓ or /↑, so we go right.
             case ("\\", (1, 0)) | ("/", (-1, 0)):
                 new_direction = (0, 1)
-                beams = [BeamNode(self.coord + new_direction, new_direction, self.grid)]
+                beams = [BeamNode(advance(self.coord, new_direction), new_direction, self.grid)]
             # Hit horizontal splitter from left or right -> go up and down.
             case ("|", _):
                 new_direction1 = (1, 0)
                 new_direction2 = (-1, 0)
                 beams = [
-                    BeamNode(self.coord + new_direction1, new_direction1, self.grid),
-                    BeamNode(self.coord + new_direction2, new_direction2, self.grid),
+                    BeamNode(advance(self.coord, new_direction1), new_direction1, self.grid),
+                    BeamNode(advance(self.coord, new_direction2), new_direction2, self.grid),
                 ]
             # Hit vertical splitter from top or bottom -> go left and right.
             case ("-", _):
                 new_direction1 = (0, -1)
                 new_direction2 = (0, 1)
                 beams = [
-                    BeamNode(self.coord + new_direction1, new_direction1, self.grid),
-                    BeamNode(self.coord + new_direction2, new_direction2, self.grid),
+                    BeamNode(advance(self.coord, new_direction1), new_direction1, self.grid),
+                    BeamNode(advance(self.coord, new_direction2), new_direction2, self.grid),
                 ]
             case _:
-                print(self.grid[self.coord[0]][self.coord[1]], tuple(self.direction))
+                print(self.grid[self.coord], self.direction)
                 raise AssertionError("Forgot something")
 
         # Filter out beams that are out of bounds or entered a cycle.
@@ -83,10 +104,10 @@ class BeamNode:
         return self in BeamNode.node_visited
 
     def __hash__(self) -> int:
-        return hash((*self.coord, *self.direction))
+        return hash((self.coord, self.direction))
 
     def __eq__(self, other: "BeamNode") -> bool:
-        return hash(self) == hash(other)
+        return (self.coord, self.direction) == (other.coord, other.direction)
 
     def __repr__(self) -> str:
         return f"{self.coord} ({self.direction}, in_grid={self.in_grid})"
@@ -96,24 +117,24 @@ class BeamNode:
         cls.node_visited = set()
 
 
-puzzle_input = np.array(list(map(list, utils.read_puzzle_input(sys.argv[1]))))
-print(puzzle_input.shape)
-
-
 def count_energized(beam: BeamNode, cells: set) -> int:
-    cells |= {tuple(beam.coord)}
-
-    for child in beam.children:
-        cells |= count_energized(child, cells)
+    # The beam tree is as deep as the beam is long, so walk it with a stack.
+    beams = [beam]
+    while beams:
+        beam = beams.pop()
+        cells.add(beam.coord)
+        beams.extend(beam.children)
 
     return cells
 
 
-def energized_from_start(coord: tuple[int, int], direction: tuple[int, int]) -> int:
+def energized_from_start(
+    puzzle_input: "np.ndarray | Rows", coord: tuple[int, int], direction: tuple[int, int]
+) -> int:
     BeamNode.clear_visitation_cache()
     beam_root = BeamNode(
-        coord=np.array(coord),
-        direction=np.array(direction),
+        coord=coord,
+        direction=direction,
         grid=puzzle_input,
     )
 
@@ -124,20 +145,42 @@ def energized_from_start(coord: tuple[int, int], direction: tuple[int, int]) ->
     return len(count_energized(beam_root, cells=set()))
 
 
-# Part 1
-print(energized_from_start((0, 0), (0, 1)))
+def parse(puzzle_input: list[str]) -> "np.ndarray | Rows":
+    if utils.PURE_PYTHON:
+        return Rows(tuple(puzzle_input))
+
+    import numpy as np
+
+    return np.array(list(map(list, puzzle_input)))
+
+
+def part1(puzzle_input: "np.ndarray | Rows") -> int:
+    return energized_from_start(puzzle_input, (0, 0), (0, 1))
+
+
+def part2(puzzle_input: "np.ndarray | Rows") -> int:
+    height, width = puzzle_input.shape
+    candidates = []
+    candidates += [((0, j), (1, 0)) for j in range(width)]
+    candidates += [((height - 1, j), (-1, 0)) for j in range(width)]
+    candidates += [((i, 0), (0, 1)) for i in range(height)]
+    candidates += [((i, width - 1), (0, -1)) for i in range(height)]
+
+    # We could employ a cache of energized cells along previously computed
+    # paths here, which would make this fairly instant, but after trying a
+    # bit, I didn't want to refactor things further and just brute-force.
+    return max(
+        energized_from_start(puzzle_input, coord, direction)
+        for coord, direction in telemetry.progress(candidates, "starts")
+    )
+
+
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
 
-# Part 2
-height, width = puzzle_input.shape
-candidates = []
-candidates += [((0, j), (1, 0)) for j in range(width)]
-candidates += [((height - 1, j), (-1, 0)) for j in range(width)]
-candidates += [((i, 0), (0, 1)) for i in range(height)]
-candidates += [((i, width - 1), (0, -1)) for i in range(height)]
 
-# We could employ a cache of energized cells along previously computed
-# paths here, which would make this fairly instant, but after trying a
-# bit, I didn't want to refactor things further and just brute-force.
-print(
-    max(energized_from_start(coord, direction) for coord, direction in tqdm(candidates))
-)
+if __name__ == "__main__":
+    puzzle_input = parse(utils.read_puzzle_input(sys.argv[1]))
+    print(part1(puzzle_input))
+    print(part2(puzzle_input))
@@ -1,12 +1,12 @@
 import sys
 from dataclasses import dataclass
 
-import numpy as np
-
 import utils
 
+STREAM_INPUT = True
+
 
-@dataclass
+@dataclass(slots=True)
 class Dig:
     direction: str
     steps: int
@@ -26,10 +26,6 @@ class Dig:
         return cls(direction=direction, steps=steps, color=color.strip("()"))
 
 
-digs = [Dig.from_str(l) for l in utils.read_puzzle_input(sys.argv[1])]
-digs2 = [Dig.from_str_part2(l) for l in utils.read_puzzle_input(sys.argv[1])]
-
-
 def move_pos(dig: Dig, pos: tuple[int, int]) -> tuple[int, int]:
     match dig:
         case Dig("R", steps, _):
@@ -49,22 +45,44 @@ def compute_lagoon_volume(digs: list[Dig]) -> int:
     for dig in digs:
         dig_path.append(move_pos(dig, pos=dig_path[-1]))
 
-    dig_path = np.array(dig_path)
+    # Plain integers instead of numpy: exact, and saves the numpy import.
+    segments = list(zip(dig_path, dig_path[1:]))
 
     # Length of the path boundary.
-    path_len = np.abs(dig_path[1:, :] - dig_path[:-1, :]).max(axis=1).sum()
+    path_len = sum(abs(y1 - y0) + abs(x1 - x0) for (y0, x0), (y1, x1) in segments)
 
-    # Shoelace formula (Trapezoid) for the polygon area.
-    path_y = dig_path[:, 0]
-    path_x = dig_path[:, 1]
-
-    poly_area = np.abs(sum((path_y[1:] + path_y[:-1]) * (path_x[1:] - path_x[:-1])) / 2)
+    # Shoelace formula (Trapezoid) for the polygon area. The path only moves
+    # along the axes on integer coordinates, so the area is an integer too.
+    poly_area = abs(sum((y1 + y0) * (x1 - x0) for (y0, x0), (y1, x1) in segments)) // 2
 
     # Now Pick's theorem, since we know the boundary points and area.
-    interior_points = poly_area - path_len / 2 + 1
+    interior_points = poly_area - path_len // 2 + 1
 
     return path_len + interior_points
 
 
-print(compute_lagoon_volume(digs))
-print(compute_lagoon_volume(digs2))
+def parse(puzzle_input: list[str]) -> tuple[list[Dig], list[Dig]]:
+    digs, digs2 = [], []
+    for l in puzzle_input:
+        digs.append(Dig.from_str(l))
+        digs2.append(Dig.from_str_part2(l))
+    return digs, digs2
+
+
+def part1(parsed: tuple[list[Dig], list[Dig]]) -> int:
+    return compute_lagoon_volume(parsed[0])
+
+
+def part2(parsed: tuple[list[Dig], list[Dig]]) -> int:
+    return compute_lagoon_volume(parsed[1])
+
+
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
+
+
+if __name__ == "__main__":
+    parsed = parse(utils.stream_lines(sys.argv[1]))
+    print(part1(parsed))
+    print(part2(parsed))
@@ -3,6 +3,8 @@ import sys
 
 import utils
 
+STREAM_INPUT = True
+
 
 def parse_workflow(s: str):
     label, rules = s[:-1].split("{")
@@ -12,13 +14,16 @@ def parse_workflow(s: str):
     for rule_str in rule_strs:
         rule_fields = rule_str.split(":")
 
+        # Besides the rule itself, keep the range of ratings that passes it.
         match rule_fields:
             case [target_label]:
-                target_rules.append((target_label, "x", lambda x: True))
+                target_rules.append((target_label, "x", lambda x: True, (1, 4000 + 1)))
             case [rule_str, target_label]:
                 var, condition = rule_str[0], rule_str[1:]
                 rule = eval(f"lambda x: x{condition}")
-                target_rules.append((target_label, var, rule))
+                value = int(condition[1:])
+                passing = (1, value) if condition[0] == "<" else (value + 1, 4000 + 1)
+                target_rules.append((target_label, var, rule, passing))
             case _:
                 raise Exception()
 
@@ -29,14 +34,14 @@ def part_is_accepted(part: dict, workflows: dict):
     flow = "in"
     flow_history = ["in"]
     while flow not in {"A", "R"}:
-        for target_label, var, rule in workflows[flow]:
+        for target_label, var, rule, _ in workflows[flow]:
             if rule(part[var]):
                 flow = target_label
                 break
 
         flow_history.append(flow)
 
-    print("->".join(flow_history))
+    # print("->".join(flow_history))
     return flow == "A"
 
 
@@ -48,49 +53,57 @@ def get_all_acceptance_flows(flow: str, workflows: dict) -> list:
     if flow == "A":
         yield [(None, flow)]
 
-    for i, (target_flow, _, _) in enumerate(workflows.get(flow, [])):
+    for i, (target_flow, _, _, _) in enumerate(workflows.get(flow, [])):
         for h in get_all_acceptance_flows(target_flow, workflows):
             if len(h) > 0:
                 yield [(i, flow), *h]
 
 
 def count_flow_options(flow_nodes: list[str], workflows: dict) -> int:
-    # Misuse sets as ranges for "convenience".
-    # (It didn't turn out to be convenient..)
-    possible_inputs = {
-        "x": set(range(1, 4000 + 1)),
-        "m": set(range(1, 4000 + 1)),
-        "a": set(range(1, 4000 + 1)),
-        "s": set(range(1, 4000 + 1)),
-    }
+    # Track the possible ratings as intervals, so filtering them by a rule
+    # doesn't have to go over all 4000 values.
+    possible_inputs = {var: utils.IntervalSet.range(1, 4000 + 1) for var in "xmas"}
 
     for (fi, flow), (_, next_flow) in zip(flow_nodes, flow_nodes[1:]):
-        for i, (label, var, rule) in enumerate(workflows[flow]):
+        for i, (label, var, _, passing) in enumerate(workflows[flow]):
             jump_here = label == next_flow and i == fi
 
             # If we don't take this jump, filter out range that did *not* pass.
-            filter_rule = rule if jump_here else (lambda x: not rule(x))
-
-            possible_inputs = {
-                k: v.copy() if k != var else set(filter(filter_rule, v))
-                for k, v in possible_inputs.items()
-            }
-
+            passing = utils.IntervalSet.range(*passing)
             if jump_here:
+                possible_inputs[var] &= passing
                 break
 
-    return math.prod([len(v) for v in possible_inputs.values()])
+            possible_inputs[var] -= passing
+
+    return math.prod([v.size for v in possible_inputs.values()])
+
+
+def parse(puzzle: list[str]) -> tuple[dict, list[dict]]:
+    workflow_strs, part_strs = utils.sections(puzzle)
+
+    parts = [eval(s.replace("{", "dict(").replace("}", ")")) for s in part_strs]
+    workflows = dict([parse_workflow(s) for s in workflow_strs])
+    return workflows, parts
+
+
+def part1(parsed: tuple[dict, list[dict]]) -> int:
+    workflows, parts = parsed
+    return sum([sum(p.values()) for p in parts if part_is_accepted(p, workflows)])
+
 
+def part2(parsed: tuple[dict, list[dict]]) -> int:
+    workflows, _parts = parsed
+    accept_flows = list(get_all_acceptance_flows("in", workflows))
+    return sum(count_flow_options(flow, workflows) for flow in accept_flows)
 
-puzzle = utils.read_puzzle_input(sys.argv[1])
-workflow_strs, part_strs = utils.split_list_at(puzzle, "")
 
-parts = [eval(s.replace("{", "dict(").replace("}", ")")) for s in part_strs]
-workflows = dict([parse_workflow(s) for s in workflow_strs])
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
 
-# Part 1
-print(sum([sum(p.values()) for p in parts if part_is_accepted(p, workflows)]))
 
-# Part 2
-accept_flows = list(get_all_acceptance_flows("in", workflows))
-print(sum(count_flow_options(flow, workflows) for flow in accept_flows))
+if __name__ == "__main__":
+    parsed = parse(utils.stream_lines(sys.argv[1]))
+    print(part1(parsed))
+    print(part2(parsed))
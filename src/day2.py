@@ -5,6 +5,10 @@ from dataclasses import dataclass
 
 from collections import Counter
 
+import utils
+
+STREAM_INPUT = True
+
 @dataclass
 class DrawingGame:
     id: int
@@ -48,15 +52,31 @@ bag_contents = Counter({
     "blue": 14,
     })
 
-lines = [line.strip() for line in open(sys.argv[1]).readlines()]
-games = [DrawingGame.from_input_line(line) for line in lines]
-valid_game_ids = [
-    game.id for game in games if game.is_valid_game(bag_contents)
-]
 
-print(sum(valid_game_ids))
+def parse(puzzle_input: list[str]) -> list[DrawingGame]:
+    return [DrawingGame.from_input_line(line) for line in puzzle_input]
+
+
+def part1(games: list[DrawingGame]) -> int:
+    valid_game_ids = [
+        game.id for game in games if game.is_valid_game(bag_contents)
+    ]
+    return sum(valid_game_ids)
+
+
+def part2(games: list[DrawingGame]) -> int:
+    min_cube_powers = [
+        math.prod(game.min_cubes_necessary().values()) for game in games
+    ]
+    return sum(min_cube_powers)
+
+
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
+
 
-min_cube_powers = [
-    math.prod(game.min_cubes_necessary().values()) for game in games
-]
-print(sum(min_cube_powers))
+if __name__ == "__main__":
+    games = parse(utils.stream_lines(sys.argv[1]))
+    print(part1(games))
+    print(part2(games))
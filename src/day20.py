@@ -1,18 +1,16 @@
-import math
 import sys
 from collections import Counter, defaultdict, deque
 from dataclasses import dataclass
 
 import utils
+from utils import cycles
+from utils.graph import CSRGraph
 
-puzzle = utils.read_puzzle_input(sys.argv[1])
-
-
-@dataclass
+@dataclass(slots=True)
 class FlipFlop:
     state: bool = False
 
-    def emit_pulse(self, src: str, pulse: bool) -> bool | None:
+    def emit_pulse(self, src: int, pulse: bool) -> bool | None:
         if pulse:
             return
 
@@ -20,33 +18,32 @@ class FlipFlop:
         return self.state
 
 
-@dataclass
+@dataclass(slots=True)
 class Conjunction:
-    state: dict[str, bool]
+    state: dict[int, bool]
 
-    def emit_pulse(self, src: str, pulse: bool) -> bool:
+    def emit_pulse(self, src: int, pulse: bool) -> bool:
         self.state[src] = pulse
         return not all(self.state.values())
 
 
-@dataclass
+@dataclass(slots=True)
 class Broadcast:
-    def emit_pulse(self, src: str, pulse: bool) -> bool:
+    def emit_pulse(self, src: int, pulse: bool) -> bool:
         return pulse
 
 
-@dataclass
+@dataclass(slots=True)
 class Untyped:
-    def emit_pulse(self, src: str, pulse: bool) -> None:
+    def emit_pulse(self, src: int, pulse: bool) -> None:
         return None
 
 
-def main():
-    modules = {}
+def parse(puzzle: list[str]) -> tuple[CSRGraph, dict]:
+    edges = []
     mod_types = {}
     for line in puzzle:
         module, targets = line.split(" -> ")
-        targets = targets.split(", ")
 
         if module.startswith(("%", "&")):
             mod_type, mod_name = module[0], module[1:]
@@ -56,50 +53,110 @@ def main():
             raise AssertionError(f"Failed to parse {line}")
 
         mod_types[mod_name] = mod_type
-        modules[mod_name] = targets
+        edges += [(mod_name, target) for target in targets.split(", ")]
+
+    # The button pushes the broadcaster, intern it so pulses only carry ids.
+    modules = CSRGraph.from_edges(edges, nodes=["button", *mod_types])
+    return modules, {modules.id(name): mod_type for name, mod_type in mod_types.items()}
+
+
+def module_inputs(modules: CSRGraph) -> dict[int, list[int]]:
+    inputs = defaultdict(list)
+    for mod in range(modules.num_nodes):
+        for target in modules.neighbors(mod):
+            inputs[target].append(mod)
+
+    return inputs
 
-    mod_states = {}
-    for mod_name, mod_type in mod_types.items():
+
+def upstream_modules(modules: CSRGraph, mod: int) -> list[int]:
+    """All modules whose pulses can reach mod, i.e. that determine what it sends."""
+    inputs = module_inputs(modules)
+    upstream = {mod}
+    todo = [mod]
+    while todo:
+        for source in inputs[todo.pop()]:
+            if source not in upstream:
+                upstream.add(source)
+                todo.append(source)
+
+    return sorted(upstream)
+
+
+def init_states(modules: CSRGraph, mod_types: dict) -> list:
+    """Create fresh module states, so each part starts from a clean machine."""
+    inputs = module_inputs(modules)
+
+    mod_states = [Untyped()] * modules.num_nodes
+    for mod, mod_type in mod_types.items():
         if mod_type == "b":
-            mod_states[mod_name] = Broadcast()
+            mod_states[mod] = Broadcast()
         elif mod_type == "%":
-            mod_states[mod_name] = FlipFlop()
+            mod_states[mod] = FlipFlop()
         else:
-            inputs = [mod for mod, targets in modules.items() if mod_name in targets]
-            mod_states[mod_name] = Conjunction({m: False for m in inputs})
+            mod_states[mod] = Conjunction({m: False for m in inputs[mod]})
+
+    return mod_states
+
+
+def part1(parsed: tuple[CSRGraph, dict]) -> int:
+    modules, mod_types = parsed
+    mod_states = init_states(modules, mod_types)
 
     acc = Counter()
     for i in range(1000):
-        c, _ = push_button(modules, mod_states, search="")
+        c, _ = push_button(modules, mod_states, search=-1)
         acc += c
 
-    # Part 1
-    print(acc, acc[True] * acc[False])
+    return acc[True] * acc[False]
+
+
+def part2(parsed: tuple[CSRGraph, dict]) -> int:
+    modules, mod_types = parsed
 
     # Shamefully, I had a hint for this, which was to look at the graph.
     # We see that all the inputs to the final conjunction are FlipFlops.
     # Finding the iteration for which each of them sends a signal is easier
-    # because of the much smaller search space. I assumed without proof that
-    # each would fire in a certain cycle, which is confirmed by looking at
-    # their firing patterns. The LCM of the cycles is then when they all fire.
-    cycles = []
+    # because of the much smaller search space. Each of them only depends on
+    # its own part of the machine, which runs in a cycle of button presses.
+    # So we detect the cycle of that part's states and note in which presses
+    # it sends a high pulse. The first press in which all of them do is then
+    # found through the CRT, for the puzzle input it's the LCM of the cycles.
+    schedules = []
     for flip_node in ["xp", "xl", "gp", "ln"]:
-        last = 0
-        cycle = None
-        for i in range(20000):
-            _, found = push_button(modules, mod_states, search=flip_node)
-            if found:
-                cycle = i - last
-                last = i
-                print(flip_node, i, cycle)
-        cycles.append(cycle)
+        search = modules.id(flip_node)
+        upstream = upstream_modules(modules, search)
+        mod_states = init_states(modules, mod_types)
+
+        # The state after a press is whether flip_node fired during it, plus
+        # the states of the modules that determine what flip_node does next.
+        def press(state: tuple[bool, list]) -> tuple[bool, list]:
+            _, found = push_button(modules, state[1], search=search)
+            return found, state[1]
+
+        def key(state: tuple[bool, list]) -> tuple:
+            fired, states = state
+            return fired, tuple(module_state(states[mod]) for mod in upstream)
 
-    # Part 2
-    print(math.lcm(*cycles))
+        cycle = cycles.find_cycle(press, (False, mod_states), key=key, value=lambda state: state[0])
+        fired_presses = {i for i, fired in enumerate(cycle.values) if fired}
+        # print(flip_node, cycle.prefix, cycle.length, fired_presses)
+        schedules.append((fired_presses, cycle))
 
+    return cycles.first_common_step(schedules)
 
-def push_button(modules: dict, mod_states: dict, search: str) -> tuple[Counter, bool]:
-    pulses = deque([(("button", "broadcaster"), False)])
+
+def module_state(mod_state) -> bool | tuple | None:
+    if isinstance(mod_state, FlipFlop):
+        return mod_state.state
+    elif isinstance(mod_state, Conjunction):
+        return tuple(mod_state.state.values())
+
+    return None
+
+
+def push_button(modules: CSRGraph, mod_states: list, search: int) -> tuple[Counter, bool]:
+    pulses = deque([((modules.id("button"), modules.id("broadcaster")), False)])
 
     pulse_count = Counter()
     found = False
@@ -109,19 +166,27 @@ def push_button(modules: dict, mod_states: dict, search: str) -> tuple[Counter,
 
         # Visualize the test input.
         # d = {False: "low", True: "high"}
-        # print(f"{src} -{d[pulse]}-> {target}")
+        # print(f"{modules.label(src)} -{d[pulse]}-> {modules.label(target)}")
 
         if src == search and pulse:
             found = True
 
-        next_pulse = mod_states.get(target, Untyped()).emit_pulse(src, pulse)
+        next_pulse = mod_states[target].emit_pulse(src, pulse)
         if next_pulse is None:
             continue
 
-        for next_target in modules[target]:
+        for next_target in modules.neighbors(target):
             pulses.append(((target, next_target), next_pulse))
 
     return pulse_count, found
 
 
-main()
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
+
+
+if __name__ == "__main__":
+    parsed = parse(utils.read_puzzle_input(sys.argv[1]))
+    print(part1(parsed))
+    print(part2(parsed))
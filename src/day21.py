@@ -34,19 +34,11 @@ fit not work, but somehow it does anyway. I'm not exacly sure why that is, I cou
 imagined that I have to fit separate functions for (0, 2, 4) and (1, 3, 5). Oh well.
 """
 import sys
-from pprint import pprint
-
-import numpy as np
-from tqdm import tqdm
+from fractions import Fraction
 
+import telemetry
 import utils
 
-puzzle = [list(l) for l in utils.read_puzzle_input(sys.argv[1])]
-h, w = utils.input_dim(puzzle)
-
-start = [(i, j) for i in range(h) for j in range(w) if puzzle[i][j] == "S"][0]
-positions = set({start})
-
 
 def print_map(puzzle, past_positions):
     """Used during debugging & exploration."""
@@ -63,37 +55,88 @@ def print_map(puzzle, past_positions):
     )
 
 
+def parse(puzzle_input: list[str]) -> tuple[list[list[str]], tuple[int, int]]:
+    puzzle = [list(l) for l in puzzle_input]
+    h, w = utils.input_dim(puzzle)
+
+    start = [(i, j) for i in range(h) for j in range(w) if puzzle[i][j] == "S"][0]
+    return puzzle, start
+
+
+def fit_quadratic(x: list[int], y: list[int]) -> list[Fraction]:
+    """Least squares fit of a*x^2 + b*x + c, like np.polyfit(x, y, deg=2), but exact.
+
+    Solves the normal equations with fractions, so no numpy is needed.
+    """
+    # Row k of the augmented normal equations: sum(x^(k+p)) * coeff_p = sum(x^k * y).
+    rows = [
+        [Fraction(sum(xi ** (k + p) for xi in x)) for p in (2, 1, 0)] + [Fraction(sum(xi**k * yi for xi, yi in zip(x, y)))]
+        for k in (2, 1, 0)
+    ]
+    for col in range(3):
+        pivot = next(r for r in range(col, 3) if rows[r][col] != 0)
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(3):
+            if r != col:
+                factor = rows[r][col] / rows[col][col]
+                rows[r] = [a - factor * b for a, b in zip(rows[r], rows[col])]
+
+    return [rows[k][3] / rows[k][k] for k in range(3)]
+
+
 # Only for part 2 - part 1 is easy. I had some optimization for part 2
 # not move old values redundantly (we know where they are, depending on
 # even or odd steps), but I removed that to keep it simple and to ensure
 # I don't mess up after I finally figured out the interpolation.
-reached_log = []
-N = h * 4 + h // 2
-for step in tqdm(range(N)):
-    next_positions = set()
-    for i, j in positions:
-        for di, dj in {(-1, 0), (1, 0), (0, 1), (0, -1)}:
-            ni, nj = (i + di, j + dj)
+def part2(parsed: tuple[list[list[str]], tuple[int, int]]) -> int:
+    puzzle, start = parsed
+    h, w = utils.input_dim(puzzle)
+    positions = set({start})
+
+    reached_log = []
+    N = h * 4 + h // 2
+    for step in telemetry.progress(range(N), "steps"):
+        next_positions = set()
+        for i, j in positions:
+            for di, dj in {(-1, 0), (1, 0), (0, 1), (0, -1)}:
+                ni, nj = (i + di, j + dj)
+
+                lookup_i = ni % h
+                lookup_j = nj % w
+
+                # Don't go across walls.
+                if puzzle[lookup_i][lookup_j] == "#":
+                    continue
+
+                next_positions.add((ni, nj))
+
+        positions = next_positions
+        telemetry.gauge("positions", len(positions))
+
+        # We reached the end of garden k*131 + 65.
+        if ((step + 1) - h // 2) % h == 0:
+            k = ((step + 1) - h // 2) // h
+            reached_log.append((k, len(positions)))
 
-            lookup_i = ni % h
-            lookup_j = nj % w
+    x, y = zip(*reached_log)
+    if utils.PURE_PYTHON:
+        coeffs = [round(c) for c in fit_quadratic(x, y)]
+    else:
+        # Heavy imports only on the path that needs them.
+        import numpy as np
 
-            # Don't go across walls.
-            if puzzle[lookup_i][lookup_j] == "#":
-                continue
+        coeffs = [round(c) for c in np.polyfit(x, y, deg=2)]
 
-            next_positions.add((ni, nj))
+    arg = (26501365 - 65) // 131
+    answer = coeffs[0] * arg**2 + coeffs[1] * arg + coeffs[0]
+    return int(answer)
 
-    positions = next_positions
 
-    # We reached the end of garden k*131 + 65.
-    if ((step + 1) - h // 2) % h == 0:
-        k = ((step + 1) - h // 2) // h
-        reached_log.append((k, len(positions)))
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return None, part2(parsed)
 
-x, y = zip(*reached_log)
-coeffs = [round(c) for c in np.polyfit(x, y, deg=2)]
 
-arg = (26501365 - 65) // 131
-answer = coeffs[0] * arg**2 + coeffs[1] * arg + coeffs[0]
-print(answer)
+if __name__ == "__main__":
+    parsed = parse(utils.read_puzzle_input(sys.argv[1]))
+    print(part2(parsed))
@@ -2,23 +2,14 @@ import functools
 import sys
 from collections import defaultdict
 
-import numpy as np
-from tqdm import tqdm
-
+import telemetry
 import utils
 
 
-def get_brick_coords(line: str) -> np.array:
+def get_brick_coords(line: str) -> list[list[int]]:
     return [list(map(int, pos.split(","))) for pos in line.split("~")]
 
 
-puzzle = utils.read_puzzle_input(sys.argv[1])
-bricks = [get_brick_coords(line) for line in puzzle]
-
-# Sort the bricks by (z, x, y) coordinates, so the lowest are first.
-bricks = sorted(bricks, key=lambda b: (b[0][2], b[0][0], b[0][1]))
-
-
 def dimrange(b: list, dim: int) -> tuple[int, int]:
     return min(b[0][dim], b[1][dim]), max(b[0][dim], b[1][dim])
 
@@ -45,7 +36,12 @@ def without_key(d: dict, key) -> dict:
     return {k: v for k, v in d.items() if k != key}
 
 
-def main():
+def parse(puzzle: list[str]) -> tuple[dict, dict]:
+    bricks = [get_brick_coords(line) for line in puzzle]
+
+    # Sort the bricks by (z, x, y) coordinates, so the lowest are first.
+    bricks = sorted(bricks, key=lambda b: (b[0][2], b[0][0], b[0][1]))
+
     # To not have to search all bricks in the z-direction later, retain a
     # small look-up table to quickly get the bricks at a given height.
     bricks_per_height = defaultdict(set)
@@ -55,7 +51,7 @@ def main():
 
     # When a brick has settled, we save on which other bricks it has settled on.
     supporting = {i: set() for i in range(len(bricks))}
-    for i in tqdm(range(len(bricks))):
+    for i in telemetry.progress(range(len(bricks)), "settled"):
         # We drop a single brick layer by layer, checking for obstructions
         # in the x-y plane at each step. A smart data structure could probably
         # drop it all the way at once.
@@ -72,6 +68,7 @@ def main():
             # We can decrease the z-coordinate.
             bricks[i][0][2] -= 1
             bricks[i][1][2] -= 1
+            telemetry.count("layer_drops")
 
             # Update our index of which z-plane the top of the bricks lie in.
             old_height = bricks[i][1][2] + 1
@@ -83,40 +80,64 @@ def main():
         for bi, _ in colliding_below:
             supporting[bi].add(i)
 
+    # Also create the inverse map (what bricks a brick rests on) for part 2.
+    supported_by = defaultdict(set)
+    for b, supps in supporting.items():
+        for sup_b in supps:
+            supported_by[sup_b].add(b)
+
+    return supporting, supported_by
+
+
+def part1(parsed: tuple[dict, dict]) -> int:
+    supporting, _supported_by = parsed
+
     acc = 0
     for k, v in supporting.items():
         without = set().union(*without_key(supporting, k).values())
         if v <= without:
             acc += 1
 
-    print(acc)
+    return acc
 
-    # Also create the inverse map (what bricks a brick rests on) for part 2.
-    supported_by = defaultdict(set)
-    for b, supps in supporting.items():
-        for sup_b in supps:
-            supported_by[sup_b].add(b)
 
-    def chain_reaction(bi: int) -> set:
-        """Awkward recursion where I mutate a dictionary to remove the supports.
+def chain_reaction(bi: int, supporting: dict, supported_by: dict) -> set:
+    """Remove the falling bricks from the supports of the bricks above them.
+
+    Started out as an awkward recursion, now it's a stack of bricks that still
+    have to be removed. Can probably be formulated in a nicer way that's
+    amenable to memoization.
+    """
+    remaining_supported_by = {k: v.copy() for k, v in supported_by.items()}
 
-        Can probably be formulated in a nicer way that's amenable to memoization.
-        """
-        remaining_supported_by = {k: v.copy() for k, v in supported_by.items()}
+    falling = [bi]
+    while falling:
+        bi = falling.pop()
+        # Only the bricks that bi supports have it in their supports.
+        for b in supporting[bi]:
+            remaining_supported_by[b].discard(bi)
+            if len(remaining_supported_by[b]) == 0:
+                falling.append(b)
 
-        def f(bi):
-            for b in remaining_supported_by.keys():
-                remaining_supported_by[b] -= {bi}
+    return len([v for v in remaining_supported_by.values() if len(v) == 0])
 
-            for b in supporting[bi]:
-                if len(remaining_supported_by[b]) == 0:
-                    f(b)
 
-        f(bi)
-        return len([v for v in remaining_supported_by.values() if len(v) == 0])
+def part2(parsed: tuple[dict, dict]) -> int:
+    supporting, supported_by = parsed
 
     # Unfortunately kind of slow - not an ideal solution in any case.
-    print(sum(chain_reaction(bi) for bi in tqdm(range(len(bricks)))))
+    return sum(
+        chain_reaction(bi, supporting, supported_by)
+        for bi in telemetry.progress(range(len(supporting)), "chain_reactions")
+    )
+
+
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
 
 
-main()
+if __name__ == "__main__":
+    parsed = parse(utils.read_puzzle_input(sys.argv[1]))
+    print(part1(parsed))
+    print(part2(parsed))
@@ -10,79 +10,129 @@ import sys
 from collections import defaultdict
 
 import utils
-
-sys.setrecursionlimit(15000)
-
-puzzle = [list(l) for l in utils.read_puzzle_input(sys.argv[1])]
-h, w = utils.input_dim(puzzle)
-
-start = (0, puzzle[0].index("."))
-end = (h - 1, puzzle[h - 1].index("."))
+from utils.graph import CSRGraph
 
 # We can't go back to already visited nodes and also have
 # these slopes, so it's a directed acyclic graph.
-adj4 = {(-1, 0), (1, 0), (0, -1), (0, 1)}
 slope_dir = {">": {(0, 1)}, "<": {(0, -1)}, "^": {(-1, 0)}, "v": {(1, 0)}}
 
-# Create the adjacency graph.
-graph = defaultdict(set)
-weights = defaultdict(int)
-for i in range(h):
-    for j in range(w):
-        if puzzle[i][j] == "#":
-            continue
-
-        for di, dj in adj4:
-            ni, nj = (i + di, j + dj)
-            if ni in range(h) and nj in range(w) and puzzle[ni][nj] != "#":
-                graph[i, j].add((ni, nj))
-                weights[(i, j), (ni, nj)] = 1
-
-# Make dict to not get confused by defaultdict properties.
-graph = dict(graph)
-
-# Remove intermediate nodes that only connect two other nodes.
-while any(len(adj) == 2 for adj in graph.values()):
-    for node, adj in graph.items():
-        if len(adj) == 2:
-            break
-
-    n1, n2 = adj
-    graph[n1].add(n2)
-    graph[n1].remove(node)
 
-    graph[n2].add(n1)
-    graph[n2].remove(node)
+def path_steps(puzzle_input: list[str]) -> list[tuple[int, int]]:
+    """All steps between neighboring path cells, in both directions, by flat index i * w + j."""
+    if utils.PURE_PYTHON:
+        h, w = len(puzzle_input), len(puzzle_input[0])
+        return [
+            (i * w + j, (i + di) * w + j + dj)
+            for i, row in enumerate(puzzle_input)
+            for j, c in enumerate(row)
+            if c != "#"
+            for di, dj in ((-1, 0), (1, 0), (0, -1), (0, 1))
+            if 0 <= i + di < h and 0 <= j + dj < w and puzzle_input[i + di][j + dj] != "#"
+        ]
+
+    # Walk the grid by flat index, the graph keeps the indices as its labels.
+    grid = utils.Grid.from_lines(puzzle_input)
+    is_path = (grid.flat != ord("#")).tolist()
+    neighbors = grid.neighbors().tolist()
+    return [
+        (index, neighbor)
+        for index, on_path in enumerate(is_path)
+        if on_path
+        for neighbor in neighbors[index]
+        if neighbor >= 0 and is_path[neighbor]
+    ]
+
+
+def parse(puzzle_input: list[str]) -> tuple[CSRGraph, int, int]:
+    h, w = len(puzzle_input), len(puzzle_input[0])
+
+    start = puzzle_input[0].index(".")
+    end = (h - 1) * w + puzzle_input[h - 1].index(".")
+
+    # Create the adjacency graph.
+    graph = defaultdict(set)
+    weights = defaultdict(int)
+    for node, next_node in path_steps(puzzle_input):
+        graph[node].add(next_node)
+        weights[node, next_node] = 1
+
+    # Make dict to not get confused by defaultdict properties.
+    graph = dict(graph)
+
+    # Remove intermediate nodes that only connect two other nodes.
+    while any(len(adj) == 2 for adj in graph.values()):
+        for node, adj in graph.items():
+            if len(adj) == 2:
+                break
+
+        n1, n2 = adj
+        graph[n1].add(n2)
+        graph[n1].remove(node)
+
+        graph[n2].add(n1)
+        graph[n2].remove(node)
+
+        weights[n1, n2] = weights[node, n1] + weights[node, n2]
+        weights[n2, n1] = weights[node, n1] + weights[node, n2]
+
+        del weights[node, n1]
+        del weights[n1, node]
+        del weights[n2, node]
+        del weights[node, n2]
+        del graph[node]
+
+    # The compressed graph only has the junctions left, store it compactly.
+    graph = CSRGraph.from_adjacency(graph, weights)
+    return graph, graph.id(start), graph.id(end)
 
-    weights[n1, n2] = weights[node, n1] + weights[node, n2]
-    weights[n2, n1] = weights[node, n1] + weights[node, n2]
-
-    del weights[node, n1]
-    del weights[n1, node]
-    del weights[n2, node]
-    del weights[node, n2]
-    del graph[node]
 
 # Do a DFS to iterate over all paths from start to end, tracking the max.
-dist_to_target = 0
+# The stack holds the nodes of the current path, with their distance from the
+# start and the edges we haven't followed yet.
+def find_longest(
+    node: int,
+    end: int,
+    graph: CSRGraph,
+    visited_path: bytearray,
+    current_dist: int,
+) -> int:
+    if node == end:
+        return current_dist
+
+    dist_to_target = 0
+    visited_path[node] = True
+    stack = [(node, current_dist, iter(graph[node]))]
+    while stack:
+        node, dist, edges = stack[-1]
+        for neighbor, edge_dist in edges:
+            if visited_path[neighbor]:
+                continue
+
+            if neighbor == end:
+                dist_to_target = max(dist_to_target, dist + edge_dist)
+                continue
+
+            visited_path[neighbor] = True
+            stack.append((neighbor, dist + edge_dist, iter(graph[neighbor])))
+            break
+        else:
+            visited_path[node] = False
+            stack.pop()
 
+    return dist_to_target
 
-def find_longest(node: tuple, visited_path: set, current_dist: int):
-    global dist_to_target
-    if node == end:
-        dist_to_target = max(dist_to_target, current_dist)
-        return
 
-    visited_path.add(node)
-    for neighbor in graph[node]:
-        if neighbor in visited_path:
-            continue
+# Only the part 2 graph without slopes survived.
+def part2(parsed: tuple[CSRGraph, int, int]) -> int:
+    graph, start, end = parsed
+    return find_longest(start, end, graph, bytearray(graph.num_nodes), 0)
 
-        edge_dist = weights[node, neighbor]
-        find_longest(neighbor, visited_path, current_dist + edge_dist),
 
-    visited_path.remove(node)
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return None, part2(parsed)
 
 
-find_longest(start, set(), 0)
-print(dist_to_target)
+if __name__ == "__main__":
+    parsed = parse(utils.read_puzzle_input(sys.argv[1]))
+    print(part2(parsed))
@@ -1,27 +1,32 @@
 import sys
-
-import numpy as np
-from sympy import solve, symbols
+from fractions import Fraction
+from typing import TYPE_CHECKING
 
 import utils
 
+if TYPE_CHECKING:
+    import numpy as np
+
+# Positions and velocities, as (n, 3) numpy arrays or, with PURE_PYTHON, lists of lists.
+Hailstones = tuple["np.ndarray | list[list[int]]", "np.ndarray | list[list[int]]"]
 
-def parse_input(line: str) -> tuple[tuple, tuple]:
-    pos_str, velo_str = line.split(" @ ")
-    return [
-        list(map(int, pos_str.split(", "))),
-        list(map(int, velo_str.split(", "))),
-    ]
 
+def parse(puzzle: list[str]) -> Hailstones:
+    # Every line is "px, py, pz @ vx, vy, vz".
+    if utils.PURE_PYTHON:
+        hailstones = utils.int_rows(puzzle)
+        return [row[:3] for row in hailstones], [row[3:] for row in hailstones]
 
-puzzle = utils.read_puzzle_input(sys.argv[1])
-positions, velocities = zip(*map(parse_input, puzzle))
-positions = np.stack(positions)
-velocities = np.stack(velocities)
+    hailstones = utils.nums_by_line(puzzle, padded=True)
+    return hailstones[:, :3], hailstones[:, 3:]
 
 
-def intersection_time(i: int, j: int, dims: tuple[int, int]) -> np.ndarray | None:
+def intersection_time(
+    positions: "np.ndarray", velocities: "np.ndarray", i: int, j: int, dims: tuple[int, int]
+) -> "np.ndarray | None":
     """Intersect lines by solving the set of equations via matrix inversion."""
+    import numpy as np
+
     posdiff = positions[i, dims] - positions[j, dims]
     vmat = np.c_[velocities[j, dims], -velocities[i, dims]]
     try:
@@ -33,23 +38,52 @@ def intersection_time(i: int, j: int, dims: tuple[int, int]) -> np.ndarray | Non
     return t[::-1]
 
 
-# Part 1
-rs, re = (200000000000000, 400000000000000)
-ans = 0
-dims = [0, 1]
-for i in range(len(positions)):
-    for j in range(i + 1, len(positions)):
-        t = intersection_time(i, j, dims)
-        if t is None:
-            print(f"{i},{j} don't intersect.")
-        else:
-            ix, iy = positions[i, dims] + velocities[i, dims] * t[0]
-            if (rs <= ix <= re) and (rs <= iy <= re) and t.min() >= 0:
-                ans += 1
+def intersection_time_exact(
+    positions: list[list[int]], velocities: list[list[int]], i: int, j: int, dims: tuple[int, int]
+) -> list[Fraction] | None:
+    """Same as intersection_time, with Cramer's rule on fractions instead of numpy."""
+    (dx, dy), (vix, viy), (vjx, vjy) = (
+        [positions[i][d] - positions[j][d] for d in dims],
+        [velocities[i][d] for d in dims],
+        [velocities[j][d] for d in dims],
+    )
+    det = vix * vjy - vjx * viy
+    if det == 0:
+        # Parallel lines never meet.
+        return None
+
+    return [Fraction(vjx * dy - vjy * dx, det), Fraction(vix * dy - viy * dx, det)]
+
 
-            print(f"{i},{j} intersect at ({ix:.2f}, {iy:.2f}), t={t[0]: .2f}")
+def part1(parsed: Hailstones) -> int:
+    positions, velocities = parsed
+
+    rs, re = (200000000000000, 400000000000000)
+    ans = 0
+    dims = [0, 1]
+    for i in range(len(positions)):
+        for j in range(i + 1, len(positions)):
+            if utils.PURE_PYTHON:
+                t = intersection_time_exact(positions, velocities, i, j, dims)
+                if t is not None:
+                    ix, iy = (positions[i][d] + velocities[i][d] * t[0] for d in dims)
+                    if (rs <= ix <= re) and (rs <= iy <= re) and min(t) >= 0:
+                        ans += 1
+                continue
+
+            t = intersection_time(positions, velocities, i, j, dims)
+            if t is None:
+                # print(f"{i},{j} don't intersect.")
+                pass
+            else:
+                ix, iy = positions[i, dims] + velocities[i, dims] * t[0]
+                if (rs <= ix <= re) and (rs <= iy <= re) and t.min() >= 0:
+                    ans += 1
+
+                # print(f"{i},{j} intersect at ({ix:.2f}, {iy:.2f}), t={t[0]: .2f}")
+
+    return ans
 
-print(ans)
 
 # Part 2
 # Here I tried some things - I first thought I would find two pairs of lines
@@ -86,27 +120,88 @@ print(ans)
 # then used a solver online to get the solution. Afterwards, I reimplemented it
 # here in SymPy after reading about it online. Either way, I'm happy that I
 # managed to come up with the equations despite not being very strong at this.
-t1, t2, t3 = symbols("t1 t2 t3")
-smx, smy, smz, vmx, vmy, vmz = symbols("smx smy smz vmx vmy vmz")
-
-# Express the equations as a - b = 0 for the sympy solver.
-eq1 = smx + vmx * t1 - positions[1][0] + velocities[1][0] * t1
-eq2 = smy + vmy * t1 - positions[1][1] + velocities[1][1] * t1
-eq3 = smz + vmz * t1 - positions[1][2] + velocities[1][2] * t1
-
-eq4 = smx + vmx * t2 - positions[2][0] + velocities[2][0] * t2
-eq5 = smy + vmy * t2 - positions[2][1] + velocities[2][1] * t2
-eq6 = smz + vmz * t2 - positions[2][2] + velocities[2][2] * t2
-
-eq7 = smx + vmx * t3 - positions[3][0] + velocities[3][0] * t3
-eq8 = smy + vmy * t3 - positions[3][1] + velocities[3][1] * t3
-eq9 = smz + vmz * t3 - positions[3][2] + velocities[3][2] * t3
-
-# Returns the (smx, smy, smz, vmx, vmy, vmz, t1, t2, t3) params
-solution = solve(
-    [eq1, eq2, eq3, eq4, eq5, eq6, eq7, eq8, eq9],
-    [smx, smy, smz, vmx, vmy, vmz, t1, t2, t3],
-)[0]
-
-# The part 2 puzzle solution is smx + smy + smz
-print(solution[0] + solution[1] + solution[2])
+#
+# Without sympy (see throw_position), the times can be eliminated instead: the
+# throw and a hailstone meet iff (s_m - s_i) x (v_m - v_i) = 0. The quadratic
+# term s_m x v_m is the same for every hailstone, so subtracting the equations
+# of two hailstones leaves three linear equations in s_m and v_m, and two pairs
+# of the same three hailstones give six equations for the six unknowns.
+def solve_linear(matrix: list[list[Fraction]], rhs: list[Fraction]) -> list[Fraction]:
+    """Gauss-Jordan elimination on exact fractions."""
+    rows = [row + [b] for row, b in zip(matrix, rhs)]
+    n = len(rows)
+    for col in range(n):
+        pivot = next(r for r in range(col, n) if rows[r][col] != 0)
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(n):
+            if r != col and rows[r][col] != 0:
+                factor = rows[r][col] / rows[col][col]
+                rows[r] = [a - factor * b for a, b in zip(rows[r], rows[col])]
+
+    return [rows[k][n] / rows[k][k] for k in range(n)]
+
+
+def cross(a: list, b: list) -> list:
+    return [a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]]
+
+
+def throw_position(positions: list[list[int]], velocities: list[list[int]]) -> list[Fraction]:
+    """Start of the throw through hailstones 1, 2 and 3, like the sympy solution below."""
+    matrix, rhs = [], []
+    for i, j in ((1, 2), (1, 3)):
+        # s_m x (v_i - v_j) + (s_i - s_j) x v_m = s_i x v_i - s_j x v_j, row by row.
+        dv = [a - b for a, b in zip(velocities[i], velocities[j])]
+        ds = [a - b for a, b in zip(positions[i], positions[j])]
+        unit = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+        s_coeffs = list(zip(*(cross(e, dv) for e in unit)))
+        v_coeffs = list(zip(*(cross(ds, e) for e in unit)))
+        for k in range(3):
+            matrix.append([Fraction(c) for c in s_coeffs[k] + v_coeffs[k]])
+        rhs += [Fraction(a - b) for a, b in zip(cross(positions[i], velocities[i]), cross(positions[j], velocities[j]))]
+
+    return solve_linear(matrix, rhs)[:3]
+
+
+def part2(parsed: Hailstones) -> int:
+    positions, velocities = parsed
+    if utils.PURE_PYTHON:
+        return int(sum(throw_position(positions, velocities)))
+
+    # Importing sympy takes longer than everything else in this day.
+    import sympy
+
+    t1, t2, t3 = sympy.symbols("t1 t2 t3")
+    smx, smy, smz, vmx, vmy, vmz = sympy.symbols("smx smy smz vmx vmy vmz")
+
+    # Express the equations as a - b = 0 for the sympy solver.
+    eq1 = smx + vmx * t1 - positions[1][0] + velocities[1][0] * t1
+    eq2 = smy + vmy * t1 - positions[1][1] + velocities[1][1] * t1
+    eq3 = smz + vmz * t1 - positions[1][2] + velocities[1][2] * t1
+
+    eq4 = smx + vmx * t2 - positions[2][0] + velocities[2][0] * t2
+    eq5 = smy + vmy * t2 - positions[2][1] + velocities[2][1] * t2
+    eq6 = smz + vmz * t2 - positions[2][2] + velocities[2][2] * t2
+
+    eq7 = smx + vmx * t3 - positions[3][0] + velocities[3][0] * t3
+    eq8 = smy + vmy * t3 - positions[3][1] + velocities[3][1] * t3
+    eq9 = smz + vmz * t3 - positions[3][2] + velocities[3][2] * t3
+
+    # Returns the (smx, smy, smz, vmx, vmy, vmz, t1, t2, t3) params
+    solution = sympy.solve(
+        [eq1, eq2, eq3, eq4, eq5, eq6, eq7, eq8, eq9],
+        [smx, smy, smz, vmx, vmy, vmz, t1, t2, t3],
+    )[0]
+
+    # The part 2 puzzle solution is smx + smy + smz
+    return int(solution[0] + solution[1] + solution[2])
+
+
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
+
+
+if __name__ == "__main__":
+    parsed = parse(utils.read_puzzle_input(sys.argv[1]))
+    print(part1(parsed))
+    print(part2(parsed))
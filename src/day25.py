@@ -1,76 +1,64 @@
 import sys
-from collections import defaultdict
-from dataclasses import dataclass, field
 from heapq import *
-from pprint import pprint
-from typing import Any
 
 import utils
+from utils.graph import CSRGraph
 
 
-@dataclass(order=True)
-class PrioritizedItem:
-    priority: int
-    item: Any = field(compare=False)
+def min_cut(graph: CSRGraph, members: dict[int, list[int]], merged_into: list[int]) -> tuple[int, int, int]:
+    """Stoer & Wagner minimum cut algorithm, one phase.
 
-
-def min_cut(graph: dict, weights: dict) -> tuple[set, set, int]:
-    """Stoer & Wagner minimum cut algorithm."""
+    Runs on the node ids of graph. Merged nodes are tracked outside of it:
+    members maps each remaining node to the original nodes merged into it,
+    and merged_into maps each original node to the node it is now part of.
+    Returns the last two nodes s and t added, and the weight of the cut
+    between t and the rest.
+    """
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
 
     # Arbitrary start node
-    s = list(graph.keys())[:1]
-
-    # Store distances to set S in a heap.
-    dists_to_s = {v: weights[s[0], v] for v in graph[s[0]]}
-    dist_heap = [PrioritizedItem(-dists_to_s[v], v) for v in graph[s[0]]]
-    heapify(dist_heap)
+    start = next(iter(members))
+    dists_to_s = dict.fromkeys(members, 0)
+    dist_heap = [(0, start)]
+    s = []
+    in_s = set()
 
     # Iteratively add the strongest connected.
-    while len(s) < len(graph):
-        prio_item = heappop(dist_heap)
-        strongest_connected = prio_item.item
-        strongest_dist = -1 * prio_item.priority
+    while len(s) < len(members):
+        # Node ids are ints, so ties in the heap just compare those.
+        priority, strongest_connected = heappop(dist_heap)
+        strongest_dist = -priority
 
         # Deal with a node being added multiple times to the heap. If we
         # already consumed it with a higher distance, ignore later ones.
-        if strongest_connected in s:
+        if strongest_connected in in_s:
             continue
 
         s.append(strongest_connected)
+        in_s.add(strongest_connected)
 
         # Now we have to add the neighbors of the strongest connected
-        # to the heap or update their weights.
-        for v in graph[strongest_connected]:
-            dists_to_s.setdefault(v, 0)
-            dists_to_s[v] += weights[strongest_connected, v]
-            heappush(dist_heap, PrioritizedItem(-dists_to_s[v], v))
-
-    # Merge the last two in s.
-    merge_nodes(s[-1], s[-2], graph, weights)
-
-    return s[:-1], s[-1], strongest_dist
-
+        # to the heap or update their weights. Edges of the original nodes
+        # it contains lead to whatever node their target is merged into.
+        for node in members[strongest_connected]:
+            for edge in range(offsets[node], offsets[node + 1]):
+                v = merged_into[targets[edge]]
+                if v not in in_s:
+                    dists_to_s[v] += weights[edge]
+                    heappush(dist_heap, (-dists_to_s[v], v))
 
-def merge_nodes(v1, v2, graph: dict, weights: dict):
-    vnew = (v1, v2)
+    return s[-2], s[-1], strongest_dist
 
-    # Merge the two nodes
-    graph[vnew] = graph[v1] | graph[v2]
-    del graph[v1]
-    del graph[v2]
 
-    for v in list(graph.keys()):
-        # Add a new edge to the merged node if necessary.
-        # Also deal with adapting incoming and outgoing edge weights.
-        if v1 in graph[v] or v2 in graph[v]:
-            graph[v].add(vnew)
+def merge_nodes(v1: int, v2: int, members: dict[int, list[int]], merged_into: list[int]):
+    # Relabel the smaller of the two nodes.
+    if len(members[v1]) < len(members[v2]):
+        v1, v2 = v2, v1
 
-            # Note the side effect of pop - we delete the old edge weights as well.
-            weights[(v, vnew)] = weights.pop((v, v1), 0) + weights.pop((v, v2), 0)
-            weights[(vnew, v)] = weights.pop((v1, v), 0) + weights.pop((v2, v), 0)
-
-        # Remove any incoming edges to the old nodes.
-        graph[v] = graph[v] - {v1, v2}
+    moved = members.pop(v2)
+    for node in moved:
+        merged_into[node] = v1
+    members[v1] += moved
 
 
 def test_stoer_wagner():
@@ -92,54 +80,58 @@ def test_stoer_wagner():
         8: [(7, 3), (4, 2)],
     }
 
-    weights = {(v1, v2): w for (v1, ns) in test_graph.items() for (v2, w) in ns}
-    graph = {v1: {v2 for (v2, _) in ns} for (v1, ns) in test_graph.items()}
-
-    # pprint(graph)
-    # pprint(weights)
-
-    while len(graph) > 1:
-        print(min_cut(graph, weights))
+    graph = CSRGraph.from_edges((v1, v2, w) for (v1, ns) in test_graph.items() for (v2, w) in ns)
+    members = {v: [v] for v in range(graph.num_nodes)}
+    merged_into = list(range(graph.num_nodes))
 
+    while len(members) > 1:
+        s, t, cut_weight = min_cut(graph, members, merged_into)
+        print([graph.label(v) for v in members[t]], cut_weight)
+        merge_nodes(s, t, members, merged_into)
 
-def main():
-    puzzle = utils.read_puzzle_input(sys.argv[1])
 
-    graph = defaultdict(set)
-    weights = {}
+def parse(puzzle: list[str]) -> CSRGraph:
+    edges = []
     for line in puzzle:
         node, connected = line.split(": ")
         for conn in connected.split(" "):
-            graph[node].add(conn)
-            graph[conn].add(node)
+            edges += [(node, conn), (conn, node)]
+
+    # The component names are only needed to build the graph.
+    return CSRGraph.from_edges(edges)
+
 
-            weights[(node, conn)] = 1
-            weights[(conn, node)] = 1
+def part1(parsed: CSRGraph) -> int:
+    # Merged nodes keep the id of one of their original nodes.
+    members = {v: [v] for v in range(parsed.num_nodes)}
+    merged_into = list(range(parsed.num_nodes))
 
-    original_size = len(graph)
+    original_size = parsed.num_nodes
     min_cut_weight = sys.maxsize
-    min_cut_set = None
-    while len(graph) > 1:
-        print(len(graph))
-        cut1, cut2, cut_weight = min_cut(graph, weights)
+    cut_set_size = None
+    while len(members) > 1:
+        # print(len(members))
+        s, t, cut_weight = min_cut(parsed, members, merged_into)
 
         if cut_weight < min_cut_weight:
-            min_cut_set = set(cut1)
+            cut_set_size = len(members[t])
             min_cut_weight = cut_weight
 
         # Save a bit of time.
         if cut_weight == 3:
             break
 
-    cut_set_size = len(list(flatten(min_cut_set)))
-    print(cut_set_size, original_size - cut_set_size, min_cut_weight)
+        merge_nodes(s, t, members, merged_into)
 
+    # print(cut_set_size, original_size - cut_set_size, min_cut_weight)
+    return cut_set_size * (original_size - cut_set_size)
 
-def flatten(d):
-    """My implementation ends up with many merged nodes -> unmerge to count them."""
 
-    for i in d:
-        yield from [i] if not isinstance(i, tuple) else flatten(i)
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), None
 
 
-main()
+if __name__ == "__main__":
+    parsed = parse(utils.read_puzzle_input(sys.argv[1]))
+    print(part1(parsed))
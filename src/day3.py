@@ -2,10 +2,12 @@ import sys
 import re
 import math
 
-puzzle_input = [l.strip() for l in open(sys.argv[1]).readlines()]
+import utils
 
-# Parse the part numbers in a first iteration over the input.
-number_intervals = {
+
+def parse_number_intervals(puzzle_input: list[str]) -> dict[list]:
+    """Parse the part numbers in a first iteration over the input."""
+    return {
         i: [(m.span(), int(m.group())) for m in re.finditer("(\d+)", line)]
         for i,line in enumerate(puzzle_input)
     }
@@ -35,7 +37,7 @@ def matching_interval(j: int, line_intervals: list) -> int | None:
 
     return None
 
-def get_part_nums_for_all_symbols(puzzle_input: list[list]):
+def get_part_nums_for_all_symbols(puzzle_input: list[list], number_intervals: dict[list]):
     symbol_part_numbers = {}
     for i, line in enumerate(puzzle_input):
         for j, c in enumerate(line):
@@ -49,17 +51,25 @@ def get_part_nums_for_all_symbols(puzzle_input: list[list]):
 
     return symbol_part_numbers
 
-symbol_part_nums = get_part_nums_for_all_symbols(puzzle_input)
+def parse(puzzle_input: list[str]) -> dict:
+    number_intervals = parse_number_intervals(puzzle_input)
+    return get_part_nums_for_all_symbols(puzzle_input, number_intervals)
+
+def part1(symbol_part_nums: dict) -> int:
+    return sum(sum(parts) for parts in symbol_part_nums.values())
 
-# Part 1
-part_number_sum = sum(sum(parts) for parts in symbol_part_nums.values())
-print(part_number_sum)
+def part2(symbol_part_nums: dict) -> int:
+    return sum(
+        math.prod(parts) 
+        for (_i, _j, symbol), parts in symbol_part_nums.items()
+        if symbol == "*" and len(parts) == 2
+    )
 
-# Part 2
-gear_ratio_sum = sum(
-    math.prod(parts) 
-    for (_i, _j, symbol), parts in symbol_part_nums.items()
-    if symbol == "*" and len(parts) == 2
-)
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
 
-print(gear_ratio_sum)
+if __name__ == "__main__":
+    symbol_part_nums = parse(utils.read_puzzle_input(sys.argv[1]))
+    print(part1(symbol_part_nums))
+    print(part2(symbol_part_nums))
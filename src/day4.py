@@ -3,7 +3,7 @@ import sys
 import re
 from collections import Counter
 
-puzzle_inputs = utils.read_puzzle_input(sys.argv[1])
+STREAM_INPUT = True
 
 # NUM_COUNT = 5 # For the test cases.
 NUM_COUNT = 10
@@ -19,26 +19,37 @@ def parse_card(card_line: str):
 
     return card_num-1, (set(winning_nums), set(drawn_nums))
 
-parsed_cards = dict([parse_card(card) for card in puzzle_inputs])
+def parse(puzzle_inputs: list[str]) -> list[int]:
+    parsed_cards = dict([parse_card(card) for card in puzzle_inputs])
 
-card_win_counts = [
-    len(winners & drawn)
-    for (winners, drawn) in parsed_cards.values()
-]
+    return [
+        len(winners & drawn)
+        for (winners, drawn) in parsed_cards.values()
+    ]
 
-# Part 1
-print(sum(2**(win_count-1) for win_count in card_win_counts if win_count > 0))
+def part1(card_win_counts: list[int]) -> int:
+    return sum(2**(win_count-1) for win_count in card_win_counts if win_count > 0)
 
-# Zero-index the card counter for the loop.
-card_counts = Counter(parsed_cards.keys())
+def part2(card_win_counts: list[int]) -> int:
+    # Zero-index the card counter for the loop.
+    card_counts = Counter(range(len(card_win_counts)))
 
-# Part 2 - kind of slow at around 5s!
-for card_id in range(len(card_counts.keys())):
-    for repeat in range(card_counts[card_id]):
-        card_wins = card_win_counts[card_id]
+    # Kind of slow at around 5s!
+    for card_id in range(len(card_counts.keys())):
+        for repeat in range(card_counts[card_id]):
+            card_wins = card_win_counts[card_id]
 
-        max_won_card = min(len(card_counts.keys()), card_id+card_wins+1)
-        for won_card in range(card_id+1, max_won_card):
-            card_counts[won_card] += 1
+            max_won_card = min(len(card_counts.keys()), card_id+card_wins+1)
+            for won_card in range(card_id+1, max_won_card):
+                card_counts[won_card] += 1
 
-print(sum(card_counts.values()))
+    return sum(card_counts.values())
+
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
+
+if __name__ == "__main__":
+    card_win_counts = parse(utils.stream_lines(sys.argv[1]))
+    print(part1(card_win_counts))
+    print(part2(card_win_counts))
@@ -2,12 +2,10 @@ import itertools
 import sys
 from dataclasses import dataclass, field
 
-from tqdm import tqdm
-
 import utils
 
 
-@dataclass
+@dataclass(slots=True)
 class RangeMap:
     """Map a range as described in the task.
 
@@ -46,7 +44,7 @@ class RangeMap:
         return f"{self.source} {self.target} {self.size}"
 
 
-@dataclass
+@dataclass(slots=True)
 class RangeMapUnion:
     """Consider all ranges for mapping, falling back on the identity if none works.
 
@@ -63,7 +61,7 @@ class RangeMapUnion:
         return key
 
 
-def parse_puzzle_input(puzzle_input: list[str]) -> tuple[list, dict]:
+def parse(puzzle_input: list[str]) -> tuple[list, dict]:
     almanach_maps = {}
     seeds = []
 
@@ -93,74 +91,33 @@ def seed_to_location(seed: int, almanach_maps: dict) -> int:
 
     return mapped_value
 
-## Part 
-puzzle_input = utils.read_puzzle_input(sys.argv[1])
-seeds, almanach_maps = parse_puzzle_input(puzzle_input)
-
-# Part 1 ---------------------
-print(min(seed_to_location(seed, almanach_maps) for seed in seeds))
-
-# Part 2 ---------------------
-def map_range(input_range: tuple[int, int], range_map: RangeMap) -> tuple[list, list]:
-    """Map interval [a,b) with the map whose domain is [c,d).
 
-    Returns a list of identity-mapped ranges and a list with the mapped range.
-    """
-    start, end = input_range
-
-    #  --
-    # ----
-    if range_map.source <= start < end <= range_map.source_end:
-        ret = ([], [(range_map[start], range_map[end - 1] + 1)])
-    # ---              ---
-    #     ---  or  ---
-    elif (end <= range_map.source) or (range_map.source_end <= start):
-        ret = ([(start, end)], [])
-    # ----
-    #  --
-    elif start <= range_map.source < range_map.source_end <= end:
-        initial = [(start, range_map.source)] if start < range_map.source else []
-        tail = [(range_map.source_end, end)] if range_map.source_end < end else []
-        ret = ([*initial, *tail], [(range_map.target, range_map.target_end)])
-    # ----
-    #   ----
-    elif start < range_map.source < end < range_map.source_end:
-        ret = (
-            [(start, range_map.source)],
-            [(range_map[range_map.source], range_map[end - 1] + 1)],
-        )
-    #   ----
-    # ----
-    elif range_map.source < start < range_map.source_end < end:
-        ret = [(range_map.source_end, end)], [
-            (range_map[start], range_map[range_map.source_end - 1] + 1)
-        ]
-    else:
-        assert False
+def part1(parsed: tuple[list, dict]) -> int:
+    seeds, almanach_maps = parsed
+    return min(seed_to_location(seed, almanach_maps) for seed in seeds)
 
-    assert all(a < b for a, b in ret[0] + ret[1]), ret
-    return ret
 
+def part2(parsed: tuple[list, dict]) -> int:
+    seeds, almanach_maps = parsed
+    seed_ranges = utils.IntervalSet(seeds[::2], [a + b for a, b in zip(seeds[::2], seeds[1::2])])
 
+    # The source ranges of a map don't overlap, so every seed range can be cut
+    # at their boundaries and each piece is moved by the map it falls into.
+    for map_name, maps in almanach_maps.items():
+        seed_ranges = seed_ranges.translate(
+            [(m.source, m.source_end) for m in maps.range_maps],
+            [m.target - m.source for m in maps.range_maps],
+        )
 
-seed_ranges = sorted([(a, a + b) for a, b in zip(seeds[::2], seeds[1::2])])
-
-for map_name, maps in almanach_maps.items():
-    next_maps_seeds = []
-
-    for m in maps.range_maps:
-        remaining_seeds = []
-        for seed_range in seed_ranges:
-            identity_ranges, mapped_ranges = map_range(seed_range, m)
-
-            # The unmapped regions can be tried in the next maps.
-            remaining_seeds.extend(identity_ranges)
+    return seed_ranges.min()
 
-            # The mapped regions go in the next round.
-            next_maps_seeds.extend(mapped_ranges)
 
-        seed_ranges = remaining_seeds
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
 
-    seed_ranges = sorted(next_maps_seeds + remaining_seeds)
 
-print(seed_ranges[0][0])
+if __name__ == "__main__":
+    parsed = parse(utils.read_puzzle_input(sys.argv[1]))
+    print(part1(parsed))
+    print(part2(parsed))
@@ -2,36 +2,52 @@ import utils
 import sys
 
 
-puzzle_input = utils.read_puzzle_input(sys.argv[1])
-
-# Part 1
-races = list(zip(utils.nums(puzzle_input[0]), utils.nums(puzzle_input[1])))
-print(races)
-
-# Part 2
-times, dists = zip(*races)
-races = [(
-    int(''.join(map(str, times))),  # Concatenate times
-    int(''.join(map(str, dists))))  # Concatenate distances
-]
-print(races)
-
-# We assume there's a large stretch of winning configurations,
-# so we'll find the start and end of that region to save time.
-acc = 1
-for (time, dist) in races:
-    win_start = None
-    for t in range(time+1):
-        if t*(time-t) > dist:
-            win_start = t
-            break
-
-    win_end = None
-    for t in reversed(range(time+1)):
-        if t*(time-t) > dist:
-            win_end = t
-            break
-
-    acc *= (win_end-win_start+1)
-
-print(acc)
+def parse(puzzle_input: list[str]) -> list[tuple[int, int]]:
+    times, dists = utils.int_rows(puzzle_input[:2])
+    return list(zip(times, dists))
+
+
+def ways_to_win(races: list[tuple[int, int]]) -> int:
+    # We assume there's a large stretch of winning configurations,
+    # so we'll find the start and end of that region to save time.
+    acc = 1
+    for (time, dist) in races:
+        win_start = None
+        for t in range(time+1):
+            if t*(time-t) > dist:
+                win_start = t
+                break
+
+        win_end = None
+        for t in reversed(range(time+1)):
+            if t*(time-t) > dist:
+                win_end = t
+                break
+
+        acc *= (win_end-win_start+1)
+
+    return acc
+
+
+def part1(races: list[tuple[int, int]]) -> int:
+    return ways_to_win(races)
+
+
+def part2(races: list[tuple[int, int]]) -> int:
+    times, dists = zip(*races)
+    races = [(
+        int(''.join(map(str, times))),  # Concatenate times
+        int(''.join(map(str, dists))))  # Concatenate distances
+    ]
+    return ways_to_win(races)
+
+
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
+
+
+if __name__ == "__main__":
+    races = parse(utils.read_puzzle_input(sys.argv[1]))
+    print(part1(races))
+    print(part2(races))
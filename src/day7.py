@@ -3,6 +3,9 @@ import sys
 from collections import Counter
 
 import utils
+from utils.memo import memoize
+
+STREAM_INPUT = True
 
 card_ranking = list(
     reversed(
@@ -63,7 +66,9 @@ def score_hand_type(hand: str) -> int:
     raise AssertionError(f"Forgot to handle {hand} ({vals})")
 
 
-@functools.cache
+# Hands with jokers share a lot of partially replaced hands, but there's no
+# need to keep all of them around.
+@memoize(maxsize=1 << 14, name="j_replacements")
 def generate_j_replacements(hand: str) -> str:
     """Not recommmended for len(hand) > 4."""
 
@@ -103,9 +108,23 @@ def compare_hands(hand1: str, hand2: str) -> int:
     else:
         return 0
 
-puzzle_input = utils.read_puzzle_input(sys.argv[1])
-hands_and_bids = [l.split() for l in puzzle_input]
 
-sorted_hands_and_bids = sorted(hands_and_bids, key=lambda x: functools.cmp_to_key(compare_hands)(x[0]))
+def parse(puzzle_input: list[str]) -> list[list[str]]:
+    return [l.split() for l in puzzle_input]
+
+
+# Only the joker rules of part 2 survived.
+def part2(hands_and_bids: list[list[str]]) -> int:
+    sorted_hands_and_bids = sorted(hands_and_bids, key=lambda x: functools.cmp_to_key(compare_hands)(x[0]))
+
+    return sum((i + 1) * int(bid) for i, (_hand, bid) in enumerate(sorted_hands_and_bids))
+
+
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return None, part2(parsed)
+
 
-print(sum((i + 1) * int(bid) for i, (_hand, bid) in enumerate(sorted_hands_and_bids)))
+if __name__ == "__main__":
+    hands_and_bids = parse(utils.stream_lines(sys.argv[1]))
+    print(part2(hands_and_bids))
@@ -1,11 +1,10 @@
 import itertools
-import math
 import sys
 
 import utils
+from utils import cycles
+from utils.graph import CSRGraph
 
-puzzle_input = utils.read_puzzle_input(sys.argv[1])
-directions = puzzle_input[0]
 
 def split_node_str(node_str: str) -> tuple[str, tuple[str, str]]:
     """Split AAA = (BBB,CCC) into (AAA, (BBB, CCC))"""
@@ -13,53 +12,118 @@ def split_node_str(node_str: str) -> tuple[str, tuple[str, str]]:
     targets = tuple([t.strip() for t in target_str.strip("()").split(",")])
     return source, targets
 
-graph = dict([split_node_str(l) for l in puzzle_input[2:]])
 
-# Part 1
-current_node = "AAA"
-for i, direction in enumerate(itertools.cycle(directions)):
-    dir_idx = 0 if direction == "L" else 1
-    next_node = graph[current_node][dir_idx]
-    #print(f"{i}\t{current_node}->{next_node}")
+def parse(puzzle_input: list[str]) -> tuple[list[int], CSRGraph]:
+    # Every node has exactly two edges, left and right, in that order. So the
+    # left target of a node is at targets[2 * node] and the right one after it.
+    directions = [0 if direction == "L" else 1 for direction in puzzle_input[0]]
+    nodes = [split_node_str(l) for l in puzzle_input[2:]]
+    edges = ((source, target) for source, targets in nodes for target in targets)
+    graph = CSRGraph.from_edges(edges, nodes=[source for source, _ in nodes])
+    return directions, graph
 
-    current_node = next_node
-    if current_node == "ZZZ":
-        break
 
-print(f"Needed {i+1} steps to reach ZZZ from AAA.")
-print()
+def part1(parsed: tuple[list[int], CSRGraph]) -> int:
+    directions, graph = parsed
+    targets = graph.targets
+
+    current_node = graph.id("AAA")
+    end_node = graph.id("ZZZ")
+    for i, dir_idx in enumerate(itertools.cycle(directions)):
+        next_node = targets[2 * current_node + dir_idx]
+        #print(f"{i}\t{graph.label(current_node)}->{graph.label(next_node)}")
+
+        current_node = next_node
+        if current_node == end_node:
+            break
+
+    return i + 1
+
 
 # Part 2
-# 
+#
 # It seems like after the nodes reach an end node, they enter a cycle
 # from there on. They reach the end at i and then cycle every i steps.
 # This must be some pecularity of the input, because I think they could
 # also cycle like m + i*k, where they enter the cycle only after m steps.
 #
-# We measure the cycle lens c_i for each node and then want an l s.t.:
-#
-#   l = k_i * c_i
-#
-# for some k_i for each start node. This is the definition
-# of the least common multiple of all the ci_s!
+# So instead of relying on that, we follow every ghost from one end node to
+# the next, detect the cycle of its (end node, position in the directions)
+# hits, note at which steps it is on an end node and combine the ghosts'
+# cycles with the CRT. For the puzzle input, that comes down to the least
+# common multiple of the cycle lengths.
+def part2(parsed: tuple[list[int], CSRGraph]) -> int | None:
+    directions, graph = parsed
+    targets = graph.targets
+    num_directions = len(directions)
 
-start_nodes = {n for n in graph.keys() if n.endswith("A")}
-end_nodes = {n for n in graph.keys() if n.endswith("Z")}
+    start_nodes = {n for n, label in enumerate(graph.labels) if label.endswith("A")}
+    end_nodes = {n for n, label in enumerate(graph.labels) if label.endswith("Z")}
 
-print(f"Graph has {len(start_nodes)} start and {len(end_nodes)} end nodes.")
+    # print(f"Graph has {len(start_nodes)} start and {len(end_nodes)} end nodes.")
 
-# By printing some cycles, I checked that it just so happens in this input
-# that all are of the form i*k, so we stop at the first end node for each.
-# Otherwise we'd have to employ some kind of cycle detection algorithm.
-cycle_lens = []
-for current_node in start_nodes:
-    for i, direction in enumerate(itertools.cycle(directions)):
-        dir_idx = 0 if direction == "L" else 1
-        current_node = graph[current_node][dir_idx]
+    # The left or right targets of every node, for each position in the directions.
+    step_targets = [targets[direction::2] for direction in directions]
+    is_end = bytearray(len(graph.labels))
+    for node in end_nodes:
+        is_end[node] = 1
+
+    # Without an end node on the way, a ghost repeats its (node, direction)
+    # state after at most this many passes through the directions.
+    max_passes = len(graph.labels) + 1
+
+    # A hit is (node, index of the next direction, steps so far) on an end node.
+    # After its last hit, a ghost that never reaches an end node again stays
+    # at no_more_hits, which find_cycle sees as a cycle of its own.
+    no_more_hits = (-1, -1, -1)
+
+    def next_hit(hit: tuple[int, int, int]) -> tuple[int, int, int]:
+        if hit == no_more_hits:
+            return hit
+
+        node, first_pos, steps = hit
+        for _ in range(max_passes):
+            for dir_pos in range(first_pos, num_directions):
+                node = step_targets[dir_pos][node]
+                if is_end[node]:
+                    return node, (dir_pos + 1) % num_directions, steps + dir_pos - first_pos + 1
+
+            steps += num_directions - first_pos
+            first_pos = 0
+
+        return no_more_hits
+
+    schedules = []
+    for start_node in start_nodes:
+        start = (start_node, 0, 0)
+        first_hit = start if start_node in end_nodes else next_hit(start)
+        if first_hit == no_more_hits:
+            return None
+
+        # Only the hits are stored and compared, not every state of the walk.
+        hits = cycles.find_cycle(next_hit, first_hit, key=lambda hit: hit[:2], value=lambda hit: hit)
+        if hits.values[hits.prefix] == no_more_hits:
+            # Only a few hits and no periodic part: the cycle starts after the last one.
+            end_steps = {steps for _, _, steps in hits.values[: hits.prefix]}
+            schedules.append((end_steps, cycles.Cycle(prefix=max(end_steps) + 1, length=1)))
+            continue
+
+        first_repeat = next_hit(hits.values[-1])
+        prefix = hits.values[hits.prefix][2]
+
+        end_steps = {steps for _, _, steps in hits.values}
+        schedules.append((end_steps, cycles.Cycle(prefix=prefix, length=first_repeat[2] - prefix)))
+
+    return cycles.first_common_step(schedules)
+
+
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
 
-        if current_node in end_nodes:
-            cycle_lens.append(i+1)
-            break
 
-all_in_end_node = math.lcm(*cycle_lens)
-print(f"Needed {all_in_end_node} steps for all ghosts to arrive!")
+if __name__ == "__main__":
+    parsed = parse(utils.read_puzzle_input(sys.argv[1]))
+    print(f"Needed {part1(parsed)} steps to reach ZZZ from AAA.")
+    print()
+    print(f"Needed {part2(parsed)} steps for all ghosts to arrive!")
@@ -2,23 +2,42 @@ import sys
 
 import utils
 
-puzzle_input = utils.read_puzzle_input(sys.argv[1])
-puzzle_input = list(map(utils.nums, puzzle_input))
+STREAM_INPUT = True
+
+
+def parse(puzzle_input: list[str]) -> list[list[int]]:
+    return utils.int_rows(puzzle_input)
 
 
 def add_value(nums: list[int], forward: bool = True) -> list[int]:
+    # Take differences until they're all zero, then extrapolate back up.
     assert len(nums) > 0
+    diffs = [nums]
+    while not all(n == 0 for n in diffs[-1]):
+        diffs.append([b - a for a, b in zip(diffs[-1], diffs[-1][1:])])
+        assert len(diffs[-1]) > 0
+
+    value = 0
+    for row in reversed(diffs[:-1]):
+        value = row[-1] + value if forward else row[0] - value
+
+    return (nums + [value]) if forward else ([value] + nums)
+
+
+def part1(puzzle_input: list[list[int]]) -> int:
+    return sum(add_value(puzzle, forward=True)[-1] for puzzle in puzzle_input)
+
 
-    if all(n == 0 for n in nums):
-        return (nums + [0]) if forward else ([0] + nums)
+def part2(puzzle_input: list[list[int]]) -> int:
+    return sum(add_value(puzzle, forward=False)[0] for puzzle in puzzle_input)
 
-    num_diff = [b - a for a, b in zip(nums, nums[1:])]
 
-    if forward:
-        return nums + [nums[-1] + add_value(num_diff, forward)[-1]]
-    else:
-        return [nums[0] - add_value(num_diff, forward)[0]] + nums
+def solve(input_text: str) -> tuple:
+    parsed = parse(utils.puzzle_lines(input_text))
+    return part1(parsed), part2(parsed)
 
 
-print(sum(add_value(puzzle, forward=True)[-1] for puzzle in puzzle_input))
-print(sum(add_value(puzzle, forward=False)[0] for puzzle in puzzle_input))
+if __name__ == "__main__":
+    puzzle_input = parse(utils.stream_lines(sys.argv[1]))
+    print(part1(puzzle_input))
+    print(part2(puzzle_input))
@@ -0,0 +1,339 @@
+"""Fuzz the solutions against straightforward reference solvers.
+
+Every target below generates small random inputs, so that a brute-force
+reference can solve them, and compares the reference answer to what the
+solution's own code computes:
+
+- day 5: the lowest location of any seed in the seed ranges (part 2), with
+  every seed mapped one by one through seed_to_location,
+- day 7: score_hand_type, against trying every replacement of the jokers,
+- day 12: count_combinations, against trying every replacement of the "?",
+- day 22: both parts, against settling the bricks cell by cell and letting
+  them settle again without each brick in turn.
+
+Answers are compared per input line where the lines are independent (days 7
+and 12), so a mismatch points at the line. The first mismatch is minimized by
+dropping input lines as long as the mismatch persists, and then printed. An
+exception in the solution counts as a mismatch, an exception in the reference
+means a candidate isn't a valid input and is skipped. Import and OS errors
+say nothing about the input though (e.g. a missing numpy), so they stop the
+day and are reported as errors instead.
+
+With --pure-python, the solutions take their dependency-free code paths (see
+utils.PURE_PYTHON), as they do under PyPy.
+
+    python src/fuzz.py
+    python src/fuzz.py 12,22 --cases 2000 --seed 3
+    python src/fuzz.py 5 --pure-python
+"""
+import argparse
+import functools
+import importlib
+import itertools
+import random
+import sys
+from dataclasses import dataclass
+from typing import Callable
+
+import utils
+from runner import parse_days
+
+# Errors of the environment rather than of the input, which fail the day.
+ENVIRONMENT_ERRORS = (ImportError, OSError)
+
+
+@dataclass
+class Target:
+    generate: Callable[[random.Random], list[str]]
+    reference: Callable[[list[str]], object]
+    solution: Callable[[list[str]], object]
+
+
+def day5_lines(rng: random.Random) -> list[str]:
+    seeds = []
+    for _ in range(rng.randint(1, 4)):
+        seeds += [rng.randrange(40), rng.randint(1, 10)]
+
+    lines = [f"seeds: {' '.join(map(str, seeds))}"]
+    for section in range(rng.randint(1, 3)):
+        # The source ranges of a map don't overlap, the targets may.
+        bounds = sorted(rng.sample(range(60), 2 * rng.randint(0, 3)))
+        lines += ["", f"{section}-to-{section + 1} map:"]
+        for start, end in zip(bounds[::2], bounds[1::2]):
+            lines.append(f"{rng.randrange(60)} {start} {end - start}")
+
+    return lines
+
+
+def day5_reference(lines: list[str]) -> int:
+    day5 = importlib.import_module("day5")
+    seeds, almanach_maps = day5.parse(lines)
+    return min(
+        day5.seed_to_location(seed, almanach_maps)
+        for start, size in zip(seeds[::2], seeds[1::2])
+        for seed in range(start, start + size)
+    )
+
+
+def day5_solution(lines: list[str]) -> int:
+    day5 = importlib.import_module("day5")
+    return day5.part2(day5.parse(lines))
+
+
+CARDS = "AKQJT98765432"
+
+# The hand types by their sorted card counts, ranked like score_hand_type does.
+HAND_TYPES = {(5,): 10, (4, 1): 9, (3, 2): 8, (3, 1, 1): 7, (2, 2, 1): 6, (2, 1, 1, 1): 5, (1, 1, 1, 1, 1): 4}
+
+
+def day7_lines(rng: random.Random) -> list[str]:
+    # Plenty of jokers, those are where the scoring gets tricky.
+    return [
+        "".join(rng.choices(CARDS + "JJ", k=5)) + f" {rng.randint(1, 1000)}"
+        for _ in range(rng.randint(1, 10))
+    ]
+
+
+@functools.cache
+def best_hand_type(hand: str) -> int:
+    jokers = [i for i, c in enumerate(hand) if c == "J"]
+    best = 0
+    for replacements in itertools.product(CARDS.replace("J", ""), repeat=len(jokers)):
+        cards = list(hand)
+        for i, r in zip(jokers, replacements):
+            cards[i] = r
+        counts = tuple(sorted((cards.count(c) for c in set(cards)), reverse=True))
+        best = max(best, HAND_TYPES[counts])
+
+    return best
+
+
+def day7_reference(lines: list[str]) -> list[int]:
+    return [best_hand_type(line.split()[0]) for line in lines]
+
+
+def day7_solution(lines: list[str]) -> list[int]:
+    day7 = importlib.import_module("day7")
+    return [day7.score_hand_type(hand) for hand, _bid in day7.parse(lines)]
+
+
+def day12_lines(rng: random.Random) -> list[str]:
+    lines = []
+    for _ in range(rng.randint(1, 5)):
+        springs = "".join(rng.choices("#.?", weights=[2, 2, 3], k=rng.randint(1, 6)))
+        # Unfold some rows like part 2 does, while keeping them short to brute-force.
+        if rng.random() < 0.3:
+            springs = "?".join([springs[:3]] * rng.randint(2, 3))
+
+        groups = [rng.randint(1, 3) for _ in range(rng.randint(1, 3))]
+        lines.append(f"{springs} {','.join(map(str, groups))}")
+
+    return lines
+
+
+def damaged_groups(springs: str) -> tuple[int, ...]:
+    return tuple(len(list(g)) for c, g in itertools.groupby(springs) if c == "#")
+
+
+def day12_reference(lines: list[str]) -> list[int]:
+    counts = []
+    for line in lines:
+        springs, groups = line.split()
+        groups = tuple(map(int, groups.split(",")))
+        unknown = [i for i, c in enumerate(springs) if c == "?"]
+
+        count = 0
+        for replacements in itertools.product("#.", repeat=len(unknown)):
+            row = list(springs)
+            for i, r in zip(unknown, replacements):
+                row[i] = r
+            count += damaged_groups("".join(row)) == groups
+        counts.append(count)
+
+    return counts
+
+
+def day12_solution(lines: list[str]) -> list[int]:
+    day12 = importlib.import_module("day12")
+    return [
+        day12.count_combinations(springs, tuple(map(int, counts.split(","))))
+        for springs, counts in day12.parse(lines)
+    ]
+
+
+def day22_lines(rng: random.Random) -> list[str]:
+    """A few bricks floating in a small box, none of them overlapping."""
+    occupied = set()
+    lines = []
+    for _ in range(rng.randint(1, 8)):
+        axis, length = rng.randrange(3), rng.randint(1, 3)
+        start = [rng.randrange(3), rng.randrange(3), rng.randint(1, 8)]
+        end = start[:]
+        end[axis] = start[axis] + length - 1
+        if axis < 2:
+            end[axis] = min(end[axis], 2)
+
+        cells = brick_cells((start, end))
+        if occupied.isdisjoint(cells):
+            occupied |= cells
+            lines.append(f"{start[0]},{start[1]},{start[2]}~{end[0]},{end[1]},{end[2]}")
+
+    return lines
+
+
+def brick_cells(brick: tuple[list, list]) -> set[tuple[int, int, int]]:
+    (x0, y0, z0), (x1, y1, z1) = brick
+    return set(itertools.product(range(x0, x1 + 1), range(y0, y1 + 1), range(z0, z1 + 1)))
+
+
+def settle(bricks: list[set]) -> tuple[list[set], int]:
+    """Let the bricks (as sets of cells) fall one cell at a time, return them and how many moved."""
+    bricks = sorted(bricks, key=lambda cells: min(z for _, _, z in cells))
+    occupied = set().union(*bricks)
+    settled, moved = [], 0
+    for cells in bricks:
+        occupied -= cells
+        start = cells
+        while True:
+            lower = {(x, y, z - 1) for x, y, z in cells}
+            if min(z for _, _, z in lower) < 1 or not occupied.isdisjoint(lower):
+                break
+            cells = lower
+
+        occupied |= cells
+        settled.append(cells)
+        moved += cells != start
+
+    return settled, moved
+
+
+def day22_reference(lines: list[str]) -> tuple[int, int]:
+    bricks = [brick_cells([list(map(int, end.split(","))) for end in line.split("~")]) for line in lines]
+    bricks, _ = settle(bricks)
+
+    falling = [settle(bricks[:i] + bricks[i + 1 :])[1] for i in range(len(bricks))]
+    return sum(f == 0 for f in falling), sum(falling)
+
+
+def day22_solution(lines: list[str]) -> tuple[int, int]:
+    day22 = importlib.import_module("day22")
+    parsed = day22.parse(lines)
+    return day22.part1(parsed), day22.part2(parsed)
+
+
+TARGETS = {
+    5: Target(day5_lines, day5_reference, day5_solution),
+    7: Target(day7_lines, day7_reference, day7_solution),
+    12: Target(day12_lines, day12_reference, day12_solution),
+    22: Target(day22_lines, day22_reference, day22_solution),
+}
+
+
+def mismatch(target: Target, lines: list[str]) -> tuple | None:
+    """The reference and solution answers if they differ, None if they agree or lines isn't valid."""
+    try:
+        expected = target.reference(lines)
+    except ENVIRONMENT_ERRORS:
+        raise
+    except Exception:
+        return None
+
+    try:
+        answer = target.solution(lines)
+    except ENVIRONMENT_ERRORS:
+        raise
+    except Exception as e:
+        answer = f"{type(e).__name__}: {e}"
+
+    return None if answer == expected else (expected, answer)
+
+
+def minimize(lines: list[str], fails: Callable[[list[str]], bool]) -> list[str]:
+    """Drop chunks of lines, halving the chunk size whenever none can be dropped."""
+    chunk = max(1, len(lines) // 2)
+    while True:
+        dropped = False
+        i = 0
+        while i < len(lines):
+            candidate = lines[:i] + lines[i + chunk :]
+            if candidate and fails(candidate):
+                lines, dropped = candidate, True
+            else:
+                i += chunk
+
+        if not dropped:
+            if chunk == 1:
+                return lines
+            chunk //= 2
+
+
+def fuzz(day: int, cases: int, seed: int) -> dict | None:
+    """Run cases random inputs of a day, return the first (minimized) mismatch."""
+    target = TARGETS[day]
+    rng = random.Random(seed)
+    for case in range(cases):
+        lines = target.generate(rng)
+        if mismatch(target, lines) is None:
+            continue
+
+        lines = minimize(lines, lambda candidate: mismatch(target, candidate) is not None)
+        expected, answer = mismatch(target, lines)
+        return {"case": case, "lines": lines, "expected": expected, "answer": answer}
+
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "days",
+        nargs="?",
+        default=",".join(map(str, TARGETS)),
+        help="e.g. 5,12 (only days with a reference solver)",
+    )
+    parser.add_argument("--cases", type=int, default=500, help="random inputs per day")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random inputs")
+    parser.add_argument(
+        "--pure-python",
+        action="store_true",
+        help="fuzz the days' dependency-free code paths, as under PyPy",
+    )
+    args = parser.parse_args()
+
+    if args.pure_python:
+        utils.use_pure_python()
+
+    days = parse_days(args.days)
+    missing = [day for day in days if day not in TARGETS]
+    if missing:
+        sys.exit(f"No reference solver for day(s) {missing}, fuzzable are {list(TARGETS)}")
+
+    failures = errors = 0
+    for day in days:
+        try:
+            found = fuzz(day, args.cases, args.seed)
+        except ENVIRONMENT_ERRORS as e:
+            errors += 1
+            print(f"day {day}: error: {type(e).__name__}: {e}")
+            continue
+
+        if found is None:
+            print(f"day {day}: {args.cases} cases ok")
+            continue
+
+        failures += 1
+        print(f"day {day}: mismatch in case {found['case']}")
+        print(f"  reference: {found['expected']}")
+        print(f"  solution:  {found['answer']}")
+        print("  input:")
+        for line in found["lines"]:
+            print(f"    {line}")
+
+    if failures or errors:
+        problems = [f"{failures} day(s) differ from their reference"] if failures else []
+        problems += [f"{errors} day(s) couldn't run"] if errors else []
+        sys.exit(", ".join(problems))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,785 @@
+"""Seeded synthetic inputs for every day, at a chosen scale.
+
+At scale 1 the inputs are about as big as the real puzzle inputs. The scale
+multiplies the number of input lines (grids grow in both dimensions), so e.g.
+scale 14 gives grids of 1400x1400 to 2000x2000 for days 14, 16 and 17. A few
+days (20 and 21) can't grow freely and document what their scale does instead.
+
+The inputs follow the structure the solutions rely on (and that the real
+inputs happen to have), e.g. day 8's ghosts run in clean cycles, day 20's
+counters feed xp, xl, gp and ln, and day 21's start row and column are open.
+
+    python src/generators.py 1-25 --scale 4 --seed 1 --output-pattern "inputs/scaled{day}.txt"
+    python src/runner.py 1-25 --input-pattern "inputs/scaled{day}.txt"
+"""
+import argparse
+import itertools
+import math
+import os
+import random
+import string
+
+from runner import parse_days
+
+DIGIT_WORDS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+
+def names(rng: random.Random, count: int, alphabets: list[str], exclude=()) -> list[str]:
+    """Distinct random names, with the i-th character taken from alphabets[i]."""
+    pool = ["".join(chars) for chars in itertools.product(*alphabets)]
+    pool = [name for name in pool if name not in set(exclude)]
+    assert count <= len(pool), f"Can't make {count} distinct names from {alphabets}"
+
+    return rng.sample(pool, count)
+
+
+def name_alphabets(count: int, alphabet: str, min_length: int) -> list[str]:
+    """Alphabets for names() that are just long enough to make count distinct names."""
+    length = min_length
+    while len(alphabet) ** length < count:
+        length += 1
+
+    return [alphabet] * length
+
+
+def simple_loop(rng: random.Random, rows: int, cols: int, fill: float) -> list[tuple[int, int]]:
+    """A random simple closed loop on a grid of (4*rows-1) x (4*cols-1) points.
+
+    We grow a random tree on a rows x cols lattice, draw it with thick lines
+    and walk around the drawing. The drawing has no holes (it's a tree) and
+    no two squares only touch at a corner, so the walk is a single loop that
+    never touches itself. The loop is returned as the points in walk order,
+    neighboring points are one step apart.
+    """
+    start = (rng.randrange(rows), rng.randrange(cols))
+    tree = {start}
+    filled = {(2 * start[0], 2 * start[1])}
+    frontier = [(start, n) for n in lattice_neighbors(start, rows, cols)]
+    while frontier and len(tree) < fill * rows * cols:
+        a, b = frontier.pop(rng.randrange(len(frontier)))
+        if b in tree:
+            continue
+
+        tree.add(b)
+        filled.add((2 * b[0], 2 * b[1]))
+        filled.add((a[0] + b[0], a[1] + b[1]))
+        frontier.extend((b, n) for n in lattice_neighbors(b, rows, cols) if n not in tree)
+
+    # Double the drawing, so the loop has points on the inside as well.
+    filled = {(2 * i + di, 2 * j + dj) for i, j in filled for di in (0, 1) for dj in (0, 1)}
+
+    def steps(r: int, c: int) -> list[tuple[int, int]]:
+        """Directions in which the border of the drawing leaves point (r, c)."""
+        up_left, up_right = (r - 1, c - 1) in filled, (r - 1, c) in filled
+        down_left, down_right = (r, c - 1) in filled, (r, c) in filled
+        border = {
+            (-1, 0): up_left != up_right,
+            (1, 0): down_left != down_right,
+            (0, -1): up_left != down_left,
+            (0, 1): up_right != down_right,
+        }
+        return [step for step, on_border in border.items() if on_border]
+
+    # The top left square of the drawing has its top left corner on the loop.
+    first = min(filled)
+    loop = [first]
+    prev, current = None, first
+    while True:
+        for dr, dc in steps(*current):
+            nxt = (current[0] + dr, current[1] + dc)
+            if nxt != prev:
+                break
+
+        if nxt == first:
+            return loop
+
+        loop.append(nxt)
+        prev, current = current, nxt
+
+
+def lattice_neighbors(node: tuple[int, int], rows: int, cols: int) -> list[tuple[int, int]]:
+    i, j = node
+    candidates = [(i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)]
+    return [(a, b) for a, b in candidates if 0 <= a < rows and 0 <= b < cols]
+
+
+def grid_text(grid: list[list[str]]) -> str:
+    return "".join("".join(row) + "\n" for row in grid)
+
+
+def random_grid(rng: random.Random, size: int, chars: str, weights: list[float]) -> list[list[str]]:
+    return [rng.choices(chars, weights, k=size) for _ in range(size)]
+
+
+def day1_input(rng: random.Random, scale: int) -> str:
+    lines = []
+    for _ in range(1000 * scale):
+        chunks = [rng.choice(string.digits[1:]) for _ in range(rng.randint(0, 3))]
+        chunks += rng.sample(DIGIT_WORDS, rng.randint(0, 3))
+        chunks += ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(0, 5)))]
+        # Every line needs at least one digit (or digit word).
+        chunks.append(rng.choice([rng.choice(string.digits[1:]), rng.choice(DIGIT_WORDS)]))
+        rng.shuffle(chunks)
+        lines.append("".join(chunks))
+
+    return "".join(line + "\n" for line in lines)
+
+
+def day2_input(rng: random.Random, scale: int) -> str:
+    lines = []
+    for game_id in range(1, 100 * scale + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            draws.append(", ".join(f"{rng.randint(1, 20)} {color}" for color in colors))
+        lines.append(f"Game {game_id}: " + "; ".join(draws))
+
+    return "".join(line + "\n" for line in lines)
+
+
+def day3_input(rng: random.Random, scale: int) -> str:
+    size = 140 * scale
+    grid = [["."] * size for _ in range(size)]
+
+    for _ in range(size * size // 20):
+        i, j = rng.randrange(size), rng.randrange(size)
+        number = str(rng.randint(1, 999))
+        # Keep a free cell around numbers, so they don't run into each other.
+        if j + len(number) > size or any(
+            grid[i][c] != "." for c in range(max(j - 1, 0), min(j + len(number) + 1, size))
+        ):
+            continue
+        grid[i][j : j + len(number)] = number
+
+        if rng.random() < 0.8:
+            si = min(max(i + rng.randint(-1, 1), 0), size - 1)
+            sj = min(max(j + rng.randint(-1, len(number)), 0), size - 1)
+            if grid[si][sj] == ".":
+                grid[si][sj] = rng.choice("***#+$/@%=&-")
+
+    return grid_text(grid)
+
+
+def day4_input(rng: random.Random, scale: int, max_copies: int = 25000) -> str:
+    """Cards with 10 winning and 25 drawn numbers (day4.NUM_COUNT).
+
+    Won copies snowball down the pile, so win counts are picked such that no
+    card ends up with more than max_copies copies, which would make part 2 run
+    for ages without being representative of the real inputs.
+    """
+    card_count = 200 * scale
+    copies = [1] * card_count
+    lines = []
+    for card in range(card_count):
+        wins = rng.randint(0, 10)
+        while wins > 0 and any(
+            copies[won] + copies[card] > max_copies
+            for won in range(card + 1, min(card + wins + 1, card_count))
+        ):
+            wins -= 1
+        for won in range(card + 1, min(card + wins + 1, card_count)):
+            copies[won] += copies[card]
+
+        winning = rng.sample(range(1, 100), 10)
+        others = [n for n in range(1, 100) if n not in winning]
+        drawn = rng.sample(winning, wins) + rng.sample(others, 25 - wins)
+        rng.shuffle(drawn)
+        lines.append(
+            f"Card {card + 1:>4}: "
+            + " ".join(f"{n:>2}" for n in winning)
+            + " | "
+            + " ".join(f"{n:>2}" for n in drawn)
+        )
+
+    return "".join(line + "\n" for line in lines)
+
+
+def day5_input(rng: random.Random, scale: int) -> str:
+    max_value = 2**32
+    seeds = []
+    for _ in range(10 * scale):
+        start = rng.randrange(max_value // 2)
+        seeds += [start, rng.randint(1, max_value // 20)]
+
+    sections = [f"seeds: {' '.join(map(str, seeds))}"]
+    stages = ["seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location"]
+    for source, target in zip(stages, stages[1:]):
+        # Non-overlapping source ranges, which are shuffled around in the target.
+        bounds = sorted(rng.sample(range(1, max_value), 40 * scale - 1))
+        ranges = list(zip([0] + bounds, bounds + [max_value]))
+        targets = ranges[:]
+        rng.shuffle(targets)
+
+        lines = [f"{source}-to-{target} map:"]
+        for (start, end), (target_start, _) in zip(ranges, targets):
+            # Leave a few ranges unmapped, so they map to themselves.
+            if rng.random() < 0.9:
+                lines.append(f"{target_start} {start} {end - start}")
+        sections.append("\n".join(lines))
+
+    return "\n\n".join(sections) + "\n"
+
+
+def day6_input(rng: random.Random, scale: int) -> str:
+    """Races with two-digit times.
+
+    Part 2 scans from both ends of the concatenated race for winning button
+    times, which takes about distance/time steps. So every distance has as
+    many digits as its time, except the first which has two more, keeping
+    that scan short no matter how many races there are.
+    """
+    times, dists = [], []
+    for race in range(4 * scale):
+        if race == 0:
+            time = rng.randint(70, 99)
+            dist = rng.randint(1000, time * time // 4 - 1)
+        else:
+            time = rng.randint(10, 99)
+            dist = rng.randint(10, min(99, time * time // 4 - 1))
+        times.append(time)
+        dists.append(dist)
+
+    return (
+        "Time:     " + " ".join(f"{t:>4}" for t in times) + "\n"
+        "Distance: " + " ".join(f"{d:>4}" for d in dists) + "\n"
+    )
+
+
+def day7_input(rng: random.Random, scale: int) -> str:
+    # Distinct hands, in the order they were drawn so that the seed fixes the text.
+    hands = {}
+    while len(hands) < 1000 * scale:
+        hands["".join(rng.choices("AKQJT98765432", k=5))] = None
+
+    return "".join(f"{hand} {rng.randint(1, 1000)}\n" for hand in hands)
+
+
+def day8_input(rng: random.Random, scale: int) -> str:
+    """Six ghosts, each running around its own ring of nodes.
+
+    Ghost g walks from its xxA node through m_g layers of one or two nodes to
+    its xxZ node, which continues exactly like the xxA node. Whichever way the
+    directions go, the ghost reaches xxZ after m_g steps and then every m_g
+    steps, which is what part 2 relies on. The m_g are distinct primes. The
+    first ghost starts at AAA and ends at ZZZ for part 1.
+    """
+    ghosts = 6
+    primes = [p for p in range(50 * scale, 150 * scale) if all(p % d for d in range(2, math.isqrt(p) + 1))]
+    ring_lens = rng.sample(primes, ghosts)
+
+    letters = string.ascii_uppercase
+    starts = ["AAA"] + [n + "A" for n in names(rng, ghosts - 1, [letters] * 2, exclude={"AA"})]
+    ends = ["ZZZ"] + [n + "Z" for n in names(rng, ghosts - 1, [letters] * 2, exclude={"ZZ"})]
+
+    layer_sizes = [[rng.randint(1, 2) for _ in range(m - 1)] for m in ring_lens]
+    # Names ending in A or Z would be start and end nodes.
+    inner = names(rng, sum(map(sum, layer_sizes)), [letters, letters, letters[1:-1]])
+
+    graph = {}
+    for start, end, sizes in zip(starts, ends, layer_sizes):
+        layers = [[start]]
+        for size in sizes:
+            layers.append([inner.pop() for _ in range(size)])
+        layers.append([end])
+
+        for layer, next_layer in zip(layers, layers[1:]):
+            for node in layer:
+                left, right = rng.sample(next_layer, 2) if len(next_layer) == 2 else next_layer * 2
+                graph[node] = (left, right)
+        graph[end] = graph[start]
+
+    nodes = list(graph)
+    rng.shuffle(nodes)
+    directions = "".join(rng.choices("LR", k=rng.randint(200, 300)))
+    return directions + "\n\n" + "".join(f"{n} = ({graph[n][0]}, {graph[n][1]})\n" for n in nodes)
+
+
+def day9_input(rng: random.Random, scale: int) -> str:
+    lines = []
+    for _ in range(200 * scale):
+        # Build the difference table bottom up, from a constant row.
+        values = [rng.randint(-10, 10)] * 21
+        for _ in range(rng.randint(1, 8)):
+            first = rng.randint(-20, 30)
+            values = [first] + [first + s for s in itertools.accumulate(values[:-1])]
+        lines.append(" ".join(map(str, values)))
+
+    return "".join(line + "\n" for line in lines)
+
+
+def day10_input(rng: random.Random, scale: int) -> str:
+    size = 140 * scale
+    grid = [rng.choices(".|-LJ7F", [8, 1, 1, 1, 1, 1, 1], k=size) for _ in range(size)]
+
+    lattice = (size + 1) // 4
+    loop = simple_loop(rng, lattice, lattice, fill=0.6)
+    pipes = {
+        frozenset({(-1, 0), (1, 0)}): "|",
+        frozenset({(0, -1), (0, 1)}): "-",
+        frozenset({(-1, 0), (0, 1)}): "L",
+        frozenset({(-1, 0), (0, -1)}): "J",
+        frozenset({(1, 0), (0, -1)}): "7",
+        frozenset({(1, 0), (0, 1)}): "F",
+    }
+    for k, (r, c) in enumerate(loop):
+        (pr, pc), (nr, nc) = loop[k - 1], loop[(k + 1) % len(loop)]
+        grid[r][c] = pipes[frozenset({(pr - r, pc - c), (nr - r, nc - c)})]
+
+    # Only the loop may connect to the start, so clear the junk around it.
+    sr, sc = rng.choice(loop)
+    grid[sr][sc] = "S"
+    on_loop = set(loop)
+    for r, c in lattice_neighbors((sr, sc), size, size):
+        if (r, c) not in on_loop:
+            grid[r][c] = "."
+
+    return grid_text(grid)
+
+
+def day11_input(rng: random.Random, scale: int) -> str:
+    size = 140 * scale
+    empty_rows = set(rng.sample(range(size), size // 20))
+    empty_cols = set(rng.sample(range(size), size // 20))
+    grid = [
+        [
+            "#" if i not in empty_rows and j not in empty_cols and rng.random() < 0.02 else "."
+            for j in range(size)
+        ]
+        for i in range(size)
+    ]
+    return grid_text(grid)
+
+
+def day12_input(rng: random.Random, scale: int) -> str:
+    lines = []
+    for _ in range(1000 * scale):
+        groups = [rng.randint(1, 5) for _ in range(rng.randint(1, 6))]
+        while sum(groups) + len(groups) - 1 > 20:
+            groups.pop()
+
+        # A valid arrangement first, then we forget some of the springs.
+        gaps = [0] + [1] * (len(groups) - 1) + [0]
+        for _ in range(rng.randint(0, 20 - (sum(groups) + len(groups) - 1))):
+            gaps[rng.randrange(len(gaps))] += 1
+        springs = "." * gaps[0]
+        for group, gap in zip(groups, gaps[1:]):
+            springs += "#" * group + "." * gap
+
+        springs = "".join("?" if rng.random() < 0.4 else c for c in springs)
+        lines.append(f"{springs} {','.join(map(str, groups))}")
+
+    return "".join(line + "\n" for line in lines)
+
+
+def mirrored_cells(h: int, w: int, reflection: tuple[str, int]):
+    """Pairs of cells that a reflection maps onto each other.
+
+    ("v", p) reflects the columns left of p onto the ones right of it, ("h", p)
+    does the same for rows, like day13's reflection positions.
+    """
+    orientation, p = reflection
+    if orientation == "v":
+        for k in range(min(p, w - p)):
+            for i in range(h):
+                yield (i, p - 1 - k), (i, p + k)
+    else:
+        for k in range(min(p, h - p)):
+            for j in range(w):
+                yield (p - 1 - k, j), (p + k, j)
+
+
+def column_reflections(rows: list[str]) -> set[int]:
+    w = len(rows[0])
+    return {
+        p
+        for p in range(1, w)
+        if all(row[max(0, 2 * p - w) : p] == row[p : 2 * p][::-1] for row in rows)
+    }
+
+
+def pattern_reflections(pattern: list[list[str]]) -> set[tuple[str, int]]:
+    rows = ["".join(row) for row in pattern]
+    cols = ["".join(col) for col in zip(*pattern)]
+    return {("v", p) for p in column_reflections(rows)} | {("h", p) for p in column_reflections(cols)}
+
+
+def smudge_fix(pattern: list[list[str]], before: tuple[str, int]) -> tuple[str, int] | None:
+    """The reflection day13's part 2 finds, None if it would find none or fail.
+
+    Like the solution, flip the cells in order and take the first new
+    reflection, checking columns before rows.
+    """
+    for i, row in enumerate(pattern):
+        for j, c in enumerate(row):
+            row[j] = "." if c == "#" else "#"
+            new = pattern_reflections(pattern) - {before}
+            row[j] = c
+
+            for orientation in ("v", "h"):
+                found = [r for r in new if r[0] == orientation]
+                if len(found) > 1:
+                    return None
+                if found:
+                    return found[0]
+
+    return None
+
+
+def day13_pattern(rng: random.Random) -> list[list[str]]:
+    """A pattern with one reflection, and another one once its smudge is fixed.
+
+    Cells mirrored by the first reflection must be equal, as must the cells
+    mirrored by the second one, except for the smudge and its mirror image.
+    Those constraints are solved with a union-find that tracks whether two
+    cells are equal or opposite, and we retry until they are consistent.
+    """
+    while True:
+        h, w = rng.randint(5, 17), rng.randint(5, 17)
+        reflections = [("v", p) for p in range(1, w)] + [("h", p) for p in range(1, h)]
+        before, after = rng.sample(reflections, 2)
+        smudge, smudge_mirror = rng.choice(list(mirrored_cells(h, w, after)))
+
+        parent = {(i, j): ((i, j), 0) for i in range(h) for j in range(w)}
+
+        def find(cell):
+            root, parity = cell, 0
+            while parent[root][0] != root:
+                root, step = parent[root]
+                parity ^= step
+            return root, parity
+
+        def union(a, b, different: int) -> bool:
+            (root_a, parity_a), (root_b, parity_b) = find(a), find(b)
+            if root_a == root_b:
+                return parity_a ^ parity_b == different
+            parent[root_a] = (root_b, parity_a ^ parity_b ^ different)
+            return True
+
+        consistent = all(union(a, b, 0) for a, b in mirrored_cells(h, w, before)) and all(
+            union(a, b, int({a, b} == {smudge, smudge_mirror}))
+            for a, b in mirrored_cells(h, w, after)
+        )
+        if not consistent:
+            continue
+
+        colors = {}
+        pattern = [["."] * w for _ in range(h)]
+        for cell in parent:
+            root, parity = find(cell)
+            colors.setdefault(root, rng.randint(0, 1))
+            pattern[cell[0]][cell[1]] = ".#"[colors[root] ^ parity]
+
+        if pattern_reflections(pattern) == {before} and smudge_fix(pattern, before) == after:
+            return pattern
+
+
+def day13_input(rng: random.Random, scale: int) -> str:
+    return "\n".join(grid_text(day13_pattern(rng)) for _ in range(100 * scale))
+
+
+def day14_input(rng: random.Random, scale: int) -> str:
+    return grid_text(random_grid(rng, 100 * scale, ".O#", [0.7, 0.2, 0.1]))
+
+
+def day15_input(rng: random.Random, scale: int) -> str:
+    labels = names(rng, 500 * scale, name_alphabets(500 * scale, string.ascii_lowercase, 2)) + [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 6))) for _ in range(500 * scale)
+    ]
+    steps = []
+    for _ in range(4000 * scale):
+        label = rng.choice(labels)
+        steps.append(f"{label}={rng.randint(1, 9)}" if rng.random() < 0.65 else f"{label}-")
+
+    return ",".join(steps) + "\n"
+
+
+def day16_input(rng: random.Random, scale: int) -> str:
+    return grid_text(random_grid(rng, 110 * scale, ".|-\\/", [0.85, 0.04, 0.04, 0.035, 0.035]))
+
+
+def day17_input(rng: random.Random, scale: int) -> str:
+    return grid_text(random_grid(rng, 141 * scale, "123456789", [1] * 9))
+
+
+def day18_input(rng: random.Random, scale: int) -> str:
+    """A dig plan whose loop doesn't cross itself with either reading.
+
+    Both parts dig the same random loop, stretched by different amounts along
+    each grid line, so the shape (and the number of lines) stays the same.
+    """
+    lattice = round(20 * math.sqrt(scale))
+    loop = simple_loop(rng, lattice, lattice, fill=0.7)
+
+    # Merge the unit steps into straight runs between the corners.
+    corners = [
+        point
+        for point, prev, nxt in zip(loop, loop[-1:] + loop[:-1], loop[1:] + loop[:1])
+        if prev[0] != nxt[0] and prev[1] != nxt[1]
+    ]
+    size = 4 * lattice
+
+    def stretch(max_gap: int) -> tuple[list[int], list[int]]:
+        rows = [0, *itertools.accumulate(rng.randint(1, max_gap) for _ in range(size))]
+        cols = [0, *itertools.accumulate(rng.randint(1, max_gap) for _ in range(size))]
+        return rows, cols
+
+    rows1, cols1 = stretch(3)
+    # The part 2 distance has to fit in five hex digits.
+    rows2, cols2 = stretch(0xFFFFF // size)
+
+    lines = []
+    directions = {(0, 1): ("R", 0), (1, 0): ("D", 1), (0, -1): ("L", 2), (-1, 0): ("U", 3)}
+    for (r0, c0), (r1, c1) in zip(corners, corners[1:] + corners[:1]):
+        direction, code = directions[((r1 > r0) - (r1 < r0), (c1 > c0) - (c1 < c0))]
+        steps1 = abs(rows1[r1] - rows1[r0]) + abs(cols1[c1] - cols1[c0])
+        steps2 = abs(rows2[r1] - rows2[r0]) + abs(cols2[c1] - cols2[c0])
+        # Part 2 reads its direction from the color, so make it match the loop.
+        lines.append(f"{direction} {steps1} (#{steps2:05x}{code})")
+
+    return "".join(line + "\n" for line in lines)
+
+
+def day19_input(rng: random.Random, scale: int) -> str:
+    """A tree of workflows, so every part ends up in A or R."""
+    workflow_count = 550 * scale
+    labels = iter(names(rng, workflow_count, [string.ascii_lowercase] * 3))
+
+    workflows = {}
+    todo = ["in"]
+    created = 1
+    while todo:
+        label = todo.pop(rng.randrange(len(todo)))
+        targets = []
+        for _ in range(rng.randint(2, 4)):
+            # Keep at least one workflow open, until we have made all of them.
+            if created < workflow_count and (rng.random() < 0.6 or not todo):
+                target = next(labels)
+                todo.append(target)
+                created += 1
+            else:
+                target = rng.choice("AR")
+            targets.append(target)
+
+        rules = [
+            f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(1, 4000)}:{target}"
+            for target in targets[:-1]
+        ]
+        workflows[label] = f"{label}{{{','.join(rules + targets[-1:])}}}"
+
+    lines = list(workflows.values())
+    rng.shuffle(lines)
+    parts = [
+        "{" + ",".join(f"{var}={rng.randint(1, 4000)}" for var in "xmas") + "}"
+        for _ in range(200 * scale)
+    ]
+    return "\n".join(lines) + "\n\n" + "\n".join(parts) + "\n"
+
+
+def day20_input(rng: random.Random, scale: int) -> str:
+    """Four 12 bit counters, like the real input.
+
+    Each counter is a chain of flip-flops counting button presses. The bits
+    that are set in the counter's target number feed a conjunction, which
+    fires once the target is reached and resets the counter by pushing the
+    other bits over. The conjunctions go through the inverters xp, xl, gp and
+    ln into zh and then rx, which part 2 looks for.
+
+    Part 2 presses the button at most 20000 times per inverter and looks for
+    those four names, so the scale doesn't change anything here.
+    """
+    bits = 12
+    primes = [p for p in range(2**(bits - 1) + 1, 2**bits) if all(p % d for d in range(2, math.isqrt(p) + 1))]
+    targets = rng.sample(primes, 4)
+
+    reserved = {"xp", "xl", "gp", "ln", "zh", "rx"}
+    module_names = iter(names(rng, 4 * (bits + 1), [string.ascii_lowercase] * 2, exclude=reserved))
+
+    lines = []
+    firsts = []
+    for inverter, target in zip(["xp", "xl", "gp", "ln"], targets):
+        counter = [next(module_names) for _ in range(bits)]
+        hub = next(module_names)
+        firsts.append(counter[0])
+
+        for bit, (name, next_name) in enumerate(zip(counter, counter[1:] + [None])):
+            outputs = [next_name] if next_name else []
+            if target >> bit & 1:
+                outputs.append(hub)
+            lines.append(f"%{name} -> {', '.join(outputs)}")
+
+        # Target numbers are odd, so the first bit is both an input and an output.
+        resets = [name for bit, name in enumerate(counter) if not target >> bit & 1 or bit == 0]
+        lines.append(f"&{hub} -> {', '.join([inverter] + resets)}")
+        lines.append(f"&{inverter} -> zh")
+
+    lines.append("&zh -> rx")
+    lines.append(f"broadcaster -> {', '.join(firsts)}")
+    rng.shuffle(lines)
+    return "".join(line + "\n" for line in lines)
+
+
+def day21_input(rng: random.Random, scale: int) -> str:
+    """A square garden with an odd size and the start in the middle.
+
+    Part 2 extrapolates from the map repeating every size steps, which relies
+    on the start's row and column and the border being free of rocks. The real
+    inputs also have an open diamond halfway to the border, so we have it too.
+
+    The solution only handles 131x131 gardens (26501365 steps are 65 + 131 * N),
+    so the scale doesn't change anything here either.
+    """
+    size = 131
+    mid = size // 2
+
+    grid = random_grid(rng, size, ".#", [0.85, 0.15])
+    for i in range(size):
+        for j in range(size):
+            on_diamond = abs(abs(i - mid) + abs(j - mid) - mid) <= 1
+            if i in (0, mid, size - 1) or j in (0, mid, size - 1) or on_diamond:
+                grid[i][j] = "."
+    grid[mid][mid] = "S"
+
+    return grid_text(grid)
+
+
+def day22_input(rng: random.Random, scale: int) -> str:
+    """Bricks stacked in the air with gaps, which then have to fall."""
+    side = max(3, round(10 * math.sqrt(scale)))
+    heights = [[0] * side for _ in range(side)]
+    bricks = []
+    for _ in range(1400 * scale):
+        axis, length = rng.randrange(3), rng.randint(1, 5)
+        extent = [0, 0, 0]
+        extent[axis] = length - 1 if axis == 2 else min(length, side) - 1
+
+        x, y = rng.randint(0, side - 1 - extent[0]), rng.randint(0, side - 1 - extent[1])
+        footprint = [(a, b) for a in range(x, x + extent[0] + 1) for b in range(y, y + extent[1] + 1)]
+        z = max(heights[a][b] for a, b in footprint) + 1 + rng.randint(0, 5)
+        for a, b in footprint:
+            heights[a][b] = z + extent[2]
+
+        bricks.append(f"{x},{y},{z}~{x + extent[0]},{y + extent[1]},{z + extent[2]}")
+
+    rng.shuffle(bricks)
+    return "".join(brick + "\n" for brick in bricks)
+
+
+def day23_input(rng: random.Random, scale: int) -> str:
+    """Trails between a 6x6 lattice of junctions, like the real input.
+
+    The longest path search is exponential in the number of junctions, so the
+    scale only makes the trails between the junctions longer.
+    """
+    size = 141 * scale
+    junctions = 6
+    rows = sorted(rng.sample(range(3, size - 3, 4), junctions))
+    cols = sorted(rng.sample(range(3, size - 3, 4), junctions))
+
+    grid = [["#"] * size for _ in range(size)]
+    for r in rows:
+        for c in range(cols[0], cols[-1] + 1):
+            grid[r][c] = "."
+    for c in cols:
+        for r in range(rows[0], rows[-1] + 1):
+            grid[r][c] = "."
+    for r in range(0, rows[0]):
+        grid[r][cols[0]] = "."
+    for r in range(rows[-1], size):
+        grid[r][cols[-1]] = "."
+
+    # Slopes lead into and out of every junction.
+    for r in rows:
+        for c in cols:
+            for dr, dc, slope in [(0, -1, ">"), (0, 1, ">"), (-1, 0, "v"), (1, 0, "v")]:
+                if grid[r + dr][c + dc] == ".":
+                    grid[r + dr][c + dc] = slope
+
+    return grid_text(grid)
+
+
+def day24_input(rng: random.Random, scale: int) -> str:
+    """Hailstones that a single rock throw hits at distinct integer times."""
+    rock_pos = [rng.randint(2 * 10**14, 4 * 10**14) for _ in range(3)]
+    rock_vel = [rng.randint(-300, 300) for _ in range(3)]
+
+    lines = []
+    for t in rng.sample(range(10**11, 10**12), 300 * scale):
+        vel = [v + rng.choice([-1, 1]) * rng.randint(1, 300) for v in rock_vel]
+        pos = [p + (rv - v) * t for p, rv, v in zip(rock_pos, rock_vel, vel)]
+        lines.append(f"{pos[0]}, {pos[1]}, {pos[2]} @ {vel[0]}, {vel[1]}, {vel[2]}")
+
+    return "".join(line + "\n" for line in lines)
+
+
+def day25_input(rng: random.Random, scale: int) -> str:
+    """Two well connected halves, joined by exactly three wires."""
+    nodes = names(rng, 1500 * scale, name_alphabets(1500 * scale, string.ascii_lowercase, 3))
+    split = len(nodes) // 2 + rng.randint(-len(nodes) // 10, len(nodes) // 10)
+    halves = [nodes[:split], nodes[split:]]
+
+    # A dict keeps the edges in the order they were added, a set's order
+    # would depend on the string hash seed.
+    edges = {}
+    for half in halves:
+        degree = dict.fromkeys(half, 0)
+        # A minimum degree of 4 makes a random graph 4-edge-connected (with
+        # overwhelming probability), so the three wires are the only 3-cut.
+        for node in half:
+            while degree[node] < 4:
+                other = rng.choice(half)
+                if other != node and frozenset((node, other)) not in edges:
+                    edges[frozenset((node, other))] = None
+                    degree[node] += 1
+                    degree[other] += 1
+
+    wire_count = len(edges) + 3
+    while len(edges) < wire_count:
+        edges[frozenset((rng.choice(halves[0]), rng.choice(halves[1])))] = None
+
+    wires = {}
+    for edge in edges:
+        a, b = rng.sample(sorted(edge), 2)
+        wires.setdefault(a, []).append(b)
+
+    lines = [f"{node}: {' '.join(targets)}" for node, targets in wires.items()]
+    rng.shuffle(lines)
+    return "".join(line + "\n" for line in lines)
+
+
+GENERATORS = {
+    1: day1_input, 2: day2_input, 3: day3_input, 4: day4_input, 5: day5_input,
+    6: day6_input, 7: day7_input, 8: day8_input, 9: day9_input, 10: day10_input,
+    11: day11_input, 12: day12_input, 13: day13_input, 14: day14_input, 15: day15_input,
+    16: day16_input, 17: day17_input, 18: day18_input, 19: day19_input, 20: day20_input,
+    21: day21_input, 22: day22_input, 23: day23_input, 24: day24_input, 25: day25_input,
+}
+
+
+def generate(day: int, scale: int = 1, seed: int = 0) -> str:
+    """The input of a day at the given scale, the same for the same seed."""
+    rng = random.Random(f"{seed}-{day}-{scale}")
+    return GENERATORS[day](rng, scale)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("days", nargs="?", default="1-25", help="e.g. 1-25 or 5,12,17")
+    parser.add_argument("--scale", type=int, default=1, help="input size relative to the puzzle inputs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output-pattern",
+        default="inputs/scaled{day}.txt",
+        help="output file path, {day} is replaced by the day number",
+    )
+    args = parser.parse_args()
+
+    for day in parse_days(args.days):
+        path = args.output_pattern.format(day=day)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            f.write(generate(day, args.scale, args.seed))
+        print(f"Wrote day {day} at scale {args.scale} to {path}")
+
+
+if __name__ == "__main__":
+    main()
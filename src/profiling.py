@@ -0,0 +1,136 @@
+"""cProfile and tracemalloc hooks for the runner's phases.
+
+For every profiled phase, the call graph is exported twice:
+
+- as a .pstats file, for `python -m pstats` or snakeviz,
+- as collapsed-stack text (one "a;b;c <microseconds>" line per stack), which
+  flamegraph.pl, inferno or speedscope turn into a flame graph.
+
+cProfile only records caller -> callee edges, not full stacks, so the stacks are
+reconstructed by splitting each function's time over its callers in proportion
+to the time spent on each edge. That is exact for tree-shaped call graphs and a
+good approximation otherwise.
+
+tracemalloc records the peak of traced Python allocations and the source lines
+that hold the most memory at the end of the phase. Both profilers slow the
+phase down considerably, so don't compare profiled timings to unprofiled ones.
+"""
+import contextlib
+import cProfile
+import os
+import pstats
+import tracemalloc
+
+# Stacks with less time than this are dropped, this keeps the output small for
+# deep recursive solutions without visibly changing the flame graph.
+MIN_STACK_US = 1
+
+
+def function_label(func: tuple[str, int, str]) -> str:
+    filename, lineno, name = func
+    if filename == "~":
+        # Builtins, e.g. "<built-in method builtins.sorted>".
+        return name
+
+    return f"{os.path.basename(filename)}:{lineno}({name})"
+
+
+def collapsed_stacks(stats: pstats.Stats) -> dict[str, int]:
+    """Reconstruct collapsed stacks with their self time in microseconds."""
+    callees = {}
+    # The profiler is enabled in the middle of a function, so the functions
+    # called from there have callers that were never profiled themselves.
+    roots = []
+    for func, (_cc, _nc, _tt, ct, callers) in stats.stats.items():
+        outside = [edge[3] for caller, edge in callers.items() if caller not in stats.stats]
+        if not callers:
+            roots.append((func, ct))
+        elif outside:
+            roots.append((func, sum(outside)))
+
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    stacks = {}
+
+    def add(stack: str, seconds: float):
+        stacks[stack] = stacks.get(stack, 0) + seconds * 1e6
+
+    # Walk the call graph, handing each function's share of the time on this
+    # path down to its callees. A function that is already on the stack is
+    # recursion, its time is already accounted for further up.
+    todo = [(func, function_label(func), seconds, {func}) for func, seconds in roots]
+    while todo:
+        func, stack, seconds, on_stack = todo.pop()
+        _cc, _nc, tt, ct, _callers = stats.stats[func]
+        share = seconds / ct if ct > 0 else 0.0
+
+        add(stack, tt * share)
+        for callee, edge_ct in callees.get(func, []):
+            callee_seconds = edge_ct * share
+            if callee in on_stack:
+                add(stack, callee_seconds)
+            elif callee_seconds * 1e6 >= MIN_STACK_US:
+                callee_stack = f"{stack};{function_label(callee)}"
+                todo.append((callee, callee_stack, callee_seconds, on_stack | {callee}))
+
+    return {stack: round(us) for stack, us in stacks.items() if round(us) > 0}
+
+
+def write_collapsed(stats: pstats.Stats, path: str):
+    with open(path, "w") as f:
+        for stack, us in sorted(collapsed_stacks(stats).items()):
+            f.write(f"{stack} {us}\n")
+
+
+def top_allocations(snapshot: tracemalloc.Snapshot, top: int = 10) -> list[dict]:
+    # Don't blame the profilers themselves.
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+        ]
+    )
+
+    allocations = []
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        allocations.append(
+            {
+                "location": f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                "size_kb": stat.size / 1024,
+                "count": stat.count,
+            }
+        )
+
+    return allocations
+
+
+@contextlib.contextmanager
+def profile(profiles: dict, name: str, path_prefix: str):
+    """Profile the wrapped block and record where the results went in profiles[name].
+
+    Writes path_prefix.pstats and path_prefix.collapsed.
+    """
+    os.makedirs(os.path.dirname(path_prefix) or ".", exist_ok=True)
+
+    tracemalloc.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        profiler.dump_stats(f"{path_prefix}.pstats")
+        write_collapsed(pstats.Stats(profiler), f"{path_prefix}.collapsed")
+
+        profiles[name] = {
+            "pstats": f"{path_prefix}.pstats",
+            "collapsed": f"{path_prefix}.collapsed",
+            "tracemalloc_peak_kb": peak / 1024,
+            "top_allocations": top_allocations(snapshot),
+        }
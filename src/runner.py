@@ -0,0 +1,607 @@
+"""Run any subset of the days and time the parse and part phases separately.
+
+Each day module exposes parse(puzzle_input), part1(parsed) and part2(parsed)
+(some days only kept one of the parts). A day that sets STREAM_INPUT = True
+promises that parse() goes over its lines only once, front to back, so it is
+given the lazy utils.stream_lines() instead of a list. The runner imports the
+module in a fresh worker process, so imports and memory of one day don't leak
+into the next, and records wall time, CPU time and peak RSS for every phase.
+
+With --jobs, the days are spread over a process pool. The days that took
+longest in a previous report are started first, so a slow day doesn't end
+up running alone at the end.
+
+With --cache, answers and slow-to-compute parse products are stored on disk
+(see cache.py) and reused for unchanged inputs and solutions.
+
+With --import-profile, the days aren't solved. Instead, every day is imported
+in a fresh interpreter under -X importtime and the cost of its imports is
+reported, optionally failing if a day goes over --import-budget-ms.
+
+With --profile, every parse and part phase runs under cProfile and tracemalloc.
+The call graphs (.pstats and collapsed stacks for flame graphs) are written to
+a directory next to the report, the peak traced memory and top allocating lines
+go into the report itself (see profiling.py).
+
+With --telemetry, the counters and gauges that solutions report (see
+telemetry.py) are sampled at the given interval into the report.
+
+With --time-budget and --memory-budget (per day), --part-time-budget and
+--part-memory-budget (per parse and part phase) and --budget overrides for
+single days or phases, a day that goes over a budget is killed and reported
+with a "timeout" or "oom" status, and the runner carries on with the next day
+(see budgets.py). A day whose process dies on its own (e.g. a segfault or the
+kernel's OOM killer) is reported as "crashed" or "oom" the same way.
+
+Under PyPy, the days take their dependency-free code paths (see
+utils.PURE_PYTHON), --pure-python takes them on CPython too.
+
+    python src/runner.py 1-25
+    python src/runner.py 5,12,17 --input-pattern "inputs/input{day}.txt" --report report.json
+    python src/runner.py 1-25 --jobs 8 --history report.json
+    python src/runner.py 17,22,23 --cache .cache --cache-size 512
+    python src/runner.py 1-25 --import-profile --import-budget-ms 100
+    python src/runner.py 16,22 --profile
+    python src/runner.py 16,21,22 --telemetry 0.5
+    python src/runner.py 1-25 --time-budget 120 --memory-budget 4096 --budget 23:part2=30s --budget 21=1024mb
+    pypy3 src/runner.py 1-25 --report report-pypy.json
+"""
+import argparse
+import contextlib
+import datetime
+import importlib
+import json
+import math
+import multiprocessing
+import os
+import platform
+import resource
+import signal
+import subprocess
+import sys
+import time
+import traceback
+from collections import Counter
+from multiprocessing.connection import wait
+
+import profiling
+import telemetry
+import utils
+from budgets import CHECK_INTERVAL_S, Budget, Budgets, Watchdog, rss_enforceable
+from cache import MISS, Cache
+
+PARTS = ("part1", "part2")
+
+
+def parse_days(spec: str) -> list[int]:
+    """Parse a day selection like 1-5,7,9 into a sorted list of days."""
+    days = set()
+    for chunk in spec.split(","):
+        if "-" in chunk:
+            first, last = chunk.split("-")
+            days |= set(range(int(first), int(last) + 1))
+        else:
+            days.add(int(chunk))
+
+    assert all(1 <= d <= 25 for d in days), f"Days out of range in {spec}"
+    return sorted(days)
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's RSS high-water mark, so peaks can be measured per phase.
+
+    Only Linux supports this (since 4.0), elsewhere the peak stays process-wide.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+
+    return True
+
+
+def peak_rss_kb() -> int:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+
+    # ru_maxrss is in bytes on macOS and in kilobytes everywhere else.
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
+
+
+@contextlib.contextmanager
+def measure(phases: dict, name: str):
+    """Record wall time, CPU time and peak RSS of the wrapped block in phases[name]."""
+    per_phase_peak = reset_peak_rss()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        phases[name] = {
+            "wall_s": time.perf_counter() - wall_start,
+            "cpu_s": time.process_time() - cpu_start,
+            "peak_rss_kb": peak_rss_kb(),
+            "peak_rss_per_phase": per_phase_peak,
+        }
+
+
+def to_json_answer(answer):
+    """Answers can be numpy or sympy numbers, which json can't handle."""
+    if answer is None or isinstance(answer, (int, str)):
+        return answer
+
+    return int(answer)
+
+
+def run_day(
+    day: int,
+    input_path: str,
+    cache: Cache | None = None,
+    cache_min_parse_s: float = 0.1,
+    profile_dir: str | None = None,
+    telemetry_interval_s: float | None = None,
+    progress=None,
+) -> dict:
+    """Import, parse and solve a single day, timing each phase.
+
+    With a cache, cached answers skip the day entirely and parse products that
+    took at least cache_min_parse_s to compute are stored for the next run.
+    With a profile_dir, the parse and part phases are also profiled (see
+    profiling.py) and the output files are written there. With a
+    telemetry_interval_s, their counters are sampled (see telemetry.py).
+    With a progress callback, progress(phase, phases) is called when a parse or
+    part phase starts and with phase None when it ends, phases being the ones
+    measured so far (see run_days).
+    """
+    result = {"day": day, "input": input_path, "status": "ok", "answers": {}, "phases": {}}
+    phases = result["phases"]
+
+    @contextlib.contextmanager
+    def phase(name: str):
+        if progress is not None:
+            progress(name, phases)
+        with measure(phases, name), contextlib.ExitStack() as stack:
+            if profile_dir is not None:
+                profiles = result.setdefault("profiles", {})
+                path_prefix = os.path.join(profile_dir, f"day{day}-{name}")
+                stack.enter_context(profiling.profile(profiles, name, path_prefix))
+            if telemetry_interval_s is not None:
+                recordings = result.setdefault("telemetry", {})
+                stack.enter_context(telemetry.recording(recordings, name, telemetry_interval_s))
+
+            yield
+
+        if progress is not None:
+            progress(None, phases)
+
+    try:
+        with measure(phases, "import"):
+            module = importlib.import_module(f"day{day}")
+
+        if cache is not None:
+            with open(input_path) as f:
+                input_text = f.read()
+
+            answers = cache.get_answers(day, input_text)
+            if answers is not MISS:
+                result["cached"] = "answers"
+                result["answers"] = {
+                    part: answer for part, answer in zip(PARTS, answers) if hasattr(module, part)
+                }
+                return result
+
+        with phase("parse"):
+            parsed = cache.get_parsed(day, input_text) if cache is not None else MISS
+            if parsed is MISS:
+                if getattr(module, "STREAM_INPUT", False):
+                    parsed = module.parse(utils.stream_lines(input_path))
+                else:
+                    parsed = module.parse(utils.read_puzzle_input(input_path))
+            else:
+                result["cached"] = "parsed"
+
+        if cache is not None and "cached" not in result:
+            if phases["parse"]["wall_s"] >= cache_min_parse_s:
+                cache.put_parsed(day, input_text, parsed)
+
+        for part in PARTS:
+            solver = getattr(module, part, None)
+            if solver is None:
+                continue
+
+            with phase(part):
+                answer = solver(parsed)
+            result["answers"][part] = to_json_answer(answer)
+
+        if cache is not None:
+            cache.put_answers(day, input_text, tuple(result["answers"].get(p) for p in PARTS))
+    except FileNotFoundError as e:
+        result["status"] = "missing"
+        result["error"] = str(e)
+    except MemoryError:
+        result["status"] = "oom"
+        result["error"] = "MemoryError"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = "".join(traceback.format_exception_only(e)).strip()
+        result["traceback"] = traceback.format_exc()
+    finally:
+        if cache is not None:
+            result["cache_stats"] = dict(cache.stats)
+
+    return result
+
+
+def expected_durations(history_path: str) -> dict[int, float]:
+    """Total wall time per day in a previous report, for scheduling."""
+    with open(history_path) as f:
+        history = json.load(f)
+
+    return {
+        result["day"]: sum(phase["wall_s"] for phase in result["phases"].values())
+        for result in history["days"]
+        if result["status"] == "ok"
+    }
+
+
+def run_days(
+    days: list[int],
+    input_pattern: str,
+    jobs: int = 1,
+    expected: dict[int, float] | None = None,
+    budgets: Budgets | None = None,
+    **run_day_kwargs,
+) -> list[dict]:
+    """Run the days on up to jobs processes at a time, each day in a fresh process.
+
+    Days are started longest-expected first (days without history count as
+    longest), the results are returned in the order of days. The days report
+    their phases back, so with budgets a day can be killed as soon as it or
+    its current phase goes over budget (see budgets.py). A day whose process
+    dies without a result, e.g. from a segfault or the OOM killer, is recorded
+    as "crashed" or "oom" with the phases it finished, like a killed one.
+    """
+    expected = expected or {}
+    schedule = sorted(days, key=lambda day: expected.get(day, math.inf), reverse=True)
+
+    results = {}
+    running = {}
+    while schedule or running:
+        while schedule and len(running) < jobs:
+            day = schedule.pop(0)
+            running[day] = DayProcess(day, input_pattern.format(day=day), budgets, run_day_kwargs)
+
+        wait([p.conn for p in running.values()] + [p.process.sentinel for p in running.values()], CHECK_INTERVAL_S)
+        for day, day_process in list(running.items()):
+            result = day_process.poll()
+            if result is not None:
+                results[day] = result
+                del running[day]
+
+    return [results[day] for day in days]
+
+
+class DayProcess:
+    """A day solved by run_day in a process of its own, which reports its phases through a pipe."""
+
+    def __init__(self, day: int, input_path: str, budgets: Budgets | None, run_day_kwargs: dict):
+        self.day = day
+        self.input_path = input_path
+        self.phases = {}
+        self.result = None
+        self.conn, child_conn = multiprocessing.Pipe(duplex=False)
+        self.process = multiprocessing.Process(
+            target=run_day_in_process, args=(child_conn, day, input_path, run_day_kwargs), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.watchdog = Watchdog(day, budgets, self.process.pid) if budgets is not None else None
+
+    def receive(self):
+        try:
+            while self.result is None and self.conn.poll():
+                kind, *message = self.conn.recv()
+                if kind == "result":
+                    self.result = message[0]
+                else:
+                    phase, self.phases = message
+                    if self.watchdog is not None:
+                        self.watchdog.phase(phase)
+        except (EOFError, OSError):
+            pass
+
+    def poll(self) -> dict | None:
+        """The day's result once it's done, None while it's still running."""
+        self.receive()
+        if self.result is None and not self.process.is_alive():
+            # Messages sent right before the process ended are still in the pipe.
+            self.receive()
+            if self.result is None:
+                self.result = self.failed(*self.exit_status())
+        elif self.result is None and self.watchdog is not None:
+            exceeded = self.watchdog.exceeded()
+            if exceeded is not None:
+                self.process.kill()
+                self.result = self.failed(exceeded.status, str(exceeded))
+
+        if self.result is None:
+            return None
+
+        self.process.join()
+        self.conn.close()
+        return self.result
+
+    def exit_status(self) -> tuple[str, str]:
+        code = self.process.exitcode
+        if code is not None and code < 0:
+            name = signal.Signals(-code).name
+            # Nothing but the kernel kills a day with SIGKILL, most likely for memory.
+            if -code == signal.SIGKILL:
+                return "oom", f"process was killed by {name}, most likely by the OOM killer"
+            return "crashed", f"process was killed by {name}"
+
+        return "crashed", f"process exited with code {code} without a result"
+
+    def failed(self, status: str, error: str) -> dict:
+        return {
+            "day": self.day,
+            "input": self.input_path,
+            "status": status,
+            "error": error,
+            "answers": {},
+            "phases": self.phases,
+        }
+
+
+def run_day_in_process(conn, day: int, input_path: str, run_day_kwargs: dict):
+    def progress(phase: str | None, phases: dict):
+        conn.send(("phase", phase, phases))
+
+    conn.send(("result", run_day(day, input_path, progress=progress, **run_day_kwargs)))
+    conn.close()
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, int, int, str]]:
+    """Parse -X importtime lines into (depth, self_us, cumulative_us, module)."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((depth, int(self_us), int(cumulative_us), name.strip()))
+
+    return imports
+
+
+def import_profile(day: int, top: int = 5) -> dict:
+    """Import a day in a fresh interpreter and report what its imports cost."""
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+
+    def run_python(code: str) -> tuple[float, str]:
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=src_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return time.perf_counter() - start, proc.stderr
+
+    bare_startup_s, _ = run_python("pass")
+    startup_s, stderr = run_python(f"import day{day}")
+
+    imports = parse_importtime(stderr)
+    day_idx = next(idx for idx, i in enumerate(imports) if i[3] == f"day{day}")
+    day_depth = imports[day_idx][0]
+
+    # Nested imports are printed before the module that imports them, so the
+    # day's subtree is the run of deeper lines right before the day itself.
+    subtree_start = day_idx
+    while subtree_start > 0 and imports[subtree_start - 1][0] > day_depth:
+        subtree_start -= 1
+
+    direct = [i for i in imports[subtree_start:day_idx] if i[0] == day_depth + 1]
+    heaviest = sorted(direct, key=lambda i: i[2], reverse=True)[:top]
+
+    return {
+        "day": day,
+        "import_ms": imports[day_idx][2] / 1000,
+        "startup_s": startup_s,
+        "bare_startup_s": bare_startup_s,
+        "heaviest_imports": [
+            {"module": name, "cumulative_ms": cumulative_us / 1000}
+            for _, _, cumulative_us, name in heaviest
+        ],
+    }
+
+
+def print_import_profile(profiles: list[dict], budget_ms: float | None):
+    print(f"{'day':>3} {'import [ms]':>11} {'startup [s]':>11}  heaviest imports")
+    for profile in profiles:
+        heaviest = ", ".join(
+            f"{i['module']} ({i['cumulative_ms']:.1f})" for i in profile["heaviest_imports"]
+        )
+        over = "  OVER BUDGET" if profile.get("over_budget") else ""
+        print(
+            f"{profile['day']:>3} {profile['import_ms']:>11.1f} {profile['startup_s']:>11.3f}"
+            f"  {heaviest}{over}"
+        )
+
+    if budget_ms is not None:
+        print(f"Import budget: {budget_ms}ms per day")
+
+
+def make_report(results: list[dict], **run_info) -> dict:
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        **run_info,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "days": results,
+    }
+
+
+def print_summary(results: list[dict]):
+    print(f"{'day':>3} {'phase':<6} {'wall [s]':>9} {'cpu [s]':>9} {'peak RSS [MB]':>13}  answer")
+    for result in results:
+        if result["status"] != "ok":
+            print(f"{result['day']:>3} {result['status']}: {result.get('error', '')}")
+            continue
+
+        if result.get("cached") == "answers":
+            print(f"{result['day']:>3} cached answers: {result['answers']}")
+            continue
+
+        for phase, stats in result["phases"].items():
+            answer = result["answers"].get(phase, "")
+            print(
+                f"{result['day']:>3} {phase:<6} {stats['wall_s']:>9.3f} {stats['cpu_s']:>9.3f}"
+                f" {stats['peak_rss_kb'] / 1024:>13.1f}  {answer}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("days", nargs="?", default="1-25", help="e.g. 1-25 or 5,12,17")
+    parser.add_argument(
+        "--input-pattern",
+        default="inputs/input{day}.txt",
+        help="input file path, {day} is replaced by the day number",
+    )
+    parser.add_argument("--report", default="report.json", help="JSON report output path")
+    parser.add_argument("--jobs", type=int, default=1, help="number of days to run concurrently")
+    parser.add_argument(
+        "--history",
+        help="previous report to schedule the slowest days first (default: --report, if it exists)",
+    )
+    parser.add_argument("--cache", help="directory to cache answers and parse products in")
+    parser.add_argument("--cache-size", type=int, default=1024, help="cache size limit in MB")
+    parser.add_argument(
+        "--cache-min-parse",
+        type=float,
+        default=0.1,
+        help="only cache parse products that took at least this many seconds",
+    )
+    parser.add_argument(
+        "--import-profile",
+        action="store_true",
+        help="only report the import cost of each day (with -X importtime)",
+    )
+    parser.add_argument(
+        "--import-budget-ms",
+        type=float,
+        help="with --import-profile, exit with an error if a day's imports take longer",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="profile every phase, output goes to a directory next to the report",
+    )
+    parser.add_argument(
+        "--telemetry",
+        type=float,
+        nargs="?",
+        const=1.0,
+        metavar="INTERVAL",
+        help="sample the solutions' progress counters every INTERVAL seconds (default 1)",
+    )
+    parser.add_argument("--time-budget", type=float, help="stop a day after this many seconds")
+    parser.add_argument("--memory-budget", type=float, help="stop a day when its RSS goes over this many MB")
+    parser.add_argument("--part-time-budget", type=float, help="stop a parse or part phase after this many seconds")
+    parser.add_argument("--part-memory-budget", type=float, help="stop a parse or part phase over this many MB RSS")
+    parser.add_argument(
+        "--budget",
+        action="append",
+        default=[],
+        metavar="DAY[:PHASE]=LIMIT",
+        help="budget of a single day or phase, e.g. 23:part2=30s or 21=1024mb (repeatable)",
+    )
+    parser.add_argument(
+        "--pure-python",
+        action="store_true",
+        help="take the days' dependency-free code paths, as under PyPy",
+    )
+    args = parser.parse_args()
+
+    if args.pure_python:
+        utils.use_pure_python()
+
+    if args.import_profile:
+        profiles = [import_profile(day) for day in parse_days(args.days)]
+        if args.import_budget_ms is not None:
+            for profile in profiles:
+                profile["over_budget"] = profile["import_ms"] > args.import_budget_ms
+        print_import_profile(profiles, args.import_budget_ms)
+
+        with open(args.report, "w") as f:
+            json.dump(make_report([], import_budget_ms=args.import_budget_ms, import_profile=profiles), f, indent=2)
+
+        if any(profile.get("over_budget") for profile in profiles):
+            sys.exit(1)
+        return
+
+    history_path = args.history or args.report
+    expected = expected_durations(history_path) if os.path.exists(history_path) else {}
+    cache = Cache(args.cache, max_bytes=args.cache_size * 1024 * 1024) if args.cache else None
+    profile_dir = os.path.splitext(args.report)[0] + "-profiles" if args.profile else None
+
+    budgets = Budgets(
+        day=Budget(wall_s=args.time_budget, rss_mb=args.memory_budget),
+        phase=Budget(wall_s=args.part_time_budget, rss_mb=args.part_memory_budget),
+    )
+    for spec in args.budget:
+        budgets.add_override(spec)
+    if not (budgets.day or budgets.phase or budgets.overrides):
+        budgets = None
+    elif not rss_enforceable():
+        print("RSS budgets can't be enforced on this platform and are ignored", file=sys.stderr)
+
+    start = time.perf_counter()
+    results = run_days(
+        parse_days(args.days),
+        args.input_pattern,
+        args.jobs,
+        expected,
+        budgets,
+        cache=cache,
+        cache_min_parse_s=args.cache_min_parse,
+        profile_dir=profile_dir,
+        telemetry_interval_s=args.telemetry,
+    )
+    total_wall_s = time.perf_counter() - start
+    print_summary(results)
+    print(f"Total wall time with {args.jobs} job(s): {total_wall_s:.3f}s")
+
+    run_info = {"jobs": args.jobs, "total_wall_s": total_wall_s, "pure_python": utils.PURE_PYTHON}
+    if args.telemetry is not None:
+        run_info["telemetry_interval_s"] = args.telemetry
+    if budgets is not None:
+        run_info["budgets"] = {
+            "day": {"wall_s": args.time_budget, "rss_mb": args.memory_budget},
+            "phase": {"wall_s": args.part_time_budget, "rss_mb": args.part_memory_budget},
+            "overrides": args.budget,
+        }
+    if profile_dir is not None:
+        run_info["profile_dir"] = profile_dir
+        print(f"Profiles written to {profile_dir}")
+    if cache is not None:
+        cache_stats = sum((Counter(r.get("cache_stats", {})) for r in results), Counter())
+        run_info["cache_stats"] = dict(cache_stats)
+        print(f"Cache: {dict(cache_stats)}")
+
+    with open(args.report, "w") as f:
+        json.dump(make_report(results, **run_info), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Keep the day modules loaded and solve a stream of inputs back to back.
+
+Starting a fresh interpreter (and importing numpy, sympy and shapely) for every
+input dominates the cost of batch jobs with many small inputs. The service
+imports each day once and then answers requests, one JSON object per line:
+
+    {"day": 5, "input": "seeds: 79 14 55 13\\n..."}   or   {"day": 5, "path": "inputs/input5.txt"}
+
+Every response is a JSON line with the answers (or an error) and the solve time.
+An optional "id" in a request is echoed back. Requests are read from stdin,
+or from clients of a unix socket. With --cache, answers for inputs that were
+already solved are taken from the disk cache (see cache.py).
+
+    python src/service.py --preload 1-25 < requests.jsonl
+    python src/service.py --socket /tmp/aoc.sock --cache .cache
+"""
+import argparse
+import importlib
+import json
+import os
+import socket
+import sys
+import time
+
+from cache import MISS, Cache
+from runner import parse_days, to_json_answer
+
+
+def handle_request(request: dict, cache: Cache | None = None) -> dict:
+    response = {"id": request["id"]} if "id" in request else {}
+    try:
+        day = int(request["day"])
+        response["day"] = day
+
+        if "input" in request:
+            input_text = request["input"]
+        else:
+            with open(request["path"]) as f:
+                input_text = f.read()
+
+        module = importlib.import_module(f"day{day}")
+
+        start = time.perf_counter()
+        answers = cache.get_answers(day, input_text) if cache is not None else MISS
+        if answers is MISS:
+            answers = tuple(map(to_json_answer, module.solve(input_text)))
+            if cache is not None:
+                cache.put_answers(day, input_text, answers)
+        else:
+            response["cached"] = True
+        response["seconds"] = time.perf_counter() - start
+
+        response["part1"], response["part2"] = answers
+    except Exception as e:
+        response["error"] = f"{type(e).__name__}: {e}"
+
+    return response
+
+
+def handle_line(line: str, cache: Cache | None = None) -> str:
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as e:
+        return json.dumps({"error": f"Invalid request: {e}"})
+
+    return json.dumps(handle_request(request, cache))
+
+
+def serve_stream(reader, writer, cache: Cache | None = None):
+    """Answer requests line by line until the reader is exhausted."""
+    for line in reader:
+        if not line.strip():
+            continue
+
+        writer.write(handle_line(line, cache) + "\n")
+        writer.flush()
+
+
+def serve_socket(socket_path: str, cache: Cache | None = None):
+    """Serve clients of a unix socket one after another, forever."""
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(socket_path)
+        server.listen()
+        try:
+            while True:
+                conn, _ = server.accept()
+                with conn, conn.makefile("r") as reader, conn.makefile("w") as writer:
+                    serve_stream(reader, writer, cache)
+        finally:
+            os.remove(socket_path)
+
+
+def solve_remote(socket_path: str, requests: list[dict]) -> list[dict]:
+    """Client side: send a batch of requests to a running service."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(socket_path)
+        with conn.makefile("r") as reader, conn.makefile("w") as writer:
+            responses = []
+            for request in requests:
+                writer.write(json.dumps(request) + "\n")
+                writer.flush()
+                responses.append(json.loads(reader.readline()))
+
+    return responses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--socket", help="serve on this unix socket instead of stdin")
+    parser.add_argument("--preload", help="days to import up front, e.g. 1-25")
+    parser.add_argument("--cache", help="directory of a disk cache for answers")
+    parser.add_argument("--cache-size", type=int, default=1024, help="cache size limit in MB")
+    args = parser.parse_args()
+
+    cache = Cache(args.cache, max_bytes=args.cache_size * 1024 * 1024) if args.cache else None
+
+    if args.preload:
+        for day in parse_days(args.preload):
+            importlib.import_module(f"day{day}")
+
+    if args.socket:
+        serve_socket(args.socket, cache)
+    else:
+        serve_stream(sys.stdin, sys.stdout, cache)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Counters and gauges for long running loops, sampled into the runner's report.
+
+Solutions report progress with:
+
+- progress(iterable, name): counts the items of a loop under name,
+- count(name, n): adds n to a counter, e.g. states visited,
+- gauge(name, value): records the current value of something, e.g. a queue size.
+
+Nothing is printed. While no recording is active (the default, and always
+when a day runs on its own), progress() hands back the iterable unchanged and
+count() and gauge() return after a single check, so they can stay in hot
+loops. While recording, a background thread takes a sample of all counters
+and gauges every interval, with the rate of each counter since the previous
+sample, and the samples go into the report of the phase.
+"""
+import contextlib
+import threading
+import time
+from collections import defaultdict
+from typing import Iterable, Iterator
+
+# Only set while recording.
+_counters = None
+_gauges = None
+
+
+def count(name: str, n: int = 1):
+    if _counters is not None:
+        _counters[name] += n
+
+
+def gauge(name: str, value: float):
+    if _gauges is not None:
+        _gauges[name] = value
+
+
+def progress(iterable: Iterable, name: str) -> Iterable:
+    """Count the items of iterable under name, if recording."""
+    if _counters is None:
+        return iterable
+
+    if hasattr(iterable, "__len__"):
+        gauge(f"{name}_total", len(iterable))
+
+    return _counted(iterable, name, _counters)
+
+
+def _counted(iterable: Iterable, name: str, counters: dict) -> Iterator:
+    for item in iterable:
+        counters[name] += 1
+        yield item
+
+
+def _sample(counters: dict, gauges: dict, start: float, previous: dict | None) -> dict:
+    now = time.perf_counter()
+    sample = {"t_s": now - start, "counters": dict(counters), "gauges": dict(gauges)}
+    if previous is not None and now - start > previous["t_s"]:
+        dt = now - start - previous["t_s"]
+        sample["rates_per_s"] = {
+            name: (value - previous["counters"].get(name, 0)) / dt
+            for name, value in sample["counters"].items()
+        }
+
+    return sample
+
+
+@contextlib.contextmanager
+def recording(report: dict, name: str, interval_s: float = 1.0):
+    """Record counters and gauges of the wrapped block into report[name].
+
+    Writes the final counters and gauges, the average rate of each counter
+    and the samples taken every interval_s.
+    """
+    global _counters, _gauges
+    counters, gauges = defaultdict(int), {}
+    samples = []
+    start = time.perf_counter()
+    stop = threading.Event()
+
+    def sampler():
+        while not stop.wait(interval_s):
+            samples.append(_sample(counters, gauges, start, samples[-1] if samples else None))
+
+    thread = threading.Thread(target=sampler, name="telemetry", daemon=True)
+    _counters, _gauges = counters, gauges
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+        _counters = _gauges = None
+
+        final = _sample(counters, gauges, start, None)
+        report[name] = {
+            "counters": final["counters"],
+            "gauges": final["gauges"],
+            "rates_per_s": {
+                counter: value / final["t_s"] if final["t_s"] > 0 else 0.0
+                for counter, value in final["counters"].items()
+            },
+            "interval_s": interval_s,
+            "samples": samples,
+        }
@@ -0,0 +1,233 @@
+import contextlib
+import itertools
+import mmap
+import os
+import platform
+import re
+from typing import Iterable, Iterator
+
+# Under PyPy, the days take their dependency-free code paths, which the JIT
+# speeds up, instead of calling into numpy, sympy or shapely. Set
+# AOC_PURE_PYTHON=1 (or call use_pure_python()) to take them on CPython too.
+PURE_PYTHON = platform.python_implementation() == "PyPy" or os.environ.get("AOC_PURE_PYTHON") == "1"
+
+
+def use_pure_python():
+    """Take the pure-Python paths from now on, also in child processes."""
+    global PURE_PYTHON
+    PURE_PYTHON = True
+    os.environ["AOC_PURE_PYTHON"] = "1"
+
+
+def __getattr__(name: str):
+    # The helpers are only imported when they're used, so days that don't
+    # need them (or numpy, for Grid) don't pay for importing them.
+    if name == "Grid":
+        from utils.grid import Grid
+
+        return Grid
+    if name == "IntervalSet":
+        # Days 5 and 19 only ever hold a handful of intervals, where a plain
+        # list is several times faster than calls into numpy.
+        from utils.intervals import IntervalSet
+
+        return IntervalSet
+
+    raise AttributeError(f"module 'utils' has no attribute '{name}'")
+
+
+def sections(lines: Iterable, sep="") -> Iterator:
+    """Lazily split lines at each separator line, in a single pass.
+
+    - Lists (and other sequences with index()) yield slices of the list.
+    - Buffers (bytes, mmap, memoryview) of raw text are split at blank lines and
+      yield memoryviews into the buffer, so nothing is copied. sep is ignored.
+    - Any other iterable, e.g. stream_lines(), yields lists of its lines.
+
+    There is always one more section than separators, e.g. a trailing
+    separator yields an empty last section.
+    """
+    if isinstance(lines, (bytes, bytearray, memoryview, mmap.mmap)):
+        yield from _buffer_sections(lines)
+    elif hasattr(lines, "index") and hasattr(lines, "__getitem__"):
+        start = 0
+        while True:
+            try:
+                end = lines.index(sep, start)
+            except ValueError:
+                break
+
+            yield lines[start:end]
+            start = end + 1
+
+        yield lines[start:]
+    else:
+        section = []
+        for line in lines:
+            if line == sep:
+                yield section
+                section = []
+            else:
+                section.append(line)
+
+        yield section
+
+
+def _buffer_sections(buffer) -> Iterator[memoryview]:
+    view = memoryview(buffer)
+    section_start = line_start = 0
+    size = len(buffer)
+    while line_start < size:
+        line_end = buffer.find(b"\n", line_start)
+        if line_end == -1:
+            line_end = size
+
+        if not buffer[line_start:line_end].strip():
+            yield view[section_start : max(section_start, line_start - 1)]
+            section_start = line_end + 1
+
+        line_start = line_end + 1
+
+    # Like the line based splitting, the last section ends at the last line break.
+    last_end = size - 1 if buffer[size - 1 : size] == b"\n" else size
+    yield view[section_start : max(section_start, last_end)]
+
+
+def split_list_at(l: list, pat: str) -> list[list]:
+    return list(sections(l, pat))
+
+def read_puzzle_input(input_path: str) -> list[str]:
+    with open(input_path) as f:
+        return [l.strip() for l in f]
+
+@contextlib.contextmanager
+def mapped_input(input_path: str) -> Iterator[bytes | mmap.mmap]:
+    """Bulk mode: the whole file as one read-only memory map.
+
+    Supports slicing, find() and bytes regexes without reading the file into
+    memory. Wrap it in a memoryview for zero-copy slices, but release those
+    before the block ends, the map can't be closed while they exist.
+    """
+    with open(input_path, "rb") as f:
+        # Empty files can't be mapped.
+        if f.seek(0, 2) == 0:
+            yield b""
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+def stream_lines(input_path: str, encoding: str | None = "utf-8") -> Iterator[str | bytes]:
+    """Lazily yield the stripped lines of a file, like read_puzzle_input.
+
+    Only one line is copied out of the memory map at a time, so memory use
+    doesn't grow with the file. With encoding=None, lines are yielded as bytes.
+    """
+    with mapped_input(input_path) as buffer:
+        start, size = 0, len(buffer)
+        while start < size:
+            end = buffer.find(b"\n", start)
+            if end == -1:
+                end = size
+
+            line = buffer[start:end].strip()
+            yield line if encoding is None else line.decode(encoding)
+            start = end + 1
+
+def stream_sections(input_path: str, encoding: str | None = "utf-8") -> Iterator[list[str | bytes]]:
+    """Lazily yield the blank-line separated sections of a file, like split_list_at."""
+    separator = b"" if encoding is None else ""
+    return sections(stream_lines(input_path, encoding), separator)
+
+def puzzle_lines(input_text: str) -> list[str]:
+    """Same as read_puzzle_input, but for input that is already in memory."""
+    return [l.strip() for l in input_text.splitlines()]
+
+
+def nums(line: str) -> list[int]:
+    return [int(n) for n in re.findall(r"(-*\d+)", line)]
+
+def scan_nums(buffer):
+    """Find all numbers in a buffer in one vectorized pass, like nums does per line.
+
+    Returns the numbers as an int64 array, the line each one is on and the
+    number of lines. A "-" right before a number makes it negative, and two
+    of them are an error, the same as int() on a match of nums' pattern.
+    """
+    import numpy as np
+
+    if isinstance(buffer, str):
+        buffer = buffer.encode()
+    chars = np.frombuffer(buffer, dtype=np.uint8)
+    newlines = np.flatnonzero(chars == ord("\n"))
+    line_count = len(newlines) + int(len(chars) > 0 and chars[-1] != ord("\n"))
+
+    is_digit = (chars >= ord("0")) & (chars <= ord("9"))
+    starts = np.flatnonzero(is_digit & ~np.r_[False, is_digit[:-1]])
+    ends = np.flatnonzero(is_digit & ~np.r_[is_digit[1:], False])
+    lengths = ends - starts + 1
+    if len(starts) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), line_count
+    if lengths.max() > 18:
+        raise ValueError("Numbers with more than 18 digits don't fit in int64")
+
+    # Weigh every digit by its place in the number and add up each number.
+    digit_pos = np.flatnonzero(is_digit)
+    place = np.repeat(ends, lengths) - digit_pos
+    weighted = (chars[digit_pos] - ord("0")).astype(np.int64) * 10 ** place.astype(np.int64)
+    values = np.add.reduceat(weighted, np.r_[0, np.cumsum(lengths)[:-1]])
+
+    negative = np.zeros(len(starts), dtype=bool)
+    negative[starts > 0] = chars[starts[starts > 0] - 1] == ord("-")
+    if np.any(negative[starts > 1] & (chars[starts[starts > 1] - 2] == ord("-"))):
+        raise ValueError("Invalid number with more than one minus sign")
+    values[negative] *= -1
+
+    return values, np.searchsorted(newlines, starts), line_count
+
+def nums_by_line(source, padded: bool = False, fill: int = 0, chunk_lines: int = 1 << 16):
+    """The numbers of every line as int64 arrays, like map(nums, lines).
+
+    The source is either a buffer (str, bytes, mmap, memoryview) or an
+    iterable of lines, which is parsed in chunks of chunk_lines, so streamed
+    input stays streamed. Returns a list of arrays, one per line, or with
+    padded=True a 2D array whose short rows are filled up with fill.
+    """
+    import numpy as np
+
+    if isinstance(source, (str, bytes, bytearray, memoryview, mmap.mmap)):
+        chunks = [scan_nums(source)]
+    else:
+        lines = iter(source)
+        chunks = []
+        while chunk := list(itertools.islice(lines, chunk_lines)):
+            chunks.append(scan_nums("\n".join(chunk) + "\n"))
+
+    # Numbers per line, from which line each number is on.
+    values = np.concatenate([np.zeros(0, dtype=np.int64)] + [v for v, _, _ in chunks])
+    counts = np.concatenate(
+        [np.zeros(0, dtype=np.int64)]
+        + [np.bincount(line_ids, minlength=line_count) for _, line_ids, line_count in chunks]
+    )
+
+    if not padded:
+        return np.split(values, np.cumsum(counts)[:-1]) if len(counts) else []
+
+    width = counts.max() if len(counts) else 0
+    rows = np.full((len(counts), width), fill, dtype=np.int64)
+    rows[np.arange(width) < counts[:, None]] = values
+    return rows
+
+def int_rows(lines: Iterable[str]) -> list[list[int]]:
+    """The numbers of every line as lists of ints, vectorized unless PURE_PYTHON."""
+    if PURE_PYTHON:
+        return [nums(line) for line in lines]
+
+    return [row.tolist() for row in nums_by_line(lines)]
+
+def input_dim(inp: list[str]) -> tuple[int, int]:
+    """Return (height, width) of a 2D input."""
+    return len(inp), len(inp[0])
+
+def transpose(l: list[list]) -> list[list]:
+    return list(map(list, zip(*l)))
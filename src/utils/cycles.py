@@ -0,0 +1,187 @@
+"""Find where repeated application of a step function starts to cycle.
+
+Iterating state = step(state) from a start state in a finite state space ends
+up in a cycle: after `prefix` steps, the states repeat every `length` steps.
+That makes the state (or anything derived from it) at a huge step count cheap:
+it's the one at index(step).
+
+- find_cycle() keeps a hash table of state keys, visiting every state once.
+  It can record a value per state on the way, so the states themselves don't
+  have to be kept around.
+- brent() only keeps two states, at the cost of stepping about twice as often.
+  Use it when even the keys are too big to store, and state_at() to replay.
+
+States can be mutated in place by step, as long as key() gives something
+hashable (and compact, e.g. bytes) that identifies the state.
+
+For events that happen periodically after different prefixes, e.g. several
+walkers each reaching an end node on their own cycle, first_common_step()
+finds the first step at which they all happen, combining the cycles with the
+Chinese remainder theorem (crt()).
+"""
+import itertools
+import math
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Iterable
+
+
+@dataclass
+class Cycle:
+    prefix: int  # Steps before the first state of the cycle is reached.
+    length: int
+    values: list = field(default_factory=list)  # Per step, up to prefix + length.
+
+    def index(self, step: int) -> int:
+        """The step in 0..prefix+length-1 with the same state as step."""
+        if step < self.prefix:
+            return step
+
+        return self.prefix + (step - self.prefix) % self.length
+
+    def value_at(self, step: int) -> Any:
+        return self.values[self.index(step)]
+
+    def occurs(self, steps: set[int], step: int) -> bool:
+        """Whether step has one of the states of steps (given as steps within the first cycle)."""
+        return self.index(step) in steps
+
+
+def _identity(state):
+    return state
+
+
+def find_cycle(
+    step: Callable,
+    start: Any,
+    key: Callable[[Any], Hashable] = _identity,
+    value: Callable[[Any], Any] | None = None,
+) -> Cycle:
+    """Step from start until a state repeats, remembering the key of every state."""
+    seen = {}
+    values = []
+    state = start
+    for i in itertools.count():
+        state_key = key(state)
+        if state_key in seen:
+            return Cycle(prefix=seen[state_key], length=i - seen[state_key], values=values)
+
+        seen[state_key] = i
+        if value is not None:
+            values.append(value(state))
+        state = step(state)
+
+
+def brent(step: Callable, start: Any, key: Callable[[Any], Hashable] = _identity) -> Cycle:
+    """Brent's cycle detection, which only compares keys and never stores more than two.
+
+    step must not mutate its argument here, since states are kept across steps.
+    """
+    # Find the cycle length: the hare moves ahead in powers of two, the
+    # tortoise waits at the start of each power until the hare meets it.
+    power = length = 1
+    tortoise, hare = start, step(start)
+    while key(tortoise) != key(hare):
+        if power == length:
+            tortoise = hare
+            power *= 2
+            length = 0
+
+        hare = step(hare)
+        length += 1
+
+    # With the hare `length` steps ahead, both meet at the start of the cycle.
+    tortoise = hare = start
+    for _ in range(length):
+        hare = step(hare)
+
+    prefix = 0
+    while key(tortoise) != key(hare):
+        tortoise, hare = step(tortoise), step(hare)
+        prefix += 1
+
+    return Cycle(prefix=prefix, length=length)
+
+
+def state_at(step: Callable, start: Any, n: int, cycle: Cycle) -> Any:
+    """The state after n steps, by replaying at most prefix + length steps."""
+    state = start
+    for _ in range(cycle.index(n)):
+        state = step(state)
+
+    return state
+
+
+def crt(congruences: Iterable[tuple[int, int]]) -> tuple[int, int] | None:
+    """Solve x = r_i (mod m_i) for all (r_i, m_i), the moduli don't need to be coprime.
+
+    Returns the solution as (residue, modulus), or None if there is none.
+    """
+    residue, modulus = 0, 1
+    for r, m in congruences:
+        # Find x = residue + modulus * k with x = r (mod m).
+        g = math.gcd(modulus, m)
+        if (r - residue) % g != 0:
+            return None
+
+        k = (r - residue) // g * pow(modulus // g, -1, m // g) % (m // g)
+        residue += modulus * k
+        modulus = modulus * m // g
+        residue %= modulus
+
+    return residue, modulus
+
+
+def first_common_step(schedules: list[tuple[set[int], Cycle]]) -> int | None:
+    """The first step at which an event happens in all schedules, if ever.
+
+    Each schedule is the set of steps in its first prefix + length steps at
+    which the event happens, and the Cycle of the states that caused it.
+
+    The first schedule's later occurrences don't come in sorted order, so an
+    early one of them can still be the answer:
+
+    >>> first_common_step([({5, 8}, Cycle(0, 10)), ({8, 15}, Cycle(30, 100))])
+    8
+    """
+    # Before the last prefix ends, some schedules aren't periodic yet, so go
+    # through the occurrences of the first schedule one by one.
+    bound = max(cycle.prefix for _, cycle in schedules)
+    steps, cycle = schedules[0]
+    candidates = (
+        s
+        for first in steps
+        for s in (range(first, bound, cycle.length) if first >= cycle.prefix else [first])
+    )
+    early = [s for s in candidates if s < bound and all(c.occurs(other, s) for other, c in schedules)]
+    if early:
+        return min(early)
+
+    # From the bound on, every schedule repeats, so every combination of one
+    # periodic occurrence per schedule is a system of congruences.
+    occurrences = [_periodic_residues(steps, cycle) for steps, cycle in schedules]
+    best = None
+    for congruences in itertools.product(*occurrences):
+        solution = crt(congruences)
+        if solution is None:
+            continue
+
+        residue, modulus = solution
+        s = bound + (residue - bound) % modulus
+        best = s if best is None else min(best, s)
+
+    return best
+
+
+def _periodic_residues(steps: set[int], cycle: Cycle) -> list[tuple[int, int]]:
+    """The periodic occurrences as congruences, with the smallest period they have.
+
+    An event can repeat more often than the states do, e.g. every 7 steps in
+    a cycle of 7 * 263 states. Using the shorter period keeps the number of
+    combinations to try down.
+    """
+    offsets = {s - cycle.prefix for s in steps if s >= cycle.prefix}
+    for period in range(1, cycle.length + 1):
+        if cycle.length % period == 0 and all((o + period) % cycle.length in offsets for o in offsets):
+            break
+
+    return sorted({((o + cycle.prefix) % period, period) for o in offsets})
@@ -0,0 +1,143 @@
+"""A compact, immutable graph in compressed sparse row (CSR) form.
+
+The edges of node n are targets[offsets[n]:offsets[n + 1]], with the matching
+weights at the same positions. All three are flat arrays of machine ints, so a
+graph costs a few bytes per edge instead of a dict entry per node and a tuple
+per edge, and walking it is plain array indexing.
+
+Node labels (strings, coordinate tuples, ...) are interned to the ids
+0..num_nodes-1 while building, in the order they first appear, and can be
+looked up in both directions with id() and label().
+"""
+from array import array
+from typing import Hashable, Iterable, Iterator
+
+
+class Interner:
+    """Hand out consecutive ids for hashable labels."""
+
+    def __init__(self, labels: Iterable[Hashable] = ()):
+        self.ids = {}
+        self.labels = []
+        for label in labels:
+            self(label)
+
+    def __call__(self, label: Hashable) -> int:
+        """The id of label, a new one if it wasn't seen before."""
+        node = self.ids.get(label)
+        if node is None:
+            node = self.ids[label] = len(self.labels)
+            self.labels.append(label)
+
+        return node
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+class CSRGraph:
+    def __init__(self, offsets: array, targets: array, weights: array, labels: list | None = None):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        # Without labels, the node ids are the labels.
+        self.labels = labels
+        self._ids = None
+
+    @classmethod
+    def from_edges(
+        cls,
+        edges: Iterable[tuple[Hashable, Hashable] | tuple[Hashable, Hashable, int]],
+        nodes: Iterable[Hashable] = (),
+        num_nodes: int | None = None,
+    ) -> "CSRGraph":
+        """Build a graph from (source, target) or (source, target, weight) edges.
+
+        Edges without a weight get weight 1. The edges of each node keep their
+        order from the input. Labels are interned, with the given nodes first
+        (e.g. to include nodes without edges, or to fix their ids). With
+        num_nodes, the labels are already ids in range(num_nodes) and are used
+        as they are.
+        """
+        interner = None if num_nodes is not None else Interner(nodes)
+        intern = int if interner is None else interner
+
+        sources, targets, weights = array("q"), array("q"), array("q")
+        for edge in edges:
+            sources.append(intern(edge[0]))
+            targets.append(intern(edge[1]))
+            weights.append(edge[2] if len(edge) > 2 else 1)
+
+        if interner is not None:
+            num_nodes = len(interner)
+
+        offsets = array("q", [0]) * (num_nodes + 1)
+        for source in sources:
+            offsets[source + 1] += 1
+        for node in range(num_nodes):
+            offsets[node + 1] += offsets[node]
+
+        # Edges that come grouped by source in ascending order are already in
+        # place, otherwise counting sort them by source, keeping their order.
+        if any(a > b for a, b in zip(sources, sources[1:])):
+            positions = offsets[:-1]
+            sorted_targets = array("q", [0]) * len(targets)
+            sorted_weights = array("q", [0]) * len(weights)
+            for source, target, weight in zip(sources, targets, weights):
+                position = positions[source]
+                sorted_targets[position] = target
+                sorted_weights[position] = weight
+                positions[source] = position + 1
+
+            targets, weights = sorted_targets, sorted_weights
+
+        labels = None if interner is None else interner.labels
+        return cls(offsets, targets, weights, labels)
+
+    @classmethod
+    def from_adjacency(cls, adjacency: dict, weights: dict | None = None) -> "CSRGraph":
+        """Build a graph from {node: neighbors} and optional {(node, neighbor): weight}."""
+        edges = (
+            (node, neighbor, 1 if weights is None else weights[node, neighbor])
+            for node, neighbors in adjacency.items()
+            for neighbor in neighbors
+        )
+        return cls.from_edges(edges, nodes=adjacency.keys())
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def id(self, label: Hashable) -> int:
+        if self.labels is None:
+            return label
+
+        if self._ids is None:
+            self._ids = {label: node for node, label in enumerate(self.labels)}
+
+        return self._ids[label]
+
+    def label(self, node: int) -> Hashable:
+        return node if self.labels is None else self.labels[node]
+
+    def degree(self, node: int) -> int:
+        return self.offsets[node + 1] - self.offsets[node]
+
+    def neighbors(self, node: int) -> array:
+        return self.targets[self.offsets[node] : self.offsets[node + 1]]
+
+    def __getitem__(self, node: int) -> Iterator[tuple[int, int]]:
+        """The (neighbor, weight) pairs of node, e.g. for utils.shortest_path."""
+        start, end = self.offsets[node], self.offsets[node + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def __len__(self) -> int:
+        return self.num_nodes
+
+    def __getstate__(self) -> dict:
+        # Don't pickle the lazily built label lookup, e.g. into the runner's cache.
+        return {**self.__dict__, "_ids": None}
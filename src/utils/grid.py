@@ -0,0 +1,114 @@
+"""A character grid in a flat uint8 array.
+
+Cells are addressed by their flat index i * width + j, so walking the grid
+only moves plain ints around instead of allocating an (i, j) tuple per step.
+The neighbor tables map every flat index to the flat indices of its 4 or 8
+neighbors, either bounded by the grid (-1 for neighbors outside of it) or
+wrapping around like a torus.
+
+transpose, rotate and flip return views, they share the cells with the
+original grid and don't copy anything.
+"""
+import numpy as np
+
+# Neighbor directions, clockwise from up. The first four are the 4-neighbors.
+DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1), (-1, 1), (1, 1), (1, -1), (-1, -1)]
+
+
+class Grid:
+    def __init__(self, cells: np.ndarray):
+        assert cells.ndim == 2 and cells.dtype == np.uint8
+        self.cells = cells
+        self._neighbors = {}
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> "Grid":
+        """The cells of a grid loaded like this are read-only, copy() it to modify it."""
+        width = len(lines[0])
+        assert all(len(l) == width for l in lines), "Grid lines have different lengths"
+        buffer = "".join(lines).encode()
+        return cls(np.frombuffer(buffer, dtype=np.uint8).reshape(len(lines), width))
+
+    @classmethod
+    def from_text(cls, text: str) -> "Grid":
+        return cls.from_lines([l.strip() for l in text.splitlines() if l.strip()])
+
+    @property
+    def height(self) -> int:
+        return self.cells.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.cells.shape[1]
+
+    @property
+    def size(self) -> int:
+        return self.cells.size
+
+    @property
+    def flat(self) -> np.ndarray:
+        """The cells by flat index. Views (e.g. transposed) are copied here."""
+        return self.cells.reshape(-1)
+
+    def index(self, i: int, j: int) -> int:
+        return i * self.width + j
+
+    def coords(self, index: int) -> tuple[int, int]:
+        return divmod(index, self.width)
+
+    def find(self, char: str) -> np.ndarray:
+        """Flat indices of all cells with the given character."""
+        return np.flatnonzero(self.flat == ord(char))
+
+    def __getitem__(self, key):
+        return self.cells[key]
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Grid) and np.array_equal(self.cells, other.cells)
+
+    def __hash__(self) -> int:
+        return hash((self.cells.shape, self.cells.tobytes()))
+
+    def lines(self) -> list[str]:
+        return [row.tobytes().decode() for row in self.cells]
+
+    def __str__(self) -> str:
+        return "\n".join(self.lines())
+
+    def neighbors(self, diagonal: bool = False, torus: bool = False) -> np.ndarray:
+        """A (size, 4) table, or (size, 8) with diagonals, of neighbor indices.
+
+        The neighbors are in the order of DIRECTIONS. Without torus, neighbors
+        outside of the grid are -1. Tables are computed once per grid.
+        """
+        key = (diagonal, torus)
+        if key not in self._neighbors:
+            h, w = self.height, self.width
+            i, j = np.divmod(np.arange(h * w), w)
+
+            columns = []
+            for di, dj in DIRECTIONS[: 8 if diagonal else 4]:
+                ni, nj = i + di, j + dj
+                if torus:
+                    columns.append((ni % h) * w + nj % w)
+                else:
+                    inside = (0 <= ni) & (ni < h) & (0 <= nj) & (nj < w)
+                    columns.append(np.where(inside, ni * w + nj, -1))
+
+            self._neighbors[key] = np.stack(columns, axis=1)
+
+        return self._neighbors[key]
+
+    def transpose(self) -> "Grid":
+        return Grid(self.cells.T)
+
+    def rotate(self, k: int = 1) -> "Grid":
+        """Rotate by k times 90 degrees counterclockwise."""
+        return Grid(np.rot90(self.cells, k))
+
+    def flip(self, axis: int) -> "Grid":
+        """Flip upside down (axis=0) or left to right (axis=1)."""
+        return Grid(np.flip(self.cells, axis))
+
+    def copy(self) -> "Grid":
+        return Grid(self.cells.copy())
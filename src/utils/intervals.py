@@ -0,0 +1,124 @@
+"""Sets of integers stored as sorted, disjoint half-open intervals [start, end).
+
+Set operations work on the interval boundaries, so they cost the same for
+[0, 10) as for [0, 10**12).
+"""
+import bisect
+import operator
+from typing import Callable, Iterable, Iterator
+
+
+class IntervalSet:
+    """The intervals are kept in a sorted list of (start, end)."""
+
+    def __init__(self, starts: Iterable[int] = (), ends: Iterable[int] = ()):
+        starts, ends = list(starts), list(ends)
+        assert len(starts) == len(ends), "Need as many starts as ends"
+        self.intervals = intervals = _normalize(zip(starts, ends))
+        self.starts = [s for s, _ in intervals]
+        self.ends = [e for _, e in intervals]
+
+    @classmethod
+    def range(cls, start: int, end: int) -> "IntervalSet":
+        return cls([start], [end])
+
+    @classmethod
+    def from_intervals(cls, intervals: Iterable[tuple[int, int]]) -> "IntervalSet":
+        intervals = list(intervals)
+        return cls([s for s, _ in intervals], [e for _, e in intervals])
+
+    @property
+    def size(self) -> int:
+        return sum(e - s for s, e in self.intervals)
+
+    def min(self) -> int:
+        return self.starts[0]
+
+    def max(self) -> int:
+        return self.ends[-1] - 1
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def __bool__(self) -> bool:
+        return len(self.intervals) > 0
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return iter(self.intervals)
+
+    def __contains__(self, value: int) -> bool:
+        i = bisect.bisect_right(self.ends, value)
+        return i < len(self.starts) and self.starts[i] <= value
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, IntervalSet) and self.intervals == other.intervals
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({self.intervals})"
+
+    def __or__(self, other: "IntervalSet") -> "IntervalSet":
+        return self._combine(other, operator.or_)
+
+    def __and__(self, other: "IntervalSet") -> "IntervalSet":
+        return self._combine(other, operator.and_)
+
+    def __sub__(self, other: "IntervalSet") -> "IntervalSet":
+        return self._combine(other, lambda a, b: a and not b)
+
+    union, intersection, difference = __or__, __and__, __sub__
+
+    def shift(self, offset: int) -> "IntervalSet":
+        return self.from_intervals((s + offset, e + offset) for s, e in self.intervals)
+
+    def split(self, point: int) -> tuple["IntervalSet", "IntervalSet"]:
+        return (
+            self.from_intervals((s, min(e, point)) for s, e in self.intervals if s < point),
+            self.from_intervals((max(s, point), e) for s, e in self.intervals if e > point),
+        )
+
+    def translate(self, domains: Iterable[tuple[int, int]], offsets: Iterable[int]) -> "IntervalSet":
+        domains = sorted(zip(domains, offsets))
+        domain_starts = [start for (start, _), _ in domains]
+
+        # Cut at every domain boundary, then each piece is entirely inside or
+        # outside of one domain, and the last domain starting before it says which.
+        pieces = []
+        for start, end in self._pieces(sorted({p for domain, _ in domains for p in domain})):
+            i = bisect.bisect_right(domain_starts, start) - 1
+            shift = 0
+            if i >= 0:
+                (_, domain_end), offset = domains[i]
+                if start < domain_end:
+                    shift = offset
+            pieces.append((start + shift, end + shift))
+
+        return self.from_intervals(pieces)
+
+    def _pieces(self, points: list[int]) -> list[tuple[int, int]]:
+        pieces = []
+        for start, end in self.intervals:
+            i = bisect.bisect_right(points, start)
+            while i < len(points) and points[i] < end:
+                pieces.append((start, points[i]))
+                start = points[i]
+                i += 1
+            pieces.append((start, end))
+
+        return pieces
+
+    def _combine(self, other: "IntervalSet", keep: Callable[[bool, bool], bool]) -> "IntervalSet":
+        # Segment [a, b) between neighboring boundaries is either in a set or not.
+        points = sorted({p for s, e in self.intervals + other.intervals for p in (s, e)})
+        return self.from_intervals((a, b) for a, b in zip(points, points[1:]) if keep(a in self, a in other))
+
+
+def _normalize(intervals: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Sort intervals and merge the ones that overlap or touch."""
+    merged = []
+    for start, end in sorted((s, e) for s, e in intervals if s < e):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+
+    return merged
@@ -0,0 +1,91 @@
+"""Memoization with a bounded size and scoped lifetimes.
+
+functools.cache keeps every result until the process ends. memoize() keeps at
+most maxsize results and evicts the least recently used one beyond that, and
+scope() drops everything cached within a block, e.g. per line or per part:
+
+    @memoize(maxsize=1024)
+    def count(springs: str, groups: tuple) -> int: ...
+
+    with count.scope():
+        total = sum(count(s, g) for s, g in rows)
+
+Hits, misses, evictions and the current size are available from info(), and
+are reported to telemetry (see telemetry.py) as the counters <name>_hits,
+<name>_misses and <name>_evictions and the gauge <name>_size.
+"""
+import contextlib
+import functools
+from collections import OrderedDict
+from typing import Callable
+
+import telemetry
+
+
+class Memo:
+    def __init__(self, func: Callable, maxsize: int | None, name: str):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.maxsize = maxsize
+        self.cache = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+        self.telemetry_names = tuple(f"{name}_{stat}" for stat in ("hits", "misses", "evictions", "size"))
+
+    def __call__(self, *args):
+        hits_name, misses_name, evictions_name, size_name = self.telemetry_names
+        cache = self.cache
+        if args in cache:
+            self.hits += 1
+            telemetry.count(hits_name)
+            if self.maxsize is not None:
+                cache.move_to_end(args)
+            return cache[args]
+
+        self.misses += 1
+        telemetry.count(misses_name)
+        value = self.func(*args)
+
+        cache[args] = value
+        if self.maxsize is not None and len(cache) > self.maxsize:
+            cache.popitem(last=False)
+            self.evictions += 1
+            telemetry.count(evictions_name)
+        telemetry.gauge(size_name, len(cache))
+
+        return value
+
+    @contextlib.contextmanager
+    def scope(self):
+        """Start with an empty cache in the block, and drop it afterwards."""
+        outer = self.cache
+        self.cache = OrderedDict()
+        try:
+            yield self
+        finally:
+            self.cache = outer
+            telemetry.gauge(self.telemetry_names[3], len(outer))
+
+    def clear(self):
+        self.cache.clear()
+
+    def info(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.cache),
+            "maxsize": self.maxsize,
+        }
+
+
+def memoize(maxsize: int | None = 1024, name: str | None = None) -> Callable[[Callable], Memo]:
+    """Cache the results by the (hashable, positional) arguments, see the module docstring.
+
+    maxsize=None doesn't bound the cache, like functools.cache. The telemetry
+    counters are named after the function, unless a name is given.
+    """
+
+    def decorator(func: Callable) -> Memo:
+        return Memo(func, maxsize, name or func.__name__)
+
+    return decorator
@@ -0,0 +1,125 @@
+"""Single source shortest paths over integer node ids.
+
+Graphs are given as edges[node] -> iterable of (neighbor, weight) pairs, with
+nodes numbered 0..num_nodes-1, e.g. a list of lists. Distances and
+predecessors are stored in flat arrays instead of per node objects.
+
+- dijkstra() keeps a heapq with lazy deletion: improved nodes are pushed
+  again and outdated heap entries are skipped when they're popped. An
+  optional heuristic turns it into A*.
+- dial() is Dial's bucket queue for small non-negative integer weights, it
+  cycles over max_weight + 1 buckets instead of keeping anything sorted.
+
+Both stop as soon as one of the goals is settled, or search everything if
+no goals are given.
+"""
+import heapq
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Collection, Iterable, Sequence
+
+INF = 2**63 - 1
+
+Edges = Sequence[Iterable[tuple[int, int]]]
+
+
+@dataclass
+class ShortestPaths:
+    dist: array  # INF for nodes that weren't reached.
+    prev: array  # -1 for sources and unreached nodes.
+    goal: int | None = None  # The goal that was settled first, if any.
+
+    def path(self, node: int | None = None) -> list[int]:
+        """The nodes on the shortest path to node (default: the goal), source first."""
+        node = self.goal if node is None else node
+        path = []
+        while node != -1:
+            path.append(node)
+            node = self.prev[node]
+
+        return path[::-1]
+
+
+def _init(num_nodes: int, sources: Iterable[int]) -> tuple[array, array, list[int]]:
+    dist = array("q", [INF]) * num_nodes
+    prev = array("q", [-1]) * num_nodes
+    sources = list(sources)
+    for source in sources:
+        dist[source] = 0
+
+    return dist, prev, sources
+
+
+def dijkstra(
+    edges: Edges,
+    num_nodes: int,
+    sources: Iterable[int],
+    goals: Collection[int] = (),
+    heuristic: Callable[[int], int] | None = None,
+) -> ShortestPaths:
+    """Dijkstra, or A* if an admissible heuristic for the distance to the goals is given."""
+    dist, prev, sources = _init(num_nodes, sources)
+    goals = set(goals)
+
+    h = heuristic or (lambda node: 0)
+    heap = [(h(source), 0, source) for source in sources]
+    heapq.heapify(heap)
+    while heap:
+        _, d, node = heapq.heappop(heap)
+        if d > dist[node]:
+            continue  # Outdated entry, the node was reached faster since.
+
+        if node in goals:
+            return ShortestPaths(dist, prev, node)
+
+        for neighbor, weight in edges[node]:
+            neighbor_dist = d + weight
+            if neighbor_dist < dist[neighbor]:
+                dist[neighbor] = neighbor_dist
+                prev[neighbor] = node
+                heapq.heappush(heap, (neighbor_dist + h(neighbor), neighbor_dist, neighbor))
+
+    return ShortestPaths(dist, prev)
+
+
+def dial(
+    edges: Edges,
+    num_nodes: int,
+    sources: Iterable[int],
+    max_weight: int,
+    goals: Collection[int] = (),
+) -> ShortestPaths:
+    """Dijkstra with a bucket queue, for integer weights in 0..max_weight."""
+    dist, prev, sources = _init(num_nodes, sources)
+    goals = set(goals)
+
+    # Every queued distance is within max_weight of the current one, so the
+    # buckets can be reused round robin.
+    buckets = [[] for _ in range(max_weight + 1)]
+    buckets[0].extend(sources)
+    queued = len(sources)
+
+    d = 0
+    while queued:
+        bucket = buckets[d % len(buckets)]
+        # Zero weight edges append to the bucket we're working on, that's fine.
+        while bucket:
+            node = bucket.pop()
+            queued -= 1
+            if dist[node] != d:
+                continue  # Outdated entry, the node was reached faster since.
+
+            if node in goals:
+                return ShortestPaths(dist, prev, node)
+
+            for neighbor, weight in edges[node]:
+                neighbor_dist = d + weight
+                if neighbor_dist < dist[neighbor]:
+                    dist[neighbor] = neighbor_dist
+                    prev[neighbor] = node
+                    buckets[neighbor_dist % len(buckets)].append(neighbor)
+                    queued += 1
+
+        d += 1
+
+    return ShortestPaths(dist, prev)
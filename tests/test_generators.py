@@ -0,0 +1,14 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import generators  # noqa: E402
+
+
+@pytest.mark.parametrize("day", sorted(generators.GENERATORS))
+def test_generate_scaled(day):
+    # The README generates every day at scale 4.
+    assert generators.generate(day, 4)